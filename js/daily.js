@@ -14,9 +14,45 @@ function initDailyPage(data) {
   load7DayAgentAvg(data);
 }
 
+// Per-agent series with precomputed rolling averages (scripts/build-agent-series.py)
+var _agentSeriesPromise = null;
+
+function loadAgentSeries() {
+  if (!_agentSeriesPromise) {
+    _agentSeriesPromise = fetchJson('daily/agent-series.json')
+      .catch(function() { return null; });
+  }
+  return _agentSeriesPromise;
+}
+
+function agentAvgFromSeries(series, date, window) {
+  if (!series || !series.rolling || !series.rolling[window]) return null;
+  var i = series.dates.indexOf(date);
+  if (i < 0) return null;
+  var avgMap = {};
+  var rolling = series.rolling[window];
+  Object.keys(rolling).forEach(function(name) {
+    avgMap[name] = {
+      avgAssigned: rolling[name].assigned[i],
+      avgReplies: rolling[name].replies[i]
+    };
+  });
+  return { avgMap: avgMap, totalDays: Math.min(i + 1, parseInt(window)) };
+}
+
 async function load7DayAgentAvg(todayData) {
   var currentDate = todayData.startDate || todayData.endDate;
-  if (!currentDate || !_indexCache || !_indexCache.days) return;
+  if (!currentDate) return;
+
+  var fromSeries = agentAvgFromSeries(await loadAgentSeries(), currentDate, '7');
+  if (fromSeries) {
+    if (_dailyData !== todayData) return;  // navigated away meanwhile
+    renderAgentTable(todayData.agentActivity, fromSeries.avgMap, fromSeries.totalDays);
+    return;
+  }
+
+  // Fallback: average the previous daily files directly
+  if (!_indexCache || !_indexCache.days) return;
 
   // Find previous 6 days from index
   var dayIdx = _indexCache.days.indexOf(currentDate);
@@ -27,8 +63,7 @@ async function load7DayAgentAvg(todayData) {
 
   // Fetch previous days' data
   var fetches = prevDays.map(function(d) {
-    return fetch('data/daily/' + d + '.json', _fetchOpts)
-      .then(function(r) { return r.ok ? r.json() : null; })
+    return loadDayData(d)
       .catch(function() { return null; });
   });
   var results = await Promise.all(fetches);
@@ -84,8 +119,7 @@ function renderProductChart(products) {
   var canvas = document.getElementById('product-chart');
   if (!canvas) return;
   if (!products || products.length === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No product data</p>';
+    showChartEmpty(canvas, 'No product data');
     return;
   }
 
@@ -94,8 +128,7 @@ function renderProductChart(products) {
   var chartHeight = Math.max(180, products.length * barHeight + 50);
   canvas.parentElement.style.height = chartHeight + 'px';
 
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'bar',
     data: {
       labels: products.map(function(p) { return p.product; }),
@@ -140,8 +173,7 @@ function renderTypeChart(types) {
   var canvas = document.getElementById('type-chart');
   if (!canvas) return;
   if (!types || types.length === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No ticket type data</p>';
+    showChartEmpty(canvas, 'No ticket type data');
     return;
   }
 
@@ -150,8 +182,7 @@ function renderTypeChart(types) {
   var chartHeight = Math.max(180, types.length * barHeight + 50);
   canvas.parentElement.style.height = chartHeight + 'px';
 
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'bar',
     data: {
       labels: types.map(function(t) { return t.type; }),
@@ -212,17 +243,14 @@ function renderAgentTable(agents, avgMap, totalDays) {
       (hasAvg ? '<td>' + (avg ? avg.avgAssigned.toFixed(1) : '-') + '</td>' : '') +
       (hasAvg ? '<td>' + (avg ? avg.avgReplies.toFixed(1) : '-') + '</td>' : '') +
     '</tr>';
-  }).join('');
+  });
 
-  el.innerHTML =
-    '<table>' +
-    '<thead><tr>' +
+  renderTable(el,
+    '<tr>' +
       '<th>Agent</th>' +
       '<th>Assigned</th>' +
       '<th>Replied</th>' +
       (hasAvg ? '<th>Avg Assigned/' + avgLabel + '</th>' : '') +
       (hasAvg ? '<th>Avg Replied/' + avgLabel + '</th>' : '') +
-    '</tr></thead>' +
-    '<tbody>' + rows + '</tbody>' +
-    '</table>';
+    '</tr>', rows);
 }
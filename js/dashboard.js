@@ -130,11 +130,124 @@ var _currentReport = null;
 // === Data Loading ===
 var _indexCache = null;
 var _fetchOpts = { cache: 'no-cache' };
+// Versioned URLs change whenever the file does, so any cached copy is current
+var _versionedFetchOpts = { cache: 'force-cache' };
+
+// Fetch data/<path> ('pulse/2026-W07.json'). Files listed in index.json's
+// `versions` map get a ?v=<content hash> URL and are served from the browser
+// cache; anything else (no index yet, file newer than the index) revalidates.
+function fetchData(path) {
+  var versions = _indexCache && _indexCache.versions;
+  var v = versions && versions[path];
+  if (v) return fetch('data/' + path + '?v=' + v, _versionedFetchOpts);
+  return fetch('data/' + path, _fetchOpts);
+}
+
+// === Payload cache ===
+// Bounded LRU of parsed payloads, so stepping back and forth between periods
+// (and compare mode) reuses them instead of refetching and reparsing. Each
+// entry remembers the version it was stored under; a lookup with another
+// version drops it. Payloads are shared between views: do not mutate them.
+var PAYLOAD_CACHE_SIZE = 48;
+
+function LruCache(limit) {
+  this.limit = limit;
+  this.entries = new Map();  // insertion order = recency
+}
+
+LruCache.prototype.get = function(key, version) {
+  var entry = this.entries.get(key);
+  if (!entry) return undefined;
+  this.entries.delete(key);
+  if (entry.version !== version) return undefined;
+  this.entries.set(key, entry);
+  return entry.value;
+};
+
+LruCache.prototype.set = function(key, version, value) {
+  this.entries.delete(key);
+  this.entries.set(key, { version: version, value: value });
+  while (this.entries.size > this.limit) {
+    this.entries.delete(this.entries.keys().next().value);
+  }
+};
+
+// Remove `key` if it still holds `value`
+LruCache.prototype.drop = function(key, value) {
+  var entry = this.entries.get(key);
+  if (entry && entry.value === value) this.entries.delete(key);
+};
+
+var _payloadCache = new LruCache(PAYLOAD_CACHE_SIZE);
+
+// Content hash of data/<path> in the index, or null if not listed
+function dataVersion(path) {
+  var versions = _indexCache && _indexCache.versions;
+  return (versions && versions[path]) || null;
+}
+
+// Parsed data/<path> (v2 payloads decoded), or null if the file is missing.
+// Files with an index version are cached (as promises, so concurrent loads
+// share one request); unlisted files are always refetched.
+function fetchJson(path) {
+  var version = dataVersion(path);
+  if (!version) return fetchJsonUncached(path);
+  var cached = _payloadCache.get(path, version);
+  if (cached) return cached;
+  var promise = fetchJsonUncached(path).then(function(data) {
+    if (data == null) _payloadCache.drop(path, promise);
+    return data;
+  }, function(err) {
+    _payloadCache.drop(path, promise);
+    throw err;
+  });
+  _payloadCache.set(path, version, promise);
+  return promise;
+}
+
+async function fetchJsonUncached(path) {
+  var resp = await fetchData(path);
+  if (!resp.ok) return null;
+  return decodePayload(await resp.json());
+}
+
+// === v2 payloads (scripts/payload_v2.py) ===
+// "~<base36>" strings index the `strings` table ("~~x" is a literal "~x");
+// each `refs` section is copied from the same key of another data file.
+function restoreV2(value, strings) {
+  if (typeof value === 'string') {
+    if (value.charAt(0) !== '~') return value;
+    var rest = value.slice(1);
+    return rest.charAt(0) === '~' ? rest : strings[parseInt(rest, 36)];
+  }
+  if (Array.isArray(value)) {
+    return value.map(function(v) { return restoreV2(v, strings); });
+  }
+  if (value && typeof value === 'object') {
+    var out = {};
+    for (var k in value) out[k] = restoreV2(value[k], strings);
+    return out;
+  }
+  return value;
+}
+
+async function decodePayload(raw) {
+  if (!raw || raw.$v !== 2) return raw;
+  var data = restoreV2(raw.data, raw.strings);
+  var refs = raw.refs || {};
+  var keys = Object.keys(refs);
+  var sources = await Promise.all(keys.map(function(k) { return fetchJson(refs[k]); }));
+  keys.forEach(function(k, i) { data[k] = sources[i] ? sources[i][k] : null; });
+  return data;
+}
+
+var _indexLoadedAt = 0;
 
 async function loadIndex() {
   if (_indexCache) return _indexCache;
   var resp = await fetch('data/index.json', _fetchOpts);
   _indexCache = await resp.json();
+  _indexLoadedAt = Date.now();
   // Derive months from weeks if not present
   if (!_indexCache.months) {
     var monthSet = {};
@@ -170,9 +283,27 @@ async function loadIndex() {
 }
 
 async function loadWeekData(report, week) {
-  var resp = await fetch('data/' + report + '/' + week + '.json', _fetchOpts);
-  if (!resp.ok) return null;
-  return resp.json();
+  return fetchJson(report + '/' + week + '.json');
+}
+
+// Days of closed months are packed into daily/bundles/YYYY-MM.json
+// (scripts/pack-daily.py): one request (and one cache entry) serves every
+// day of the month. A loose day file, if the index lists one, wins over the
+// bundled copy.
+function loadDayData(day) {
+  var idx = _indexCache || {};
+  var month = day.slice(0, 7);
+  if (dataVersion('daily/' + day + '.json') || !idx.dailyBundles ||
+      idx.dailyBundles.indexOf(month) < 0) {
+    return fetchJson('daily/' + day + '.json');
+  }
+  return fetchJson('daily/bundles/' + month + '.json').then(function(bundle) {
+    return (bundle && bundle.days[day]) || null;
+  });
+}
+
+function loadPeriodData(dataDir, key) {
+  return dataDir === 'daily' ? loadDayData(key) : loadWeekData(dataDir, key);
 }
 
 async function loadReportData(dataDir) {
@@ -185,31 +316,46 @@ async function loadReportData(dataDir) {
   } else {
     key = (select && select.value) ? select.value : idx.latest;
   }
-  var resp = await fetch('data/' + dataDir + '/' + key + '.json', _fetchOpts);
-  if (!resp.ok) {
+  var data = await loadPeriodData(dataDir, key);
+  if (!data) {
     // Try falling back to the next available period
     var list = (periodType === 'day') ? idx.days : idx.weeks;
     var keyIdx = list.indexOf(key);
     for (var fi = keyIdx + 1; fi < list.length; fi++) {
-      var fallbackResp = await fetch('data/' + dataDir + '/' + list[fi] + '.json', _fetchOpts);
-      if (fallbackResp.ok) return fallbackResp.json();
+      var fallback = await loadPeriodData(dataDir, list[fi]);
+      if (fallback) return fallback;
     }
     throw new Error('No data for ' + dataDir + '/' + key);
   }
-  return resp.json();
+  return data;
 }
 
-async function loadMonthlyData(dataDir, idx) {
+async function loadMonthlyData(dataDir, idx, month) {
   var select = document.getElementById('period-select');
-  var month = (select && select.value) ? select.value : idx.latestMonth;
-  var weeks = idx.weeks.filter(function(w) { return isoWeekToMonth(w) === month; });
+  month = month || ((select && select.value) ? select.value : idx.latestMonth);
+  // Precomputed rollup (scripts/build-rollups.py); aggregate in the browser if missing.
+  // An index that lists versions but no rollup means there is none to fetch.
+  var rollupPath = dataDir + '/monthly/' + month + '.json';
+  if (!idx.versions || dataVersion(rollupPath)) {
+    var rollup = await fetchJson(rollupPath);
+    if (rollup) return rollup;
+  }
+  var weeks = idx.weeks.filter(function(w) { return isoWeekToMonth(w) === month; }).sort();
+  // Aggregates are cached under the versions of the weeks they were built from
+  var aggKey = 'month:' + dataDir + '/' + month;
+  var weekVersions = weeks.map(function(w) { return dataVersion(dataDir + '/' + w + '.json'); });
+  var aggVersion = weekVersions.every(Boolean) ? weekVersions.join(',') : null;
+  var cached = aggVersion && _payloadCache.get(aggKey, aggVersion);
+  if (cached) return cached;
   var promises = weeks.map(function(w) { return loadWeekData(dataDir, w); });
   var results = await Promise.all(promises);
   var weeklyData = results.filter(function(d) { return d != null; });
   if (weeklyData.length === 0) throw new Error('No data for month ' + month);
-  if (dataDir === 'pulse') return aggregatePulseData(weeklyData, month);
-  if (dataDir === 'qa') return aggregateQaData(weeklyData, month);
-  return weeklyData[weeklyData.length - 1];
+  var result = weeklyData[weeklyData.length - 1];
+  if (dataDir === 'pulse') result = aggregatePulseData(weeklyData, month);
+  if (dataDir === 'qa') result = aggregateQaData(weeklyData, month);
+  if (aggVersion) _payloadCache.set(aggKey, aggVersion, result);
+  return result;
 }
 
 // === ISO Week to Month (UTC-based to avoid local TZ drift) ===
@@ -307,6 +453,7 @@ function initTheme() {
     }
     localStorage.setItem('theme', next);
     applyChartDefaults();
+    destroyCharts();  // colors are baked into each chart: rebuild, don't update
     navigateTo(currentView, currentReport, true);
   });
 }
@@ -321,24 +468,100 @@ function applyChartDefaults() {
   Chart.defaults.font.size = 12;
 }
 
-// === Chart Cleanup ===
+// === Render Layer ===
+// While the view and report stay the same, navigateTo keeps the rendered
+// template: charts are updated in place (upsertChart) and table rows are
+// diffed (renderTable), so switching periods does not re-initialize the
+// canvases or rebuild the page layout. A template change, an error page or
+// a theme change tears everything down (destroyCharts).
+var _renderedTemplate = null;  // markup of the template in #content
+
 function destroyCharts() {
   document.querySelectorAll('#content canvas').forEach(function(c) {
     var chart = Chart.getChart(c);
     if (chart) chart.destroy();
   });
+  _renderedTemplate = null;
+}
+
+// Create the chart on `canvas`, or swap data, labels and options of the
+// chart already there when its type matches
+function upsertChart(canvas, config) {
+  var note = canvas.parentElement.querySelector('.chart-empty');
+  if (note) note.style.display = 'none';
+  canvas.style.display = '';
+  var chart = Chart.getChart(canvas);
+  if (chart && chart.config.type === config.type) {
+    chart.data.labels = config.data.labels;
+    chart.data.datasets = config.data.datasets;
+    chart.options = config.options;
+    chart.update();
+    return chart;
+  }
+  if (chart) chart.destroy();
+  return new Chart(canvas.getContext('2d'), config);
+}
+
+// Show `message` instead of the chart, keeping the canvas for the next period
+function showChartEmpty(canvas, message) {
+  var chart = Chart.getChart(canvas);
+  if (chart) chart.destroy();
+  canvas.style.display = 'none';
+  var note = canvas.parentElement.querySelector('.chart-empty');
+  if (!note) {
+    note = document.createElement('p');
+    note.className = 'chart-empty';
+    note.style.cssText = 'padding:16px;color:var(--text-secondary)';
+    canvas.parentElement.appendChild(note);
+  }
+  note.textContent = message;
+  note.style.display = '';
+}
+
+// Render a table into `el`. The existing <table> is kept when its header
+// is unchanged; then rows with unchanged markup stay in the DOM, changed
+// rows are replaced and surplus rows removed. rowsHtml: one '<tr>...</tr>'
+// string per row.
+var _tableMarkup = new WeakMap();
+
+function renderTable(el, headHtml, rowsHtml) {
+  var table = el.firstElementChild;
+  if (!table || table.tagName !== 'TABLE' || el.children.length !== 1 ||
+      _tableMarkup.get(table) !== headHtml) {
+    el.innerHTML = '<table><thead>' + headHtml + '</thead><tbody></tbody></table>';
+    table = el.firstElementChild;
+    _tableMarkup.set(table, headHtml);
+  }
+  var tbody = table.tBodies[0];
+  var rows = tbody.rows;
+  var parser = document.createElement('tbody');
+  rowsHtml.forEach(function(html, i) {
+    var existing = rows[i];
+    if (existing && _tableMarkup.get(existing) === html) return;
+    parser.innerHTML = html;
+    var row = parser.firstElementChild;
+    _tableMarkup.set(row, html);
+    if (existing) tbody.replaceChild(row, existing);
+    else tbody.appendChild(row);
+  });
+  while (rows.length > rowsHtml.length) tbody.deleteRow(rows.length - 1);
 }
 
 // === Expandable Rows ===
-function initExpandableRows() {
-  document.querySelectorAll('.expandable').forEach(function(row) {
-    row.addEventListener('click', function() {
-      var targetId = row.dataset.detail;
-      var panel = document.getElementById(targetId);
-      if (!panel) return;
-      row.classList.toggle('open');
-      panel.classList.toggle('open');
-    });
+// One delegated listener, so rows kept or added by renderTable need no binding
+document.addEventListener('click', function(e) {
+  var row = e.target.closest && e.target.closest('#content .expandable');
+  if (!row) return;
+  var panel = document.getElementById(row.dataset.detail);
+  if (!panel) return;
+  panel.classList.toggle('open', row.classList.toggle('open'));
+});
+
+// After a diff, a kept row may sit above a replaced panel: match their state
+function syncExpandableRows(el) {
+  el.querySelectorAll('.expandable').forEach(function(row) {
+    var panel = document.getElementById(row.dataset.detail);
+    if (panel) panel.classList.toggle('open', row.classList.contains('open'));
   });
 }
 
@@ -420,12 +643,10 @@ function renderDailyTrend(trend) {
   var canvas = document.getElementById('daily-trend-chart');
   if (!canvas) return;
   if (!trend || trend.length === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No daily trend data</p>';
+    showChartEmpty(canvas, 'No daily trend data');
     return;
   }
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'bar',
     data: {
       labels: trend.map(function(d) { return d.day; }),
@@ -456,19 +677,16 @@ function renderProductBreakdown(products) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No product breakdown data</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Product</th><th>Tickets</th><th>%</th><th>vs Prev</th>' +
-    '</tr></thead><tbody>';
-
+  var rows = [];
   products.forEach(function(p, i) {
-    html += '<tr class="expandable" data-detail="product-detail-' + i + '">' +
+    rows.push('<tr class="expandable" data-detail="product-detail-' + i + '">' +
       '<td>' + p.product + '</td>' +
       '<td>' + formatNumber(p.count) + '</td>' +
       '<td>' + (typeof p.pct === 'number' ? p.pct.toFixed(1) + '%' : '-') + '</td>' +
       '<td>' + formatDelta(p.delta) + '</td>' +
-      '</tr>';
+      '</tr>');
 
-    html += '<tr><td colspan="4">' +
+    var html = '<tr><td colspan="4">' +
       '<div class="detail-panel" id="product-detail-' + i + '">';
 
     if (p.topIssues && p.topIssues.length > 0) {
@@ -487,11 +705,11 @@ function renderProductBreakdown(products) {
       html += '<p style="color:var(--text-secondary)">No top issues recorded</p>';
     }
 
-    html += '</div></td></tr>';
+    rows.push(html + '</div></td></tr>');
   });
 
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Product</th><th>Tickets</th><th>%</th><th>vs Prev</th></tr>', rows);
+  syncExpandableRows(el);
 }
 
 function renderStfs(stfs) {
@@ -501,21 +719,15 @@ function renderStfs(stfs) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No active STFS issues</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Issue</th><th>Summary</th><th>Tickets</th><th>DSAT</th>' +
-    '</tr></thead><tbody>';
-
-  stfs.forEach(function(s) {
-    html += '<tr>' +
+  var rows = stfs.map(function(s) {
+    return '<tr>' +
       '<td><a class="ticket-link" href="' + jiraUrl(s.key) + '" target="_blank">' + s.key + '</a></td>' +
       '<td>' + s.summary + '</td>' +
       '<td>' + s.ticketCount + '</td>' +
       '<td>' + (s.dsatCount != null ? s.dsatCount : '-') + '</td>' +
       '</tr>';
   });
-
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Issue</th><th>Summary</th><th>Tickets</th><th>DSAT</th></tr>', rows);
 }
 
 // === Compare Helpers ===
@@ -686,9 +898,6 @@ async function navigateTo(view, report, skipPush, period) {
     currentView = view;
     currentReport = report;
 
-    // Destroy old charts
-    destroyCharts();
-
     // Update period tabs
     document.querySelectorAll('#period-tabs a').forEach(function(a) {
       a.classList.toggle('active', a.dataset.view === view);
@@ -733,17 +942,24 @@ async function navigateTo(view, report, skipPush, period) {
       }
     }
 
-    // Set content template
+    // Set content template, or keep it (and its charts) if it is already shown
     var templateKey = view + '-' + report;
     var content = document.getElementById('content');
 
     if (reportConfig.placeholder) {
+      destroyCharts();
       content.innerHTML = TEMPLATES[templateKey] || '';
       _navigating = false;
       return;
     }
 
-    content.innerHTML = TEMPLATES[templateKey] || '';
+    // (weekly and monthly views share templates, so compare the markup)
+    var template = TEMPLATES[templateKey] || '';
+    if (template !== _renderedTemplate) {
+      destroyCharts();
+      content.innerHTML = template;
+      _renderedTemplate = template;
+    }
 
     // Load data
     var data;
@@ -761,9 +977,12 @@ async function navigateTo(view, report, skipPush, period) {
     if (viewConfig.compare) {
       initCompare(reportConfig.dataDir);
     }
+
+    prefetchNeighbours(viewConfig, reportConfig, idx);
   } catch (err) {
     var content = document.getElementById('content');
     if (content) {
+      destroyCharts();
       var idx = await loadIndex();
       var pt = VIEWS[view].periodType;
       var latestPeriod = pt === 'month' ? idx.latestMonth : (pt === 'day' ? idx.latestDay : idx.latest);
@@ -900,12 +1119,16 @@ function aggregateQaData(weeklyDataArray, month) {
         trendMap[t.week] = t;
       });
     }
+  });
+  result.bcrWeeklyTrend = Object.keys(trendMap).sort().map(function(k) { return trendMap[k]; });
+
+  // Recent bugs newest week first, so the 20 kept are the month's most recent
+  weeklyDataArray.slice().reverse().forEach(function(d) {
     if (d.recentBugs) {
       if (d.recentBugs.qa) result.recentBugs.qa = result.recentBugs.qa.concat(d.recentBugs.qa);
       if (d.recentBugs.customer) result.recentBugs.customer = result.recentBugs.customer.concat(d.recentBugs.customer);
     }
   });
-  result.bcrWeeklyTrend = Object.keys(trendMap).sort().map(function(k) { return trendMap[k]; });
 
   // Take latest for non-summable fields
   if (latestWeek) {
@@ -980,6 +1203,81 @@ window.addEventListener('popstate', function() {
   navigateTo(params.view, params.report, true, period !== 'latest' ? period : undefined);
 });
 
+// === Prefetch ===
+// After a period renders, its neighbours in the period list are loaded at
+// idle time into the payload cache: the older one first (it is also the
+// Compare period), then the newer one. [ ] stepping and Compare then render
+// without a visible fetch. Skipped when the browser asks to save data.
+function whenIdle(fn) {
+  if (window.requestIdleCallback) return window.requestIdleCallback(fn, { timeout: 3000 });
+  return setTimeout(fn, 300);
+}
+
+function prefetchNeighbours(viewConfig, reportConfig, idx) {
+  var conn = navigator.connection;
+  if (conn && (conn.saveData || /2g/.test(conn.effectiveType || ''))) return;
+  var select = document.getElementById('period-select');
+  var type = viewConfig.periodType;
+  var list = type === 'day' ? idx.days : (type === 'month' ? idx.months : idx.weeks);
+  var i = select ? list.indexOf(select.value) : -1;
+  if (i < 0) return;
+  var dataDir = reportConfig.dataDir;
+  [list[i + 1], list[i - 1]].forEach(function(key) {
+    if (!key) return;
+    whenIdle(function() {
+      var load = (type === 'month' && reportConfig.aggregate)
+        ? loadMonthlyData(dataDir, idx, key)
+        : loadPeriodData(dataDir, key);
+      load.catch(function() {});
+    });
+  });
+}
+
+// === Index Revalidation ===
+// index.json is re-read when the service worker reports a newer copy, or
+// when a tab left open for a while is shown again. Cached payloads whose
+// version changed are dropped on their next lookup. A page showing the
+// latest period moves to the new latest one; otherwise the next navigation
+// lists any new periods.
+var INDEX_MAX_AGE_MS = 5 * 60 * 1000;
+
+function latestFor(idx, periodType) {
+  return periodType === 'month' ? idx.latestMonth : (periodType === 'day' ? idx.latestDay : idx.latest);
+}
+
+function refreshIndex() {
+  var previous = _indexCache;
+  _indexCache = null;
+  return loadIndex().then(function(idx) {
+    var periodType = VIEWS[currentView].periodType;
+    var params = getUrlParams();
+    var shown = periodType === 'month' ? params.month : (periodType === 'day' ? params.day : params.week);
+    if (previous && shown === 'latest' && !_navigating &&
+        latestFor(idx, periodType) !== latestFor(previous, periodType)) {
+      navigateTo(currentView, currentReport, true);
+    }
+  }, function() {
+    _indexCache = previous;
+  });
+}
+
+document.addEventListener('visibilitychange', function() {
+  if (document.visibilityState !== 'visible' || !_indexCache) return;
+  if (Date.now() - _indexLoadedAt < INDEX_MAX_AGE_MS) return;
+  refreshIndex();
+});
+
+// === Service Worker (sw.js) ===
+// Serves the page and data from the local cache, revalidating in the background
+if ('serviceWorker' in navigator && location.protocol.indexOf('http') === 0) {
+  navigator.serviceWorker.addEventListener('message', function(event) {
+    if (event.data && event.data.type === 'data-updated' && _indexCache) refreshIndex();
+  });
+  window.addEventListener('load', function() {
+    navigator.serviceWorker.register('sw.js').catch(function() {});
+  });
+}
+
 // === Init ===
 document.addEventListener('DOMContentLoaded', function() {
   applyChartDefaults();
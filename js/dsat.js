@@ -11,7 +11,6 @@ function initDsatPage(data) {
   renderAiPie(data);
   renderTopReasons(data.topReasons);
   renderSampleTickets(data.samples);
-  initExpandableRows();
 }
 
 function renderDsatHero(data) {
@@ -58,13 +57,11 @@ function renderAiPie(data) {
   var otherDsat = Math.max(0, withComments - aiNeg);
 
   if (aiNeg === 0 && otherDsat === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No data for pie chart</p>';
+    showChartEmpty(canvas, 'No data for pie chart');
     return;
   }
 
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'doughnut',
     data: {
       labels: ['AI-Negative', 'Other DSAT'],
@@ -88,12 +85,10 @@ function renderTopReasons(reasons) {
   var canvas = document.getElementById('reasons-chart');
   if (!canvas) return;
   if (!reasons || reasons.length === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No top reasons data available</p>';
+    showChartEmpty(canvas, 'No top reasons data available');
     return;
   }
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'bar',
     data: {
       labels: reasons.map(function(r) { return r.reason; }),
@@ -131,30 +126,26 @@ function renderSampleTickets(samples) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No sample tickets</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Ticket</th><th>Product</th><th>Comment</th>' +
-    '</tr></thead><tbody>';
-
+  var rows = [];
   samples.forEach(function(s, i) {
     var comment = s.comment || '';
     var shortComment = comment.length > 80
       ? comment.substring(0, 80) + '...'
       : comment;
 
-    html += '<tr class="expandable" data-detail="sample-detail-' + i + '">' +
+    rows.push('<tr class="expandable" data-detail="sample-detail-' + i + '">' +
       '<td><a class="ticket-link" href="' + zenUrl(s.ticketId) + '" target="_blank">#' + s.ticketId + '</a></td>' +
       '<td>' + (s.product || '-') + '</td>' +
       '<td>' + shortComment + '</td>' +
-      '</tr>';
+      '</tr>');
 
-    html += '<tr><td colspan="3">' +
+    rows.push('<tr><td colspan="3">' +
       '<div class="detail-panel" id="sample-detail-' + i + '">' +
       '<p style="white-space:pre-wrap">' + comment + '</p>' +
-      '</div></td></tr>';
+      '</div></td></tr>');
   });
-
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Ticket</th><th>Product</th><th>Comment</th></tr>', rows);
+  syncExpandableRows(el);
 }
 
 // === Helpers to get DSAT rate from either format ===
@@ -14,7 +14,6 @@ function initPulsePage(data) {
   renderAiOps(data.aiOps);
   renderAiOpportunities(data.aiOpportunities);
   renderStfs(data.stfs);
-  initExpandableRows();
 }
 
 // --- Ticket Type Breakdown ---
@@ -36,12 +35,8 @@ function renderTicketTypes(types) {
       '<td>' + formatDelta(t.delta) + '</td>' +
       '<td><span class="kpi-delta ' + aiClass + '">' + aiRate + '</span></td>' +
     '</tr>';
-  }).join('');
-  el.innerHTML =
-    '<table>' +
-    '<thead><tr><th>Type</th><th>Count</th><th>%</th><th>vs Prev</th><th>AI Res Rate</th></tr></thead>' +
-    '<tbody>' + rows + '</tbody>' +
-    '</table>';
+  });
+  renderTable(el, '<tr><th>Type</th><th>Count</th><th>%</th><th>vs Prev</th><th>AI Res Rate</th></tr>', rows);
 }
 
 // --- AI Operations ---
@@ -71,21 +66,15 @@ function renderAiOpportunities(opps) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No data</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Tally</th><th>Volume</th><th>AI Res Rate</th>' +
-    '</tr></thead><tbody>';
-
-  opps.forEach(function(o) {
+  var rows = opps.map(function(o) {
     var rate = typeof o.aiResRate === 'number' ? o.aiResRate.toFixed(1) + '%' : '-';
-    html += '<tr>' +
+    return '<tr>' +
       '<td>' + (o.tally || '-') + '</td>' +
       '<td>' + formatNumber(o.count) + '</td>' +
       '<td>' + rate + '</td>' +
       '</tr>';
   });
-
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Tally</th><th>Volume</th><th>AI Res Rate</th></tr>', rows);
 }
 
 // === Compare Mode Handler ===
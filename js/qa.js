@@ -52,22 +52,16 @@ function renderBcrByProduct(products) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No product BCR data</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Product</th><th>QA Bugs</th><th>Customer Bugs</th><th>BCR</th>' +
-    '</tr></thead><tbody>';
-
-  products.forEach(function(p) {
+  var rows = products.map(function(p) {
     var badgeClass = p.rate >= 80 ? 'badge-green' : 'badge-red';
-    html += '<tr>' +
+    return '<tr>' +
       '<td>' + p.product + '</td>' +
       '<td>' + safeFormatNumber(p.qaBugs) + '</td>' +
       '<td>' + safeFormatNumber(p.customerBugs) + '</td>' +
       '<td><span class="badge ' + badgeClass + '">' + safeFixed(p.rate, 1) + '%</span></td>' +
       '</tr>';
   });
-
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Product</th><th>QA Bugs</th><th>Customer Bugs</th><th>BCR</th></tr>', rows);
 }
 
 // --- 3. BCR Weekly Trend (Stacked Bar Chart) ---
@@ -75,12 +69,10 @@ function renderBcrTrend(trend) {
   var canvas = document.getElementById('bcr-trend-chart');
   if (!canvas) return;
   if (!trend || trend.length === 0) {
-    canvas.parentElement.innerHTML =
-      '<p style="padding:16px;color:var(--text-secondary)">No weekly trend data</p>';
+    showChartEmpty(canvas, 'No weekly trend data');
     return;
   }
-  var ctx = canvas.getContext('2d');
-  new Chart(ctx, {
+  upsertChart(canvas, {
     type: 'bar',
     data: {
       labels: trend.map(function(d) {
@@ -245,11 +237,7 @@ function renderRegressionTrendLegacy(el, products) {
     el.innerHTML = '<p style="padding:16px;color:var(--text-secondary)">No regression data</p>';
     return;
   }
-  var html = '<table><thead><tr>' +
-    '<th>Product</th><th>Pass Rate</th><th>Delta</th>' +
-    '</tr></thead><tbody>';
-
-  products.forEach(function(p) {
+  var rows = products.map(function(p) {
     var pct = safeFixed(p.passRate * 100, 1) + '%';
     var deltaPct = (p.delta * 100).toFixed(1);
     var arrow, badgeClass;
@@ -265,15 +253,13 @@ function renderRegressionTrendLegacy(el, products) {
     }
     var deltaText = arrow + ' ' + Math.abs(deltaPct) + '%';
 
-    html += '<tr>' +
+    return '<tr>' +
       '<td>' + p.product + '</td>' +
       '<td>' + pct + '</td>' +
       '<td><span class="badge ' + badgeClass + '">' + deltaText + '</span></td>' +
       '</tr>';
   });
-
-  html += '</tbody></table>';
-  el.innerHTML = html;
+  renderTable(el, '<tr><th>Product</th><th>Pass Rate</th><th>Delta</th></tr>', rows);
 }
 
 // --- 6. Latest Function Test ---
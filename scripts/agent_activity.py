@@ -0,0 +1,285 @@
+"""Per-agent activity for the daily dashboard.
+
+Counts are tallied from the day's ticket rows where the store carries
+assignee and commenter columns; only agents the rows say nothing about fall
+back to Zendesk search. Search counts are fetched concurrently through a
+small thread pool. All workers draw from one shared token bucket, so the job
+stays under the account's API rate limit, and a 429 from any worker pauses
+the whole pool for the server's Retry-After before the request is retried.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import run_metrics
+
+SKIP_AGENTS = ('Administrator', 'Merch Team')
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 5.0      # requests per second, shared by all workers
+DEFAULT_BURST = 10
+DEFAULT_RETRIES = 3
+
+# Accepted header names (compared case/punctuation-insensitively)
+ASSIGNEE_COLUMNS = ('assignee_id', 'assignee')
+COMMENTER_COLUMNS = ('commenter_ids', 'commenters', 'comment_author_ids',
+                     'comment_authors')
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting request rate across workers."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    elapsed = now - self._updated
+                    self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Stop handing out tokens for `seconds` (e.g. after a 429)."""
+        with self._lock:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                # Refill from the end of the pause, not from the last grant
+                self._tokens = 0.0
+                self._updated = until
+
+
+def _status(exc):
+    """HTTP status carried by `exc` (`.response.status_code`), or None."""
+    return getattr(getattr(exc, 'response', None), 'status_code', None)
+
+
+def _retry_after(exc):
+    """Return the Retry-After delay (seconds) if `exc` is a 429, else None."""
+    if _status(exc) != 429:
+        return None
+    headers = getattr(exc.response, 'headers', None) or {}
+    try:
+        return max(1.0, float(headers.get('Retry-After', 60)))
+    except (TypeError, ValueError):
+        return 60.0
+
+
+def _transient(exc):
+    """True for errors worth retrying: 429, 5xx and connection failures.
+
+    Other HTTP errors (401, 403, 404...) fail the same way on every attempt.
+    Errors without a status count as transient if they are OSErrors
+    (connection refused or reset, timeouts; requests' errors derive from it).
+    """
+    status = _status(exc)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(exc, OSError)
+
+
+def call_with_retry(fn, bucket, retries=DEFAULT_RETRIES):
+    """Call `fn()` under the rate limiter, retrying 429s and transient errors.
+
+    429 responses pause the shared bucket for Retry-After seconds; 5xx and
+    connection errors back off exponentially (1s, 2s, 4s...). Any other
+    error, and the last one once retries are exhausted, is re-raised at
+    once. Calls, retries, 429s and final failures are counted in the active
+    run's metrics (zendesk.*).
+    """
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        run_metrics.count('zendesk.calls')
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not _transient(e):
+                run_metrics.count('zendesk.failures')
+                raise
+            run_metrics.count('zendesk.retries')
+            delay = _retry_after(e)
+            if delay is not None:
+                run_metrics.count('zendesk.throttled')
+                bucket.pause(delay)
+            else:
+                time.sleep(2 ** attempt)
+
+
+def _normalize(name):
+    return ''.join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+def find_column(header_idx, candidates):
+    """Return the row index of the first matching header, or None."""
+    lookup = {_normalize(k): v for k, v in header_idx.items()}
+    for c in candidates:
+        if _normalize(c) in lookup:
+            return lookup[_normalize(c)]
+    return None
+
+
+def _cell_values(row, col):
+    """Split a cell into individual ids/names (lists or comma-separated)."""
+    if col is None or col >= len(row):
+        return []
+    value = row[col]
+    if value is None or value == '':
+        return []
+    if isinstance(value, (list, tuple, set)):
+        items = value
+    else:
+        items = str(value).split(',')
+    return [str(v).strip() for v in items if str(v).strip()]
+
+
+def tally_agent_activity(rows, header_idx, agents):
+    """Count assigned and commented tickets per agent in one pass over rows.
+
+    Cells may hold agent ids or names. An agent is only counted locally if
+    both the assignee and commenter columns exist and the agent appears in
+    at least one row; everyone else is returned in `missing` so the caller
+    can fall back to search.
+
+    Returns:
+        (counts, missing): counts maps agent_id -> {'assigned', 'replies'},
+        missing is a list of agent_ids not covered by the rows
+    """
+    wanted = {a: n for a, n in agents.items() if n not in SKIP_AGENTS}
+    assignee_col = find_column(header_idx, ASSIGNEE_COLUMNS)
+    commenter_col = find_column(header_idx, COMMENTER_COLUMNS)
+    if assignee_col is None or commenter_col is None:
+        return {}, list(wanted)
+
+    by_key = {}
+    for agent_id, name in wanted.items():
+        by_key[str(agent_id)] = agent_id
+        by_key.setdefault(name, agent_id)
+
+    counts = {agent_id: {'assigned': 0, 'replies': 0} for agent_id in wanted}
+    seen = set()
+    for row in rows:
+        for v in _cell_values(row, assignee_col):
+            agent_id = by_key.get(v)
+            if agent_id is not None:
+                counts[agent_id]['assigned'] += 1
+                seen.add(agent_id)
+        # A ticket counts once per commenter, however many comments they left
+        for agent_id in {by_key.get(v) for v in _cell_values(row, commenter_col)}:
+            if agent_id is not None:
+                counts[agent_id]['replies'] += 1
+                seen.add(agent_id)
+
+    missing = [a for a in wanted if a not in seen]
+    return {a: c for a, c in counts.items() if a in seen}, missing
+
+
+def fetch_agent_activity(client, agents, target_date, workers=DEFAULT_WORKERS,
+                         rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                         retries=DEFAULT_RETRIES):
+    """Fetch per-agent activity for a single day.
+
+    Args:
+        client: ZendeskClient instance, or a zendesk_cache.CachedSearchClient
+            (cached counts are answered without touching the rate limiter)
+        agents: dict of agent_id (str) -> name
+        target_date: str YYYY-MM-DD
+        workers: max concurrent requests (1 = sequential)
+        rate: requests per second across all workers
+        burst: token bucket capacity
+        retries: retries per request after the first attempt
+
+    Returns:
+        list of dicts sorted by daily assigned desc
+    """
+    bucket = TokenBucket(rate, burst)
+    # A CachedSearchClient's hits skip the limiter and the call metrics
+    cache = getattr(client, 'cache', None)
+    search = client.fetch if cache is not None else client.search_count
+
+    def count(query):
+        if cache is not None:
+            cached = cache.get(query)
+            if cached is not None:
+                return cached
+        return call_with_retry(lambda: search(query), bucket, retries)
+
+    def fetch_one(agent_id, name):
+        try:
+            assigned = count(
+                f"type:ticket assignee:{agent_id} "
+                f"created>={target_date} created<={target_date}"
+            )
+            replies = count(
+                f"type:ticket commenter:{agent_id} "
+                f"created>={target_date} created<={target_date}"
+            )
+        except Exception as e:
+            print(f"  Warning: failed to fetch data for {name}: {e}",
+                  file=sys.stderr)
+            assigned = replies = 0
+        return {
+            'name': name,
+            'assigned': assigned,
+            'replies': replies,
+        }
+
+    todo = [(agent_id, name) for agent_id, name in agents.items()
+            if name not in SKIP_AGENTS]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(lambda a: fetch_one(*a), todo))
+
+    results.sort(key=lambda x: x['assigned'], reverse=True)
+    return results
+
+
+def build_agent_activity(rows, header_idx, agents, target_date, make_client,
+                         **fetch_kwargs):
+    """Agent activity from local rows, searching Zendesk only for the gaps.
+
+    Args:
+        rows, header_idx: the day's ticket rows from ticket_data_store
+        agents: dict of agent_id (str) -> name
+        target_date: str YYYY-MM-DD
+        make_client: zero-arg callable returning a ZendeskClient; only
+            called if some agents are missing from the rows
+        **fetch_kwargs: passed through to fetch_agent_activity
+
+    Returns:
+        (activity, searched): the sorted agentActivity list and the number
+        of agents that needed a search fallback
+    """
+    counts, missing = tally_agent_activity(rows, header_idx, agents)
+    remote = {}
+    if missing:
+        fetched = fetch_agent_activity(
+            make_client(), {a: agents[a] for a in missing}, target_date,
+            **fetch_kwargs)
+        remote = {r['name']: r for r in fetched}
+
+    results = []
+    for agent_id, name in agents.items():
+        if agent_id in counts:
+            results.append({'name': name, **counts[agent_id]})
+        elif name in remote:
+            results.append(remote[name])
+
+    results.sort(key=lambda x: x['assigned'], reverse=True)
+    return results, len(missing)
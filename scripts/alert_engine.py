@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Volume alerts against rolling baselines, recomputed for any range of weeks.
+
+The upstream generators compare each week with the one before, so a quiet
+week followed by a normal one reads as "+1408%". This engine loads the
+whole history of a report (pulse or tickets) as two count matrices:
+
+  product x week         from productBreakdown
+  (product, tally) x week from productBreakdown[].topIssues
+
+Each cell is then scored against a robust baseline of the preceding
+--window weeks:
+
+  median  median and MAD (scaled by 1.4826) of the window (default)
+  ewma    exponentially weighted mean and variance (--alpha)
+
+The spread is floored at sqrt(baseline) (Poisson noise) and at 1, so small
+counts need a real jump to fire. A cell alerts when its z-score reaches
+--threshold and it exceeds the baseline by at least --min-delta tickets.
+Scores of 2x the threshold or more are "high", the rest "medium".
+
+Cells the report leaves out are bounded, not zero: a product outside the
+top-N breakdown has at most the smallest listed count (or the "Other" row,
+if smaller), and a tally outside a product's top issues at most the
+smallest listed issue. Baselines use those upper bounds, which errs
+towards fewer alerts.
+
+Rewriting replaces volume_spike and tally_surge alerts in the chosen weeks
+and keeps every other alert type. Files are only written when their
+alerts change, then registered in the index.
+
+Usage:
+    python3 alert_engine.py                          # latest week of pulse and tickets
+    python3 alert_engine.py --weeks 2026-W07
+    python3 alert_engine.py --since 2026-W01 --until 2026-W20 --method ewma
+    python3 alert_engine.py --all --dry-run          # print what would change
+"""
+import argparse
+import json
+import math
+import re
+from datetime import timedelta
+from pathlib import Path
+from statistics import median
+
+import data_index
+from data_utils import DATA_DIR, iso_week_monday, write_json_atomic
+
+REPORTS = ('pulse', 'tickets')
+ENGINE_TYPES = {'volume_spike', 'tally_surge'}
+WEEK_FILE_RE = re.compile(r'(\d{4}-W\d{2})\.json')
+
+DEFAULT_WINDOW = 8
+DEFAULT_MIN_PERIODS = 4
+DEFAULT_THRESHOLD = 3.5
+DEFAULT_MIN_DELTA = 5
+DEFAULT_ALPHA = 0.3
+MAD_SCALE = 1.4826  # MAD -> standard deviation for normal data
+
+
+def _iso_week(d):
+    iso = d.isocalendar()
+    return f'{iso[0]}-W{iso[1]:02d}'
+
+
+def load_report(data_dir, report):
+    """(weeks, payloads): a contiguous ISO week axis and {week: payload}."""
+    payloads = {}
+    report_dir = Path(data_dir) / report
+    if report_dir.exists():
+        for f in report_dir.glob('*.json'):
+            match = WEEK_FILE_RE.fullmatch(f.name)
+            if match and f.stat().st_size > 100:
+                payloads[match.group(1)] = json.loads(f.read_text())
+    if not payloads:
+        return [], payloads
+    first, last = iso_week_monday(min(payloads)), iso_week_monday(max(payloads))
+    weeks = [_iso_week(first + timedelta(weeks=i)) for i in range((last - first).days // 7 + 1)]
+    return weeks, payloads
+
+
+def _is_other(name):
+    return str(name).startswith('Other (')
+
+
+def build_matrices(weeks, payloads):
+    """Product and (product, tally) count matrices, one column per week.
+
+    Returns (products, tallies): {key: [value, ...]} aligned with `weeks`.
+    A value is a count, an upper bound for a row the report left out, or
+    None for weeks without a file.
+    """
+    products, tallies = {}, {}
+    listed = []  # per week: ({product: count}, product bound, {product: (issues, bound)})
+    for week in weeks:
+        payload = payloads.get(week)
+        if payload is None:
+            listed.append(None)
+            continue
+        counts, issues = {}, {}
+        other = None
+        for p in payload.get('productBreakdown') or []:
+            if _is_other(p['product']):
+                other = p.get('count') or 0
+                continue
+            counts[p['product']] = p.get('count') or 0
+            top = {i['tally']: i.get('count') or 0 for i in p.get('topIssues') or []}
+            # A full top list means unlisted tallies can be up to its smallest entry
+            issues[p['product']] = (top, min(top.values()) if len(top) >= 3 else 0)
+        bound = 0
+        if other is not None:
+            bound = min([other] + list(counts.values()))
+        listed.append((counts, bound, issues))
+        products.update(dict.fromkeys(counts))
+        for product, (top, _) in issues.items():
+            tallies.update(dict.fromkeys((product, t) for t in top))
+
+    def column(week_data, key, is_tally):
+        if week_data is None:
+            return None
+        counts, bound, issues = week_data
+        if not is_tally:
+            return counts.get(key, bound)
+        product, tally = key
+        if product not in issues:
+            return 0 if product in counts else None
+        top, tally_bound = issues[product]
+        return top.get(tally, tally_bound)
+
+    return ({k: [column(w, k, False) for w in listed] for k in products},
+            {k: [column(w, k, True) for w in listed] for k in tallies})
+
+
+def _median_baseline(history):
+    m = median(history)
+    mad = median(abs(x - m) for x in history)
+    return m, MAD_SCALE * mad
+
+
+def score_series(values, targets, method='median', window=DEFAULT_WINDOW,
+                 min_periods=DEFAULT_MIN_PERIODS, alpha=DEFAULT_ALPHA):
+    """Yield (index, value, baseline, z) for each target index with a baseline.
+
+    One pass over the series: the window (median) or the running EWMA state
+    is carried forward, so scoring every week costs O(weeks x window).
+    """
+    mean = var = None
+    seen = 0
+    history = []
+    for i, x in enumerate(values):
+        if i in targets and x is not None and seen >= min_periods:
+            if method == 'ewma':
+                baseline, spread = mean, math.sqrt(var)
+            else:
+                baseline, spread = _median_baseline(history)
+            spread = max(spread, math.sqrt(max(baseline, 0)), 1.0)
+            yield i, x, baseline, (x - baseline) / spread
+        if x is None:
+            continue
+        seen += 1
+        history.append(x)
+        if len(history) > window:
+            history.pop(0)
+        if mean is None:
+            mean, var = float(x), 0.0
+        else:
+            diff = x - mean
+            mean += alpha * diff
+            var = (1 - alpha) * (var + alpha * diff * diff)
+
+
+def compute_alerts(weeks, payloads, targets, method='median', window=DEFAULT_WINDOW,
+                   min_periods=DEFAULT_MIN_PERIODS, threshold=DEFAULT_THRESHOLD,
+                   min_delta=DEFAULT_MIN_DELTA, alpha=DEFAULT_ALPHA):
+    """{week: [alert, ...]} for the target weeks, strongest first."""
+    products, tallies = build_matrices(weeks, payloads)
+    target_idx = {i for i, w in enumerate(weeks) if w in targets}
+    basis = f'{window}-week median' if method == 'median' else 'EWMA baseline'
+    out = {weeks[i]: [] for i in target_idx}
+
+    def scan(matrix, is_tally):
+        for key, values in matrix.items():
+            for i, x, baseline, z in score_series(values, target_idx, method, window,
+                                                  min_periods, alpha):
+                if z < threshold or x - baseline < min_delta:
+                    continue
+                base = f'{round(baseline, 1):g}'
+                if is_tally:
+                    product, tally = key
+                    message = f'{product} / {tally}: {base} → {x} (vs {basis})'
+                else:
+                    pct = round((x - baseline) / baseline * 100) if baseline else None
+                    change = f'+{pct}%' if pct is not None else 'new'
+                    message = f'{key} volume {change} ({base} → {x}, vs {basis})'
+                out[weeks[i]].append({
+                    'severity': 'high' if z >= 2 * threshold else 'medium',
+                    'message': message,
+                    'type': 'tally_surge' if is_tally else 'volume_spike',
+                    'value': x,
+                    'baseline': round(baseline, 1),
+                    'z': round(z, 1),
+                })
+
+    scan(products, False)
+    scan(tallies, True)
+    for alerts in out.values():
+        alerts.sort(key=lambda a: (a['type'] != 'volume_spike', -a['z']))
+    return out
+
+
+def rewrite(data_dir, report, targets=None, dry_run=False, **params):
+    """Replace engine alert types in `targets` weeks (None = latest). Returns paths changed."""
+    weeks, payloads = load_report(data_dir, report)
+    if not weeks:
+        return []
+    if targets is None:
+        targets = {max(payloads)}
+    alerts = compute_alerts(weeks, payloads, set(targets) & set(payloads), **params)
+    changed = []
+    for week, new in sorted(alerts.items()):
+        payload = payloads[week]
+        kept = [a for a in payload.get('alerts') or [] if a.get('type') not in ENGINE_TYPES]
+        merged = kept + new
+        if merged == (payload.get('alerts') or []):
+            continue
+        path = Path(data_dir) / report / f'{week}.json'
+        changed.append(path)
+        if dry_run:
+            print(f'{report}/{week}: {len(payload.get("alerts") or [])} → {len(merged)} alerts')
+            for a in new:
+                print(f'    [{a["severity"]}] {a["message"]}')
+            continue
+        payload['alerts'] = merged
+        write_json_atomic(path, payload)
+    return changed
+
+
+def _week_range(since, until):
+    start, end = iso_week_monday(since), iso_week_monday(until)
+    if start is None or end is None:
+        raise ValueError(f'invalid ISO week range: {since}..{until}')
+    return {_iso_week(start + timedelta(weeks=i)) for i in range((end - start).days // 7 + 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rewrite volume alerts against rolling baselines')
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument('--weeks', help='Comma-separated ISO weeks (default: latest week)')
+    which.add_argument('--since', help='First ISO week of a range (with --until, default latest)')
+    which.add_argument('--all', action='store_true', help='Every week with data')
+    parser.add_argument('--until', help='Last ISO week of a --since range')
+    parser.add_argument('--reports', default=','.join(REPORTS),
+                        help=f'Reports to rewrite (default: {",".join(REPORTS)})')
+    parser.add_argument('--method', choices=['median', 'ewma'], default='median')
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                        help=f'Baseline weeks for median/MAD (default {DEFAULT_WINDOW})')
+    parser.add_argument('--min-periods', type=int, default=DEFAULT_MIN_PERIODS,
+                        help=f'Weeks of history needed before alerting (default {DEFAULT_MIN_PERIODS})')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Robust z-score to alert at (default {DEFAULT_THRESHOLD})')
+    parser.add_argument('--min-delta', type=int, default=DEFAULT_MIN_DELTA,
+                        help=f'Minimum tickets above baseline (default {DEFAULT_MIN_DELTA})')
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA,
+                        help=f'EWMA smoothing factor (default {DEFAULT_ALPHA})')
+    parser.add_argument('--dry-run', action='store_true', help='Print changes, write nothing')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    params = {'method': args.method, 'window': args.window, 'min_periods': args.min_periods,
+              'threshold': args.threshold, 'min_delta': args.min_delta, 'alpha': args.alpha}
+    paths = []
+    for report in [r.strip() for r in args.reports.split(',') if r.strip()]:
+        targets = None
+        if args.weeks:
+            targets = {w.strip() for w in args.weeks.split(',') if w.strip()}
+        elif args.since or args.all:
+            weeks, _ = load_report(args.data_dir, report)
+            if not weeks:
+                continue
+            try:
+                targets = _week_range(args.since or weeks[0], args.until or weeks[-1])
+            except ValueError as e:
+                parser.error(str(e))
+        changed = rewrite(args.data_dir, report, targets, args.dry_run, **params)
+        print(f'{report}: {len(changed)} week(s) {"would change" if args.dry_run else "rewritten"}')
+        paths += changed
+    if paths and not args.dry_run:
+        data_index.register(paths, args.data_dir)
+
+
+if __name__ == '__main__':
+    main()
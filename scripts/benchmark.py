@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Benchmark the data pipeline and the dashboard's JSON payloads.
+
+Times, on a copy of a data directory:
+
+  index.full         data_index.update with no manifest (every file hashed)
+  index.incremental  data_index.update against a warm manifest
+  rollups.<report>   monthly aggregation (build-rollups.py) on preloaded
+                     payloads, excluding I/O
+  rollups.build      build-rollups.py end to end (--force)
+  parse.<report>     json.loads of every file of a report type, from memory
+  zendesk.agent_fetch  (with --zendesk-days) agent-activity search fetch
+                     against a local fake-zendesk.py server with injected
+                     latency and 429s: seconds per day, requests, throttles
+
+With no --data-dir, a synthetic fixture is generated first with
+generate-mock-data.py and the scale options below. Results are written as
+JSON (--out) so runs can be compared as history and product lines grow.
+
+Usage:
+    python3 benchmark.py --data-dir ../data
+    python3 benchmark.py --weeks 156 --products 300 --tallies 500 --agents 40 \\
+        --dsat-comments 2000 --out bench.json
+    python3 benchmark.py --data-dir ../data --zendesk-days 3 --zendesk-rate 20
+"""
+import argparse
+import importlib.util
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import data_index
+from agent_activity import DEFAULT_RATE, DEFAULT_WORKERS, fetch_agent_activity
+from zendesk_local import BaseUrlClient
+
+SCRIPT_DIR = Path(__file__).parent
+SCALE_OPTIONS = ('weeks', 'end', 'products', 'tallies', 'agents', 'dsat_comments')
+
+
+def _load_script(name):
+    """Import a hyphenated script (e.g. build-rollups.py) as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), SCRIPT_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(fn, repeat):
+    """Best and mean wall time of `repeat` calls, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {'best': round(min(times), 6), 'mean': round(sum(times) / len(times), 6),
+            'repeat': repeat}
+
+
+def generate_fixture(out_dir, scale):
+    cmd = [sys.executable, str(SCRIPT_DIR / 'generate-mock-data.py'), '--out', str(out_dir)]
+    for key, value in scale.items():
+        if value is not None:
+            cmd += [f'--{key.replace("_", "-")}', str(value)]
+    start = time.perf_counter()
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    return round(time.perf_counter() - start, 3)
+
+
+def bench_index(data_dir, repeat):
+    manifest = data_dir.parent / 'bench-manifest.json'
+
+    def full():
+        data_index.update(data_dir, full=True, manifest_path=manifest)
+
+    results = {'index.full': timed(full, repeat)}
+    results['index.incremental'] = timed(
+        lambda: data_index.update(data_dir, manifest_path=manifest), repeat)
+    return results
+
+
+def bench_rollups(data_dir, repeat):
+    rollups = _load_script('build-rollups')
+    results = {}
+    for report in rollups.REPORTS:
+        report_dir = data_dir / report
+        if not report_dir.exists():
+            continue
+        months = {month: [json.loads(path.read_text()) for _, path in weeks]
+                  for month, weeks in rollups.weeks_by_month(report_dir).items()}
+        aggregate = rollups.AGGREGATORS[report]
+        results[f'rollups.{report}'] = timed(
+            lambda: [aggregate(payloads, month) for month, payloads in months.items()], repeat)
+        results[f'rollups.{report}']['months'] = len(months)
+
+    def build():
+        for report in rollups.REPORTS:
+            if (data_dir / report).exists():
+                rollups.build_report(data_dir, report, force=True)
+
+    results['rollups.build'] = timed(build, repeat)
+    return results
+
+
+def bench_parse(data_dir, repeat):
+    """Per report type: files, bytes and json.loads time for all of them."""
+    by_report = {}
+    for path in sorted(data_dir.rglob('*.json')):
+        rel = path.relative_to(data_dir)
+        report = rel.parts[0] if len(rel.parts) > 1 else rel.stem
+        by_report.setdefault(report, []).append(path.read_bytes())
+
+    results = {}
+    for report, bodies in by_report.items():
+        r = timed(lambda: [json.loads(b) for b in bodies], repeat)
+        size = sum(len(b) for b in bodies)
+        r.update(files=len(bodies), bytes=size,
+                 mbPerSec=round(size / 1e6 / r['best'], 1) if r['best'] else None)
+        results[f'parse.{report}'] = r
+    return results
+
+
+def bench_zendesk(args):
+    """Offline agent-activity fetch throughput against fake-zendesk.py."""
+    fake = _load_script('fake-zendesk')
+    agents = fake.synthetic_agents(args.zendesk_agents)
+    server = fake.make_server(port=0, agents=agents, latency=args.zendesk_latency / 1000,
+                              jitter=args.zendesk_jitter / 1000, p429=args.zendesk_p429,
+                              retry_after=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = BaseUrlClient(server.base_url)
+        day = date(2026, 1, 5)
+        per_day = []
+        for i in range(args.zendesk_days):
+            start = time.perf_counter()
+            fetch_agent_activity(client, agents, (day + timedelta(days=i)).isoformat(),
+                                 workers=args.zendesk_workers, rate=args.zendesk_rate)
+            per_day.append(time.perf_counter() - start)
+        stats = dict(server.stats)
+    finally:
+        server.shutdown()
+        server.server_close()
+    total = sum(per_day)
+    return {'zendesk.agent_fetch': {
+        'best': round(min(per_day), 6), 'mean': round(total / len(per_day), 6),
+        'repeat': len(per_day), 'agents': len(agents),
+        'requests': stats['requests'], 'throttled': stats['throttled'],
+        'reqPerSec': round(stats['requests'] / total, 1) if total else None,
+    }}
+
+
+def print_results(results):
+    width = max(len(k) for k in results)
+    for name, r in results.items():
+        extra = ''
+        if 'files' in r:
+            extra = f"  {r['files']} files, {r['bytes'] / 1e6:.2f} MB, {r['mbPerSec']} MB/s"
+        elif 'months' in r:
+            extra = f"  {r['months']} months"
+        elif 'requests' in r:
+            extra = (f"  {r['agents']} agents, {r['requests']} requests "
+                     f"({r['throttled']} throttled), {r['reqPerSec']} req/s")
+        print(f"  {name:<{width}}  best {r['best'] * 1000:9.2f} ms  "
+              f"mean {r['mean'] * 1000:9.2f} ms{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the data pipeline')
+    parser.add_argument('--data-dir', type=Path,
+                        help='Data to benchmark (copied first). Default: generate a fixture')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark (default 3)')
+    parser.add_argument('--out', type=Path, help='Write results JSON here')
+    fixture = parser.add_argument_group('fixture scale (without --data-dir)')
+    fixture.add_argument('--weeks', type=int, default=52)
+    fixture.add_argument('--end', default='2026-W05')
+    fixture.add_argument('--products', type=int)
+    fixture.add_argument('--tallies', type=int)
+    fixture.add_argument('--agents', type=int)
+    fixture.add_argument('--dsat-comments', type=int)
+    zendesk = parser.add_argument_group('agent fetch against fake-zendesk.py')
+    zendesk.add_argument('--zendesk-days', type=int, default=0,
+                         help='Days of agent activity to fetch (default 0 = skip)')
+    zendesk.add_argument('--zendesk-agents', type=int, default=20)
+    zendesk.add_argument('--zendesk-latency', type=float, default=100, help='ms')
+    zendesk.add_argument('--zendesk-jitter', type=float, default=50, help='ms')
+    zendesk.add_argument('--zendesk-p429', type=float, default=0.02)
+    zendesk.add_argument('--zendesk-workers', type=int, default=DEFAULT_WORKERS)
+    zendesk.add_argument('--zendesk-rate', type=float, default=DEFAULT_RATE,
+                         help='Client rate limit, requests/s')
+    args = parser.parse_args()
+
+    meta = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    with tempfile.TemporaryDirectory(prefix='dashboard-bench-') as tmp:
+        data_dir = Path(tmp) / 'data'
+        if args.data_dir:
+            shutil.copytree(args.data_dir, data_dir)
+            meta['dataDir'] = str(args.data_dir.resolve())
+        else:
+            scale = {k: getattr(args, k) for k in SCALE_OPTIONS}
+            print(f'Generating fixture: {scale}')
+            meta['scale'] = scale
+            meta['fixtureSeconds'] = generate_fixture(data_dir, scale)
+        # The copy may carry an index from elsewhere; benchmark from a clean slate
+        (data_dir / 'index.json').unlink(missing_ok=True)
+
+        # Parse first: the other benchmarks add index and rollup files
+        results = bench_parse(data_dir, args.repeat)
+        results.update(bench_index(data_dir, args.repeat))
+        results.update(bench_rollups(data_dir, args.repeat))
+        meta['files'] = sum(r['files'] for k, r in results.items() if k.startswith('parse.'))
+        meta['bytes'] = sum(r['bytes'] for k, r in results.items() if k.startswith('parse.'))
+    if args.zendesk_days:
+        results.update(bench_zendesk(args))
+
+    print(f"Benchmark: {meta['files']} files, {meta['bytes'] / 1e6:.2f} MB")
+    print_results(results)
+    if args.out:
+        args.out.write_text(json.dumps({'meta': meta, 'results': results}, indent=2) + '\n')
+        print(f'Results written to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Build data/daily/agent-series.json: per-agent daily activity + rolling averages.
+
+The daily view reads its 7-day agent averages from this one file instead of
+fetching the six previous daily files. Layout (arrays are indexed like
+`dates`, oldest first):
+
+    {
+      "dates": ["2026-01-05", ...],
+      "agents": {"Michael": {"assigned": [3, 0, ...], "replies": [...]}},
+      "rolling": {"7":  {"Michael": {"assigned": [2.5, ...], "replies": [...]}},
+                  "28": {...}},
+      "sources": {"2026-01-05": "<content hash>", ...}
+    }
+
+An agent missing from a day counts as 0. A rolling average at index i covers
+that day and the previous days that have data, up to the window size, and
+divides by the number of days it covers (same as the daily view did).
+Only days whose source hash changed are re-read (see DailyStore for days
+packed into monthly bundles).
+
+Usage:
+    python3 build-agent-series.py
+"""
+import argparse
+import json
+from pathlib import Path
+
+import data_index
+from data_utils import DATA_DIR, DailyStore, write_json_atomic
+
+WINDOWS = (7, 28)
+METRICS = ('assigned', 'replies')
+
+
+def rolling_average(values, window):
+    out = []
+    total = 0
+    for i, v in enumerate(values):
+        total += v
+        if i >= window:
+            total -= values[i - window]
+        out.append(round(total / min(i + 1, window), 1))
+    return out
+
+
+def build_series(data_dir=DATA_DIR, previous=None):
+    """Return the series dict, reusing unchanged days from `previous`."""
+    store = DailyStore(data_dir)
+    dates = store.dates()
+    sources = {d: store.source(d) for d in dates}
+
+    # Per-day {agent: {metric: n}}, reused from the previous build when unchanged
+    per_day = {}
+    if previous:
+        prev_index = {d: i for i, d in enumerate(previous.get('dates', []))}
+        for d in dates:
+            if previous.get('sources', {}).get(d) != sources[d] or d not in prev_index:
+                continue
+            i = prev_index[d]
+            per_day[d] = {
+                name: {m: series[m][i] for m in METRICS}
+                for name, series in previous.get('agents', {}).items()
+                if series['assigned'][i] is not None
+            }
+    for d in dates:
+        if d in per_day:
+            continue
+        payload = store.load(d)
+        per_day[d] = {
+            a['name']: {m: a.get(m) or 0 for m in METRICS}
+            for a in payload.get('agentActivity') or []
+        }
+
+    names = sorted({name for day in per_day.values() for name in day})
+    agents = {
+        name: {m: [per_day[d][name][m] if name in per_day[d] else None for d in dates]
+               for m in METRICS}
+        for name in names
+    }
+    rolling = {
+        str(w): {
+            name: {m: rolling_average([v or 0 for v in agents[name][m]], w) for m in METRICS}
+            for name in names
+        }
+        for w in WINDOWS
+    }
+    return {'dates': dates, 'agents': agents, 'rolling': rolling, 'sources': sources}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build per-agent activity series')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    out = args.data_dir / 'daily' / 'agent-series.json'
+    previous = None
+    if out.exists():
+        try:
+            previous = json.loads(out.read_text())
+        except ValueError:
+            pass
+
+    series = build_series(args.data_dir, previous)
+    if previous == series:
+        print(f'{out}: up to date ({len(series["dates"])} days)')
+        return
+    write_json_atomic(out, series, indent=None)
+    data_index.register([out], args.data_dir)
+    print(f'Updated {out}: {len(series["dates"])} days, {len(series["agents"])} agents')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""Build rollups: data/<report>/monthly/YYYY-MM.json and
+data/daily/{weekly,monthly}/*.json.
+
+Month view in the dashboard loads one of these instead of fetching every
+weekly file and aggregating in the browser. Semantics follow the dashboard's
+aggregatePulseData / aggregateQaData:
+
+  pulse   — tickets, refunds, products and types summed; aiOps, aiOpportunities
+            and stfs taken from the latest week
+  qa      — BCR snapshot of the latest week, deduplicated weekly trend,
+            recent bugs merged newest week first (20 max)
+  tickets, dsat — the latest week of the month as-is
+
+Weeks belong to the month of their Thursday (ISO). Each rollup records the
+content hash of its source weeks and the FORMAT it was built with, and a
+month is only rebuilt when either changes. Pass --force to rebuild everything.
+
+Daily files are also summed into per-ISO-week (daily/weekly/YYYY-Www.json)
+and per-calendar-month (daily/monthly/YYYY-MM.json) product and ticket type
+breakdowns. These come from each day's uncompressed `counts`, so they are
+exact and always agree with the daily view. Days written before `counts`
+existed only have the top-N breakdown; their "Other (...)" rows are summed
+as "Other" and the days are listed in `lossyDays`.
+
+Usage:
+    python3 build-rollups.py
+    python3 build-rollups.py --force
+"""
+import argparse
+import json
+import re
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import data_index
+from data_utils import (DATA_DIR, DailyStore, day_counts, file_hash, iso_week_to_month,
+                        write_json_atomic)
+
+REPORTS = ['pulse', 'qa', 'tickets', 'dsat']
+FORMAT = 2  # 2: QA recentBugs newest week first
+
+
+def aggregate_pulse(weeks, month):
+    """Monthly pulse from weekly payloads (oldest first)."""
+    result = {
+        'period': f'{month} (Monthly)',
+        'kpi': {'totalTickets': 0, 'refunds': 0, 'topProduct': '-', 'productCount': 0},
+        'dailyTrend': [],
+        'productBreakdown': [],
+        'ticketTypes': [],
+        'aiOps': None,
+        'aiOpportunities': [],
+        'stfs': [],
+        'alerts': [],
+    }
+    products = {}
+    types = {}
+
+    for d in weeks:
+        kpi = d.get('kpi') or {}
+        result['kpi']['totalTickets'] += kpi.get('totalTickets') or 0
+        result['kpi']['refunds'] += kpi.get('refunds') or 0
+        result['dailyTrend'].extend(d.get('dailyTrend') or [])
+        for p in d.get('productBreakdown') or []:
+            entry = products.setdefault(p['product'], {'product': p['product'], 'count': 0})
+            entry['count'] += p.get('count') or 0
+        for t in d.get('ticketTypes') or []:
+            entry = types.setdefault(t['type'], {'type': t['type'], 'count': 0, 'aiCount': 0})
+            entry['count'] += t.get('count') or 0
+            if isinstance(t.get('aiCount'), (int, float)):
+                entry['aiCount'] += t['aiCount']
+
+    product_total = sum(p['count'] for p in products.values())
+    for p in products.values():
+        p['pct'] = round(p['count'] / product_total * 100, 1) if product_total else 0
+    result['productBreakdown'] = sorted(products.values(), key=lambda p: p['count'], reverse=True)
+    if result['productBreakdown']:
+        result['kpi']['topProduct'] = result['productBreakdown'][0]['product']
+    result['kpi']['productCount'] = len(result['productBreakdown'])
+
+    type_total = sum(t['count'] for t in types.values())
+    for t in types.values():
+        t['pct'] = round(t['count'] / type_total * 100, 1) if type_total else 0
+        t['aiResRate'] = (round(t['aiCount'] / t['count'] * 100, 1)
+                          if t['count'] > 0 and t['aiCount'] > 0 else None)
+    result['ticketTypes'] = sorted(types.values(), key=lambda t: t['count'], reverse=True)
+
+    # Take latest for non-summable fields
+    latest = weeks[-1]
+    result['aiOps'] = latest.get('aiOps')
+    result['aiOpportunities'] = latest.get('aiOpportunities') or []
+    result['stfs'] = latest.get('stfs') or []
+    return result
+
+
+def _dedupe_bugs(bugs, limit=20):
+    seen = set()
+    out = []
+    for b in bugs:
+        if b.get('key') in seen:
+            continue
+        seen.add(b.get('key'))
+        out.append(b)
+    return out[:limit]
+
+
+def aggregate_qa(weeks, month):
+    """Monthly QA from weekly payloads (oldest first)."""
+    latest = weeks[-1]
+    bcr = latest.get('bcr') or {}
+    result = {
+        'period': f'{month} (Monthly)',
+        'bcrWindow': latest.get('bcrWindow'),
+        'daysCount': latest.get('daysCount'),
+        # BCR is a rolling metric — use the latest week's snapshot as the month's BCR
+        'bcr': {
+            'overall': bcr.get('overall') or 0,
+            'target': 80,
+            'qaCount': bcr.get('qaCount') or 0,
+            'customerCount': bcr.get('customerCount') or 0,
+        },
+        'bcrByProduct': latest.get('bcrByProduct') or [],
+        'bcrWeeklyTrend': [],
+        'testExecution': latest.get('testExecution'),
+        'regressionTrend': latest.get('regressionTrend'),
+        'latestFunctionTest': latest.get('latestFunctionTest'),
+        'recentBugs': {'qa': [], 'customer': []},
+    }
+
+    trend = {}
+    for d in weeks:
+        for t in d.get('bcrWeeklyTrend') or []:
+            trend[t['week']] = t
+    result['bcrWeeklyTrend'] = [trend[k] for k in sorted(trend)]
+
+    # Newest week first, so the 20 kept are the month's most recent
+    qa_bugs, customer_bugs = [], []
+    for d in reversed(weeks):
+        bugs = d.get('recentBugs') or {}
+        qa_bugs.extend(bugs.get('qa') or [])
+        customer_bugs.extend(bugs.get('customer') or [])
+    result['recentBugs']['qa'] = _dedupe_bugs(qa_bugs)
+    result['recentBugs']['customer'] = _dedupe_bugs(customer_bugs)
+    return result
+
+
+def latest_week(weeks, month):
+    return weeks[-1]
+
+
+AGGREGATORS = {
+    'pulse': aggregate_pulse,
+    'qa': aggregate_qa,
+    'tickets': latest_week,
+    'dsat': latest_week,
+}
+
+
+def _breakdown(counts, key):
+    total = sum(counts.values())
+    return [{key: name, 'count': count,
+             'pct': round(count / total * 100, 1) if total else 0}
+            for name, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+
+def aggregate_daily(days, period):
+    """Product / type breakdown of [(date_str, payload), ...] (oldest first)."""
+    products, types = Counter(), Counter()
+    total = refunds = 0
+    trend, lossy = [], []
+    for day_str, d in days:
+        kpi = d.get('kpi') or {}
+        total += kpi.get('totalTickets') or 0
+        refunds += kpi.get('refunds') or 0
+        trend.append({'date': day_str, 'day': date.fromisoformat(day_str).strftime('%a'),
+                      'count': kpi.get('totalTickets') or 0})
+        day_products, day_types, lossless = day_counts(d)
+        products.update(day_products)
+        types.update(day_types)
+        if not lossless:
+            lossy.append(day_str)
+
+    result = {
+        'period': f'{period} (Daily)',
+        'startDate': days[0][0],
+        'endDate': days[-1][0],
+        'days': len(days),
+        'kpi': {
+            'totalTickets': total,
+            'topProduct': None,
+            'dailyAvg': round(total / len(days), 1),
+            'refunds': refunds,
+            'productCount': len(products),
+        },
+        'dailyTrend': trend,
+        'productBreakdown': _breakdown(products, 'product'),
+        'ticketTypes': _breakdown(types, 'type'),
+        'counts': {'products': dict(products.most_common()), 'types': dict(types.most_common())},
+    }
+    if result['productBreakdown']:
+        result['kpi']['topProduct'] = result['productBreakdown'][0]['product']
+    if lossy:
+        result['lossyDays'] = lossy
+    return result
+
+
+def _iso_week(day_str):
+    iso = date.fromisoformat(day_str).isocalendar()
+    return f'{iso[0]}-W{iso[1]:02d}'
+
+
+DAILY_PERIODS = {
+    'weekly': _iso_week,
+    'monthly': lambda day_str: day_str[:7],
+}
+
+
+def _up_to_date(out, sources):
+    """True if the rollup at `out` was built from exactly `sources` by this FORMAT."""
+    try:
+        previous = json.loads(out.read_text())
+    except (OSError, ValueError):
+        return False
+    return previous.get('format') == FORMAT and previous.get('sources') == sources
+
+
+def build_daily(data_dir, force=False):
+    """Rebuild stale daily/weekly and daily/monthly rollups. Returns paths written."""
+    store = DailyStore(data_dir)
+    all_sources = {d: store.source(d) for d in store.dates()}
+    written = []
+    for kind, period_of in DAILY_PERIODS.items():
+        periods = {}
+        for day_str in all_sources:
+            periods.setdefault(period_of(day_str), []).append(day_str)
+        for period, day_strs in sorted(periods.items()):
+            sources = {d: all_sources[d] for d in day_strs}
+            out = data_dir / 'daily' / kind / f'{period}.json'
+            if not force and _up_to_date(out, sources):
+                continue
+            days = [(d, store.load(d)) for d in day_strs]
+            rollup = aggregate_daily(days, period)
+            rollup['format'] = FORMAT
+            rollup['sources'] = sources
+            write_json_atomic(out, rollup)
+            written.append(out)
+    return written
+
+
+def weeks_by_month(report_dir):
+    """{month: [(week, path), ...]} for weekly files >100 bytes, oldest first."""
+    months = {}
+    for f in sorted(report_dir.glob('*.json')):
+        match = re.match(r'(\d{4}-W\d{2})\.json', f.name)
+        if not match or f.stat().st_size <= 100:
+            continue
+        months.setdefault(iso_week_to_month(match.group(1)), []).append((match.group(1), f))
+    return months
+
+
+def build_report(data_dir, report, force=False):
+    """Rebuild stale monthly rollups for one report. Returns months written."""
+    report_dir = data_dir / report
+    out_dir = report_dir / 'monthly'
+    written = []
+    for month, weeks in sorted(weeks_by_month(report_dir).items()):
+        sources = {week: file_hash(path) for week, path in weeks}
+        out = out_dir / f'{month}.json'
+        if not force and _up_to_date(out, sources):
+            continue
+        payloads = [json.loads(path.read_text()) for _, path in weeks]
+        rollup = dict(AGGREGATORS[report](payloads, month))
+        rollup['format'] = FORMAT
+        rollup['sources'] = sources
+        write_json_atomic(out, rollup)
+        written.append(month)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build monthly rollups from weekly data '
+                                                 'and weekly/monthly rollups from daily data')
+    parser.add_argument('--force', action='store_true', help='Rebuild every month')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    paths = []
+    for report in REPORTS:
+        if not (args.data_dir / report).exists():
+            continue
+        written = build_report(args.data_dir, report, args.force)
+        paths += [args.data_dir / report / 'monthly' / f'{m}.json' for m in written]
+        print(f'{report}: {len(written)} month(s) rebuilt'
+              + (f' ({", ".join(written)})' if written else ''))
+    daily = build_daily(args.data_dir, args.force)
+    paths += daily
+    print(f'daily: {len(daily)} week/month rollup(s) rebuilt')
+    if paths:
+        data_index.register(paths, args.data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Build columnar time series: data/series/weekly.json and data/series/daily.json.
+
+Long-range and year-over-year charts load one of these instead of every
+weekly or daily file. Each file holds one array per metric, indexed like
+`dates` (oldest first):
+
+    {
+      "format": 3,
+      "dates": ["2026-01-05", ...],        # week Monday / day
+      "weeks": ["2026-W02", ...],          # weekly.json only
+      "totalTickets": [412, ...],
+      "refunds": [38, ...],
+      "products": {"SPARK 2": [74, ...]},
+      "types": {"Troubleshooting": [188, ...]},
+      "aiOps": {"aiResolutionRate": [52.7, ...], ...},   # weekly.json only
+      "sources": {"2026-W02": "<content hash>", ...}
+    }
+
+A value missing for a period is null. Weekly metrics come from data/pulse,
+falling back to data/tickets for weeks without a pulse file; daily metrics
+come from data/daily, loose day files and monthly bundles alike. Daily
+product and type columns use the lossless `counts` section of day files
+(see day_counts in data_utils.py); weekly ones, and days written before
+`counts` existed, use the top-N breakdown with its "Other (N ...)" rows
+summed into one "Other" column. Only periods whose source hash changed are
+re-read; a series written by an older FORMAT is rebuilt from scratch.
+
+Usage:
+    python3 build-series.py
+    python3 build-series.py --force
+"""
+import argparse
+import json
+import re
+from pathlib import Path
+
+import data_index
+from data_utils import (DATA_DIR, DailyStore, day_counts, file_hash, iso_week_monday,
+                        write_json_atomic)
+
+SCALARS = ('totalTickets', 'refunds')
+AI_OPS_FIELDS = ('aiResolutionRate', 'aiCsat', 'humanCsat', 'handoffRate')
+WEEK_FILE_RE = re.compile(r'(\d{4}-W\d{2})\.json')
+FORMAT = 3  # 2: "Other" folded; 3: daily columns from `counts`
+
+
+def extract(payload, with_ai_ops=False):
+    """Flat per-period record of the metrics a series file tracks."""
+    kpi = payload.get('kpi') or {}
+    record = {m: kpi.get(m) for m in SCALARS}
+    # Lossless `counts` of daily files, else the top-N breakdown with one "Other"
+    record['products'], record['types'], _ = day_counts(payload)
+    if with_ai_ops:
+        ai_ops = payload.get('aiOps') or {}
+        record['aiOps'] = {f: ai_ops.get(f) for f in AI_OPS_FIELDS
+                           if isinstance(ai_ops.get(f), (int, float))}
+    return record
+
+
+def record_at(series, i, with_ai_ops=False):
+    """Inverse of to_columns for one index of a previously built series."""
+    record = {m: series[m][i] for m in SCALARS}
+    for group in ('products', 'types') + (('aiOps',) if with_ai_ops else ()):
+        record[group] = {k: v[i] for k, v in (series.get(group) or {}).items()
+                         if v[i] is not None}
+    return record
+
+
+def to_columns(records, with_ai_ops=False):
+    """Columnar dict from a list of records (one per period, oldest first)."""
+    columns = {m: [r[m] for r in records] for m in SCALARS}
+    for group in ('products', 'types') + (('aiOps',) if with_ai_ops else ()):
+        keys = sorted({k for r in records for k in r[group]})
+        columns[group] = {k: [r[group].get(k) for r in records] for k in keys}
+    return columns
+
+
+def weekly_sources(data_dir):
+    """{week: path}, pulse preferred over tickets, files >100 bytes only."""
+    out = {}
+    for report in ('tickets', 'pulse'):  # pulse last so it wins
+        report_dir = Path(data_dir) / report
+        if not report_dir.exists():
+            continue
+        for f in report_dir.glob('*.json'):
+            match = WEEK_FILE_RE.fullmatch(f.name)
+            if match and f.stat().st_size > 100:
+                out[match.group(1)] = f
+    return out
+
+
+def build_series(sources, load, previous=None, with_ai_ops=False):
+    """Series dict for {period: content hash}, reusing unchanged periods from `previous`.
+
+    load(period) returns the period's payload.
+    """
+    periods = sorted(sources)
+    prev_key = 'weeks' if with_ai_ops else 'dates'
+    prev_index = {}
+    if previous and previous.get('format') == FORMAT and previous.get(prev_key):
+        prev_index = {p: i for i, p in enumerate(previous[prev_key])}
+
+    records = []
+    for p in periods:
+        i = prev_index.get(p)
+        if i is not None and previous.get('sources', {}).get(p) == sources[p]:
+            records.append(record_at(previous, i, with_ai_ops))
+        else:
+            records.append(extract(load(p), with_ai_ops))
+
+    series = {'format': FORMAT}
+    if with_ai_ops:
+        series['dates'] = [iso_week_monday(w).isoformat() for w in periods]
+        series['weeks'] = periods
+    else:
+        series['dates'] = periods
+    series.update(to_columns(records, with_ai_ops))
+    series['sources'] = sources
+    return series
+
+
+def _load(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build columnar weekly and daily series')
+    parser.add_argument('--force', action='store_true', help='Re-read every source file')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    out_dir = args.data_dir / 'series'
+    weekly = weekly_sources(args.data_dir)
+    daily = DailyStore(args.data_dir)
+    written = []
+    for name, sources, load, with_ai_ops in (
+        ('weekly', {w: file_hash(p) for w, p in weekly.items()},
+         lambda w: json.loads(weekly[w].read_text()), True),
+        ('daily', {d: daily.source(d) for d in daily.dates()}, daily.load, False),
+    ):
+        out = out_dir / f'{name}.json'
+        previous = None if args.force else _load(out)
+        series = build_series(sources, load, previous, with_ai_ops)
+        if series == previous:
+            print(f'{out}: up to date ({len(series["dates"])} periods)')
+            continue
+        write_json_atomic(out, series, indent=None)
+        written.append(out)
+        print(f'Updated {out}: {len(series["dates"])} periods')
+    if written:
+        data_index.register(written, args.data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""Incremental builder for data/index.json.
+
+A manifest records size, mtime and content hash for every JSON file under
+data/. A scan stats each file and re-hashes only those whose size or mtime
+moved. Pipeline scripts that just wrote files call register(), which adds
+those entries and re-stats the ones already tracked, without walking any
+directory; files added by anything else (a commit, another checkout) need a
+scan before they are indexed.
+
+The manifest is a build cache under .cache/ (not committed), one per data
+directory: data-manifest.json for the repo's data/, a path-keyed name for
+any other --data-dir. If it is missing, the next scan rebuilds it from
+scratch. Updates hold an exclusive lock on the manifest, so jobs that
+register files concurrently do not lose each other's entries. Run-metrics
+sidecars waiting in metrics/pending/ are transient, and ledger/ directories
+are build state (data_utils.PRIVATE_DIRS); neither is indexed.
+
+index.json also carries a `versions` map (data-relative path -> short
+content hash). The dashboard appends it to data URLs as ?v=<hash>, so the
+browser may cache those responses indefinitely; only index.json itself is
+revalidated on every load. A file whose published v2 body may refer to
+another file (payload_v2.ref_paths) is versioned by both hashes, since the
+body decodes against the other file's current contents.
+
+Days packed into monthly bundles (daily/bundles/YYYY-MM.json, see
+pack-daily.py) are listed in `days` like loose day files; their manifest
+entry records the bundle's days, so the index still never opens a file it
+does not hash. `dailyBundles` lists the packed months.
+"""
+import hashlib
+import json
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
+import payload_v2
+from data_utils import DATA_DIR, iso_week_to_month, private_data, write_json_atomic
+
+CACHE_DIR = Path(__file__).parent.parent / '.cache'
+MANIFEST_PATH = CACHE_DIR / 'data-manifest.json'
+MANIFEST_VERSION = 2
+UNTRACKED = {'index.json'}
+UNTRACKED_DIRS = ('metrics/pending/',)
+VERSION_HASH_LEN = 12
+
+WEEK_RE = re.compile(r'(pulse|qa|tickets|dsat)/(\d{4}-W\d{2})\.json')
+DAY_RE = re.compile(r'daily/(\d{4}-\d{2}-\d{2})\.json')
+BUNDLE_RE = re.compile(r'daily/bundles/(\d{4}-\d{2})\.json')
+
+
+def _untracked(rel):
+    return rel in UNTRACKED or rel.startswith(UNTRACKED_DIRS) or private_data(rel)
+
+
+def _hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def manifest_for(data_dir=DATA_DIR):
+    """Manifest file of `data_dir`."""
+    resolved = str(Path(data_dir).resolve())
+    if resolved == str(DATA_DIR.resolve()):
+        return MANIFEST_PATH
+    return CACHE_DIR / f'data-manifest-{hashlib.sha256(resolved.encode()).hexdigest()[:12]}.json'
+
+
+@contextmanager
+def _locked(path):
+    """Hold an exclusive lock on `path` (the manifest) for a read-modify-write."""
+    lock = Path(path).with_suffix('.lock')
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock, 'a') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield  # released when the file is closed
+
+
+def load_manifest(path=MANIFEST_PATH, data_dir=DATA_DIR):
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != MANIFEST_VERSION or data.get('dataDir') != str(Path(data_dir).resolve()):
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(files, path=MANIFEST_PATH, data_dir=DATA_DIR):
+    write_json_atomic(path, {'version': MANIFEST_VERSION,
+                             'dataDir': str(Path(data_dir).resolve()),
+                             'files': files}, indent=None)
+
+
+def _entry(path, rel, previous=None):
+    """Manifest entry for `path`, reusing the hash if size and mtime match."""
+    st = path.stat()
+    if previous and previous['size'] == st.st_size and previous['mtime'] == st.st_mtime_ns:
+        return previous
+    entry = {'size': st.st_size, 'mtime': st.st_mtime_ns, 'hash': _hash(path)}
+    if BUNDLE_RE.fullmatch(rel):
+        entry['days'] = sorted(json.loads(path.read_text()).get('days', {}))
+    return entry
+
+
+def scan(data_dir=DATA_DIR, files=None):
+    """Refresh manifest entries for every tracked file under data_dir.
+
+    Returns (files, changed): the new manifest and the relative paths whose
+    content hash changed (added, modified or removed).
+    """
+    data_dir = Path(data_dir)
+    files = files or {}
+    fresh = {}
+    for path in data_dir.rglob('*.json'):
+        rel = path.relative_to(data_dir).as_posix()
+        if _untracked(rel) or path.name.startswith('.'):
+            continue
+        fresh[rel] = _entry(path, rel, files.get(rel))
+    changed = [rel for rel in fresh.keys() | files.keys()
+               if (fresh.get(rel) or {}).get('hash') != (files.get(rel) or {}).get('hash')]
+    return fresh, sorted(changed)
+
+
+def _version(files, rel):
+    """?v= key of `rel`: its content hash, mixed with those of its v2 ref targets."""
+    digest = files[rel]['hash']
+    targets = [files[t]['hash'] for t in payload_v2.ref_paths(rel) if t in files]
+    if targets:
+        digest = hashlib.sha256(' '.join([digest, *targets]).encode()).hexdigest()
+    return digest[:VERSION_HASH_LEN]
+
+
+def build_index(files):
+    """index.json contents derived from manifest entries alone."""
+    weeks = set()
+    valid_weeks = set()
+    days = set()
+    bundles = set()
+    for rel, entry in files.items():
+        match = WEEK_RE.fullmatch(rel)
+        if match:
+            weeks.add(match.group(2))
+            # A week is valid if pulse or tickets data exists with meaningful content (>100 bytes)
+            if match.group(1) in ('pulse', 'tickets') and entry['size'] > 100:
+                valid_weeks.add(match.group(2))
+            continue
+        match = DAY_RE.fullmatch(rel)
+        if match and entry['size'] > 100:
+            days.add(match.group(1))
+            continue
+        match = BUNDLE_RE.fullmatch(rel)
+        if match:
+            bundles.add(match.group(1))
+            days.update(entry.get('days', ()))
+
+    sorted_weeks = sorted(weeks & valid_weeks, reverse=True)
+    sorted_days = sorted(days, reverse=True)
+    sorted_months = sorted({iso_week_to_month(w) for w in sorted_weeks} - {''}, reverse=True)
+
+    return {
+        'weeks': sorted_weeks,
+        'latest': sorted_weeks[0] if sorted_weeks else None,
+        'months': sorted_months,
+        'latestMonth': sorted_months[0] if sorted_months else None,
+        'days': sorted_days,
+        'latestDay': sorted_days[0] if sorted_days else None,
+        'dailyBundles': sorted(bundles, reverse=True),
+        'versions': {rel: _version(files, rel) for rel in sorted(files)},
+    }
+
+
+def write_index(index, data_dir=DATA_DIR):
+    """Write data/index.json if its contents changed. Returns True if written."""
+    index_path = Path(data_dir) / 'index.json'
+    try:
+        if json.loads(index_path.read_text()) == index:
+            return False
+    except (OSError, ValueError):
+        pass
+    write_json_atomic(index_path, index)
+    return True
+
+
+def _update(data_dir, full, manifest_path):
+    files = {} if full else load_manifest(manifest_path, data_dir)
+    files, changed = scan(data_dir, files)
+    save_manifest(files, manifest_path, data_dir)
+    index = build_index(files)
+    write_index(index, data_dir)
+    return index, changed
+
+
+def update(data_dir=DATA_DIR, full=False, manifest_path=None):
+    """Scan data_dir, then rewrite the manifest and index. Returns (index, changed)."""
+    manifest_path = manifest_path or manifest_for(data_dir)
+    with _locked(manifest_path):
+        return _update(data_dir, full, manifest_path)
+
+
+def register(paths, data_dir=DATA_DIR, manifest_path=None):
+    """Record files a pipeline step just wrote (or deleted) and refresh the index.
+
+    No directory is walked. The given paths are added, updated or dropped;
+    every other file the manifest tracks is re-stat'd (size and mtime only)
+    and re-hashed if either moved, so a manifest restored from another
+    checkout cannot leave stale hashes behind. Files the manifest does not
+    track yet are only found by a scan (update()). Without a manifest yet,
+    this falls back to a full scan.
+    """
+    data_dir = Path(data_dir).resolve()
+    manifest_path = manifest_path or manifest_for(data_dir)
+    with _locked(manifest_path):
+        files = load_manifest(manifest_path, data_dir)
+        if not files:
+            return _update(data_dir, False, manifest_path)[0]
+        for p in paths:
+            path = Path(p).resolve()
+            try:
+                rel = path.relative_to(data_dir).as_posix()
+            except ValueError:
+                continue  # written outside data/
+            if not _untracked(rel):
+                files.setdefault(rel, None)
+        for rel, previous in list(files.items()):
+            path = data_dir / rel
+            if path.exists():
+                files[rel] = _entry(path, rel, previous)
+            else:
+                del files[rel]
+        save_manifest(files, manifest_path, data_dir)
+        index = build_index(files)
+        write_index(index, data_dir)
+        return index
@@ -0,0 +1,183 @@
+"""Shared helpers for scripts that read and write the dashboard data/ tree."""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+import run_metrics
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+# Per-day ledgers (day_ledger.py) are build state: never indexed or published
+PRIVATE_DIRS = ('ledger',)
+
+
+def write_text_atomic(path, text):
+    """Write `text` to `path` via a temp file + rename.
+
+    Readers (and a concurrent git add) never see a half-written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            size = f.tell()
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    run_metrics.record_write(size)
+
+
+def write_json_atomic(path, data, indent=2):
+    """Write `data` as JSON to `path` atomically (see write_text_atomic).
+
+    indent=None writes compact JSON with no whitespace.
+    """
+    separators = (',', ':') if indent is None else None
+    write_text_atomic(path, json.dumps(data, indent=indent, separators=separators,
+                                       ensure_ascii=False, default=str) + '\n')
+
+
+def private_data(rel) -> bool:
+    """True if the data-relative path `rel` lies under one of PRIVATE_DIRS."""
+    return any(part in PRIVATE_DIRS for part in Path(rel).parts[:-1])
+
+
+def iso_week_monday(week_str: str) -> date | None:
+    """Monday of an ISO week string like '2026-W07'."""
+    match = re.match(r'(\d{4})-W(\d{2})', week_str)
+    if not match:
+        return None
+    year, week = int(match.group(1)), int(match.group(2))
+    jan4 = date(year, 1, 4)
+    monday_w1 = jan4 - timedelta(days=jan4.isoweekday() - 1)
+    return monday_w1 + timedelta(weeks=week - 1)
+
+
+def iso_week_to_month(week_str: str) -> str:
+    """Convert ISO week string (e.g., '2026-W07') to month string (e.g., '2026-02').
+    Uses Thursday of the week (ISO standard) to determine the month,
+    preventing W01 (Mon Dec 29) from mapping to December."""
+    monday = iso_week_monday(week_str)
+    if monday is None:
+        return ''
+    # Use Thursday (+3 days) for month assignment (ISO standard)
+    thursday = monday + timedelta(days=3)
+    return thursday.strftime('%Y-%m')
+
+
+def file_hash(path) -> str:
+    """Short content hash of a file (first 12 hex chars of SHA-256)."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:12]
+
+
+DAY_FILE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})\.json')
+BUNDLE_FILE_RE = re.compile(r'(\d{4}-\d{2})\.json')
+
+
+def daily_files(data_dir=DATA_DIR):
+    """{date_str: path} for date-keyed daily files with data (>100 bytes)."""
+    out = {}
+    daily_dir = Path(data_dir) / 'daily'
+    if not daily_dir.exists():
+        return out
+    for f in daily_dir.glob('*.json'):
+        match = DAY_FILE_RE.fullmatch(f.name)
+        if match and f.stat().st_size > 100:
+            out[match.group(1)] = f
+    return out
+
+
+def bundle_files(data_dir=DATA_DIR):
+    """{month: path} for the monthly bundles in daily/bundles/."""
+    bundle_dir = Path(data_dir) / 'daily' / 'bundles'
+    if not bundle_dir.exists():
+        return {}
+    return {m.group(1): f for f in bundle_dir.glob('*.json')
+            if (m := BUNDLE_FILE_RE.fullmatch(f.name))}
+
+
+class DailyStore:
+    """Daily payloads from loose day files and monthly bundles (pack-daily.py).
+
+    A bundle holds the days of a closed month and the content hash each day
+    had as a loose file:
+
+        {"month": "2026-01", "days": {"2026-01-01": {...}, ...},
+         "sources": {"2026-01-01": "<file_hash>", ...}}
+
+    so incremental builders keyed on those hashes see no change when a month
+    is packed. A loose file wins over a bundled copy of the same day (a day
+    regenerated after its month was packed).
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.files = daily_files(data_dir)
+        self._bundles = {}
+        for month, path in sorted(bundle_files(data_dir).items()):
+            bundle = json.loads(path.read_text())
+            self._bundles.update({d: (bundle['days'][d], bundle['sources'].get(d))
+                                  for d in bundle.get('days', {}) if d not in self.files})
+
+    def dates(self):
+        return sorted(self.files.keys() | self._bundles.keys())
+
+    def __contains__(self, day):
+        return day in self.files or day in self._bundles
+
+    def source(self, day):
+        """Content hash of a day, as file_hash() of its loose file."""
+        if day in self.files:
+            return file_hash(self.files[day])
+        payload, source = self._bundles[day]
+        return source or hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:12]
+
+    def load(self, day):
+        if day in self.files:
+            return json.loads(self.files[day].read_text())
+        return self._bundles[day][0]
+
+
+def breakdown_counts(payload):
+    """(products, types) count dicts of a payload's top-N breakdowns.
+
+    The "Other (N products)" / "Other (N types)" rows are summed as one
+    "Other" entry: their label changes with N, so it is not a stable key.
+    """
+    products, types = Counter(), Counter()
+    for p in payload.get('productBreakdown') or []:
+        products['Other' if p['product'].startswith('Other (') else p['product']] += p.get('count') or 0
+    for t in payload.get('ticketTypes') or []:
+        types['Other' if t['type'].startswith('Other (') else t['type']] += t.get('count') or 0
+    return dict(products), dict(types)
+
+
+def day_counts(payload):
+    """(products, types, lossless) count dicts of one daily payload.
+
+    Uses the uncompressed `counts` section; files written before it existed
+    fall back to the top-N breakdowns (see breakdown_counts, lossless=False).
+    """
+    counts = payload.get('counts')
+    if counts is not None:
+        return counts.get('products') or {}, counts.get('types') or {}, True
+    return (*breakdown_counts(payload), False)
+
+
+def product_type_counts(payload):
+    """{(product, type): count} of one daily payload, or None if it has none.
+
+    Only daily files written with `counts.productTypes` carry cross counts.
+    """
+    cross = (payload.get('counts') or {}).get('productTypes')
+    if cross is None:
+        return None
+    return {(product, itype): count
+            for product, types in cross.items() for itype, count in types.items()}
@@ -0,0 +1,216 @@
+"""Per-day ledgers with an incrementally maintained rolling window.
+
+Reports built on a rolling N-day window (DSAT, QA bug-catch rate) store
+each day's counts once, in month files in a ledger directory:
+
+    <ledger>/YYYY-MM.json    {"days": {"2026-02-01": {...}, ...}}
+    <ledger>/window.json     running totals of the current window
+
+A ledger holding only counts lives in data/<report>/ledger/ and is
+committed; ledger/ directories are never indexed or published (see
+data_utils.PRIVATE_DIRS). A ledger holding customer text lives under
+private_dir() instead, so it is neither committed nor published.
+
+A Window keeps the totals plus each day's contribution, a flat
+{counter: number} dict produced by the report's `contribution(record)`.
+Moving the window adds the days that enter and subtracts the days that
+leave, so a weekly update reads 7 ledger days however long the window is.
+
+Days are fetched from the upstream report one at a time (fill) and saved
+as they arrive, so a run that is killed keeps what it fetched. A weekly run
+fetches at most MAX_FILL_DAYS; an empty or far-behind ledger is caught up
+by the reports' `backfill` command, which runs outside the weekly job's
+timeout (see .github/workflows/update-dashboard.yml).
+"""
+import json
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from data_utils import write_json_atomic
+
+# Missing days a weekly run fetches itself: its own week plus one skipped week
+MAX_FILL_DAYS = 14
+
+
+def private_dir(data_dir):
+    """The .cache/ directory beside data_dir (the repo's own is gitignored).
+
+    CI keeps it between runs with actions/cache. Anything stored there can
+    be lost when the cache is evicted, so it must be refetchable.
+    """
+    return Path(data_dir).resolve().parent / '.cache'
+
+
+def days_between(start, end):
+    """ISO date strings from start to end inclusive."""
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def window_days(end, length):
+    """Days of the `length`-day window ending at `end`, as the upstream counts it.
+
+    The upstream reports start the window `length` days before `end` and
+    include both ends (a 90-day window ending 2026-08-16 is 2026-05-18 ~
+    2026-08-16), so the window spans length + 1 calendar days.
+    """
+    return days_between(end - timedelta(days=length), end)
+
+
+def last_sunday():
+    """End of the previous ISO week (UTC), the default weekly window end."""
+    today = datetime.now(timezone.utc).date()
+    return today - timedelta(days=today.isoweekday())
+
+
+def supports_option(script, option):
+    """True if `script --help` lists `option` (the upstream CLIs are argparse)."""
+    try:
+        proc = subprocess.run([sys.executable, str(script), '--help'],
+                              capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return proc.returncode == 0 and option in proc.stdout
+
+
+def fill(ledger, days, fetch, jobs=4, label='days'):
+    """Fetch and store every day of `days` missing from the ledger.
+
+    fetch(day) returns the day's ledger record. Each day is saved as soon as
+    it arrives. Returns (days fetched, month files written).
+    """
+    missing = [d for d in days if ledger.get(d) is None]
+    fetched, paths = [], set()
+    if not missing:
+        return fetched, paths
+    print(f'  Fetching {label} for {len(missing)} day(s)...', file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {pool.submit(fetch, day): day for day in missing}
+        try:
+            for future in as_completed(futures):
+                day = futures[future]
+                ledger.put(day, future.result())
+                paths.update(ledger.save())
+                fetched.append(day)
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+    return sorted(fetched), paths
+
+
+class Ledger:
+    """Per-day records of one report, read and written a month file at a time."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._months = {}
+        self._dirty = set()
+
+    def _month(self, month):
+        if month not in self._months:
+            try:
+                text = (self.directory / f'{month}.json').read_text()
+                self._months[month] = json.loads(text).get('days', {})
+            except (OSError, ValueError):
+                self._months[month] = {}
+        return self._months[month]
+
+    def months(self):
+        """Months with a ledger file on disk, oldest first."""
+        return sorted(p.stem for p in self.directory.glob('[0-9][0-9][0-9][0-9]-[0-9][0-9].json'))
+
+    def items(self):
+        """(day, record) for every stored day, oldest first."""
+        for month in self.months():
+            days = self._month(month)
+            for day in sorted(days):
+                yield day, days[day]
+
+    def get(self, day):
+        return self._month(day[:7]).get(day)
+
+    def put(self, day, record):
+        self._month(day[:7])[day] = record
+        self._dirty.add(day[:7])
+
+    def save(self):
+        """Write changed month files. Returns their paths."""
+        paths = []
+        for month in sorted(self._dirty):
+            path = self.directory / f'{month}.json'
+            days = self._months[month]
+            write_json_atomic(path, {'days': {d: days[d] for d in sorted(days)}})
+            paths.append(path)
+        self._dirty.clear()
+        return paths
+
+
+class Window:
+    """Running totals of a ledger over [start, end]."""
+
+    def __init__(self, directory, contribution):
+        self.path = Path(directory) / 'window.json'
+        self.contribution = contribution
+        try:
+            state = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            state = {}
+        self.start = state.get('start')
+        self.end = state.get('end')
+        self.length = state.get('length')
+        self.totals = state.get('totals') or {}
+        self.days = state.get('days') or {}
+
+    def _add(self, day, counts, sign=1):
+        for key, value in counts.items():
+            total = self.totals.get(key, 0) + sign * value
+            if total:
+                self.totals[key] = total
+            else:
+                self.totals.pop(key, None)
+        if sign > 0:
+            self.days[day] = counts
+        else:
+            self.days.pop(day, None)
+
+    def advance(self, ledger, end, length):
+        """Move the `length`-day window (see window_days) to end at `end`.
+
+        Returns the number of ledger days read.
+        """
+        days = window_days(end, length)
+        start = date.fromisoformat(days[0])
+        wanted = set(days)
+        if self.start is None or date.fromisoformat(self.start) > start \
+                or date.fromisoformat(self.end) > end:
+            # First run, or moving backwards: start over
+            self.totals, self.days = {}, {}
+        for day in [d for d in self.days if d not in wanted]:
+            self._add(day, self.days[day], -1)
+        read = 0
+        for day in sorted(wanted - self.days.keys()):
+            record = ledger.get(day)
+            read += 1
+            if record is not None:
+                self._add(day, self.contribution(record))
+        self.start, self.end, self.length = days[0], days[-1], length
+        return read
+
+    def update_day(self, day, record):
+        """Re-count a day already inside the window after it was re-ingested."""
+        if day in self.days:
+            self._add(day, self.days[day], -1)
+            self._add(day, self.contribution(record))
+
+    def day_strings(self):
+        return days_between(date.fromisoformat(self.start), date.fromisoformat(self.end))
+
+    def save(self):
+        write_json_atomic(self.path, {'start': self.start, 'end': self.end,
+                                      'length': self.length,
+                                      'totals': dict(sorted(self.totals.items())),
+                                      'days': {d: self.days[d] for d in sorted(self.days)}},
+                          indent=None)
+        return self.path
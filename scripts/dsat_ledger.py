@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""Per-day DSAT ledger and an incrementally maintained 90-day window.
+
+fetch-all-dsat-v3.py refetches and reclassifies the whole 90-day window on
+every weekly run, although only 7 of those days are new. This module
+stores each day's bad ratings, comments and isAiNegative classification
+once, in .cache/ledgers/dsat/YYYY-MM.json (see day_ledger.py):
+
+    {"days": {"2026-02-01": {"badRatings": 5, "withComments": 4,
+                             "aiNegative": 2, "comments": [...]}}}
+
+The 90-day totals are kept incrementally in .cache/ledgers/dsat/window.json,
+so a weekly update reads the 7 new ledger days instead of 90. The ledger
+holds every comment of every day, far more customer text than the weekly
+payload's capped lists, so it stays out of data/: it is neither committed
+nor published. CI keeps it with the pipeline cache; if that is evicted,
+`backfill` refetches the window.
+
+The weekly payload (data/dsat/YYYY-Www.json) keeps the fetch-all-dsat-v3.py
+shape: the window totals and rates, the oldest 50 comments (allComments)
+and the oldest 20 AI-negative ones (samples). Comments are read from the
+start of the window only until both lists are full.
+
+`week` fetches ledger days that are missing, by running the upstream
+script once per day (--json --start D --end D), then prints the payload.
+The upstream has always been run with --end alone, so --start is only used
+if its --help lists it; a day whose payload period is not that day is
+rejected. Without --start, or if more than MAX_FILL_DAYS are missing (a
+new or long-idle ledger), `week` prints the upstream script's own 90-day
+payload instead, with a warning. `backfill` fills the window's missing
+days outside the weekly job's timeout. Every fetched day is saved as it
+arrives, so an interrupted backfill resumes where it stopped.
+
+Usage:
+    python3 dsat_ledger.py week --end 2026-02-15          # payload JSON on stdout
+    python3 dsat_ledger.py backfill --end 2026-02-15      # fill the window's missing days
+    python3 dsat_ledger.py ingest --date 2026-02-15 day.json
+    python3 dsat_ledger.py status
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+from data_utils import DATA_DIR
+from day_ledger import (MAX_FILL_DAYS, Ledger, Window, fill, last_sunday, private_dir,
+                        supports_option, window_days)
+
+WINDOW_DAYS = 90
+MAX_COMMENTS = 50
+MAX_SAMPLES = 20
+FIELDS = ('badRatings', 'withComments', 'aiNegative')
+UPSTREAM = 'scripts/analysis/fetch-all-dsat-v3.py'
+# The upstream window ends at --end; --start (if supported) cuts it to [start, end]
+DAY_MODE_OPTION = '--start'
+
+
+def ledger_dir(data_dir=DATA_DIR):
+    """Ledger of `data_dir`: .cache/ledgers/dsat beside it, outside the data tree."""
+    return private_dir(data_dir) / 'ledgers' / 'dsat'
+
+
+def day_record(payload):
+    """Ledger record from an upstream DSAT payload covering a single day."""
+    urls = {(s.get('ticketId'), s.get('createdAt')): s.get('url')
+            for s in payload.get('samples') or [] if s.get('url')}
+    comments = []
+    for c in payload.get('allComments') or []:
+        comment = dict(c)
+        url = urls.get((c.get('ticketId'), c.get('createdAt')))
+        if url:
+            comment['url'] = url
+        comments.append(comment)
+    comments.sort(key=lambda c: c.get('createdAt') or '')
+    return {
+        'badRatings': payload.get('totalBadRatings') or 0,
+        'withComments': payload.get('withComments') or 0,
+        'aiNegative': payload.get('aiNegative') or 0,
+        'comments': comments,
+    }
+
+
+def contribution(record):
+    return {f: record.get(f) or 0 for f in FIELDS}
+
+
+def open_ledger(data_dir=DATA_DIR):
+    """(Ledger, Window) of the DSAT ledger under data_dir."""
+    directory = ledger_dir(data_dir)
+    return Ledger(directory), Window(directory, contribution)
+
+
+def payload(window, ledger):
+    """Weekly DSAT payload for the current window."""
+    t = {f: window.totals.get(f, 0) for f in FIELDS}
+    comments, samples = [], []
+    days = window.day_strings()
+    for day in days:
+        if len(comments) >= MAX_COMMENTS and len(samples) >= MAX_SAMPLES:
+            break
+        for c in (ledger.get(day) or {}).get('comments') or []:
+            if len(comments) < MAX_COMMENTS:
+                comments.append({k: v for k, v in c.items() if k != 'url'})
+            if c.get('isAiNegative') and len(samples) < MAX_SAMPLES:
+                samples.append({k: v for k, v in c.items() if k != 'isAiNegative'})
+    return {
+        'period': f'{window.start} ~ {window.end}',
+        'daysCount': window.length,
+        'totalBadRatings': t['badRatings'],
+        'withComments': t['withComments'],
+        'aiNegative': t['aiNegative'],
+        'aiNegativeRateOfComments': (round(t['aiNegative'] / t['withComments'] * 100, 2)
+                                     if t['withComments'] else 0),
+        'aiNegativeRateOfAll': (round(t['aiNegative'] / t['badRatings'] * 100, 2)
+                                if t['badRatings'] else 0),
+        'samples': samples,
+        'allComments': comments,
+    }
+
+
+def run_upstream(claude_dir, *args, timeout=600):
+    """Run the upstream DSAT script and return its JSON payload."""
+    proc = subprocess.run(
+        [sys.executable, str(Path(claude_dir) / UPSTREAM), '--json', *args],
+        capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(f'DSAT fetch {" ".join(args)} failed (exit {proc.returncode}): '
+                           + proc.stderr.strip()[-500:])
+    return json.loads(proc.stdout)
+
+
+def supports_day_mode(claude_dir):
+    """True if the upstream script accepts DAY_MODE_OPTION (per its --help)."""
+    return supports_option(Path(claude_dir) / UPSTREAM, DAY_MODE_OPTION)
+
+
+def fetch_day(claude_dir, day):
+    """Ledger record of one day, from a single-day upstream run.
+
+    Raises RuntimeError if the payload's period is not that day, so a window
+    the upstream did not cut is never stored as one day.
+    """
+    data = run_upstream(claude_dir, DAY_MODE_OPTION, day, '--end', day)
+    if data.get('period') != f'{day} ~ {day}':
+        raise RuntimeError(f'DSAT fetch for {day} returned period {data.get("period")!r}')
+    return day_record(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-day DSAT ledger and 90-day window')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    week = sub.add_parser('week', help='Fill missing days, advance the window, print the payload')
+    week.add_argument('--end', required=True, help='Last day of the window (YYYY-MM-DD)')
+    backfill = sub.add_parser('backfill', help="Fetch every missing day of the window")
+    backfill.add_argument('--end', default=last_sunday().isoformat(),
+                          help='Last day of the window (default: last Sunday)')
+    for p in (week, backfill):
+        p.add_argument('--days', type=int, default=WINDOW_DAYS,
+                       help=f'Window length (default {WINDOW_DAYS})')
+        p.add_argument('--jobs', type=int, default=4, help='Days fetched at once (default 4)')
+
+    ingest = sub.add_parser('ingest', help='Store one day from an upstream single-day payload')
+    ingest.add_argument('--date', required=True)
+    ingest.add_argument('file', nargs='?', help='Payload JSON (default: stdin)')
+
+    sub.add_parser('status', help='Print the window totals')
+    args = parser.parse_args()
+
+    ledger, window = open_ledger(args.data_dir)
+
+    if args.command == 'ingest':
+        text = Path(args.file).read_text() if args.file else sys.stdin.read()
+        record = day_record(json.loads(text))
+        ledger.put(args.date, record)
+        window.update_day(args.date, record)
+        ledger.save()
+        if window.start:
+            window.save()
+        print(f'{args.date}: {record["badRatings"]} bad ratings, '
+              f'{len(record["comments"])} comments', file=sys.stderr)
+        return
+
+    if args.command == 'status':
+        print(json.dumps({'start': window.start, 'end': window.end, **contribution(window.totals)}))
+        return
+
+    end = date.fromisoformat(args.end)
+    days = window_days(end, args.days)
+    claude_dir = Path(os.environ.get('CLAUDE_DIR') or Path(__file__).parent.parent.parent.parent)
+    day_mode = supports_day_mode(claude_dir)
+
+    def fetch(day):
+        return fetch_day(claude_dir, day)
+
+    if args.command == 'backfill':
+        if not day_mode:
+            print(f'Warning: {UPSTREAM} has no {DAY_MODE_OPTION} option: nothing to backfill',
+                  file=sys.stderr)
+            return
+        fetched, _ = fill(ledger, days, fetch, args.jobs, 'DSAT')
+        print(f'{len(fetched)} day(s) fetched; {days[0]} ~ {days[-1]} complete', file=sys.stderr)
+        return
+
+    missing = [d for d in days if ledger.get(d) is None]
+    if not day_mode or len(missing) > MAX_FILL_DAYS:
+        reason = (f'{UPSTREAM} has no {DAY_MODE_OPTION} option' if not day_mode else
+                  f'{len(missing)} ledger day(s) missing (run `dsat_ledger.py backfill`)')
+        print(f'Warning: {reason}: using the upstream {args.days}-day report', file=sys.stderr)
+        sys.stdout.write(json.dumps(run_upstream(claude_dir, '--end', args.end),
+                                    ensure_ascii=False, indent=2) + '\n')
+        return
+    fill(ledger, missing, fetch, args.jobs, 'DSAT')
+    read = window.advance(ledger, end, args.days)
+    window.save()
+    print(f'  Window {window.start} ~ {window.end}: {read} ledger day(s) read', file=sys.stderr)
+    sys.stdout.write(json.dumps(payload(window, ledger), ensure_ascii=False, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Local Zendesk stand-in for offline runs and load tests.
+
+Serves the endpoints the dashboard pipeline uses, from generated fixtures:
+
+  GET /api/v2/search/count.json?query=...   {"count": n}
+  GET /api/v2/search.json?query=...         paginated ticket results
+  GET /api/v2/tickets/<id>.json             {"ticket": {...}}
+  GET /__stats                              request / 429 / error counters
+
+Search understands type:ticket, assignee:<id>, commenter:<id> and
+created filters (created:D, created>=D, created<=D, created>D, created<D).
+Each day's tickets are generated on first use from --seed and the date,
+so the same query always returns the same answer. Agents come from
+--agents-file (zendesk-agents.json format) or are synthesized.
+
+Fault injection applies to every API request: --latency/--jitter add
+delay, --rate-limit caps requests per minute (like the account limit) and
+--p429 / --error-rate inject 429 (with Retry-After) and 500 responses.
+
+Point the pipeline at it with ZENDESK_BASE_URL (see zendesk_local.py):
+
+    python3 fake-zendesk.py --port 8765 --latency 120 --jitter 80 --p429 0.02 &
+    ZENDESK_BASE_URL=http://127.0.0.1:8765 python3 generate-daily-data.py --json --no-cache
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_PORT = 8765
+PER_PAGE_MAX = 100
+
+_FILTER_RE = re.compile(r'^(type|assignee|commenter|created)(:|>=|<=|>|<)(.+)$')
+
+
+def synthetic_agents(n):
+    return {str(1000 + i): f'Agent {i + 1:02d}' for i in range(n)}
+
+
+def load_agents(path):
+    data = json.loads(Path(path).read_text())
+    return data.get('agents', data)
+
+
+class Fixtures:
+    """Deterministic tickets per day, generated lazily and cached."""
+
+    def __init__(self, agents, tickets_per_day=60, seed=42):
+        self.agent_ids = sorted(agents)
+        self.tickets_per_day = tickets_per_day
+        self.seed = seed
+        self._days = {}
+        self._lock = threading.Lock()
+
+    def day(self, d):
+        with self._lock:
+            if d not in self._days:
+                self._days[d] = self._generate(d)
+            return self._days[d]
+
+    def _generate(self, d):
+        digest = hashlib.sha256(f'{self.seed}:{d.isoformat()}'.encode()).digest()
+        rng = random.Random(int.from_bytes(digest[:8], 'big'))
+        tickets = []
+        for i in range(rng.randint(self.tickets_per_day * 3 // 4, self.tickets_per_day * 5 // 4)):
+            commenters = rng.sample(self.agent_ids, k=min(len(self.agent_ids), rng.randint(0, 3)))
+            tickets.append({
+                'id': d.toordinal() * 10000 + i,
+                'created_at': f'{d.isoformat()}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z',
+                'status': rng.choice(['new', 'open', 'pending', 'solved', 'closed']),
+                'assignee_id': int(rng.choice(self.agent_ids)) if self.agent_ids else None,
+                'commenter_ids': [int(a) for a in commenters],
+                'subject': f'Fixture ticket {i + 1} of {d.isoformat()}',
+            })
+        return tickets
+
+    def ticket(self, ticket_id):
+        d = date.fromordinal(ticket_id // 10000)
+        index = ticket_id % 10000
+        tickets = self.day(d)
+        return tickets[index] if index < len(tickets) else None
+
+    def search(self, query):
+        """Tickets matching a search query (see module docstring)."""
+        start, end = None, None
+        assignee = commenter = None
+        for token in query.split():
+            match = _FILTER_RE.match(token.lower())
+            if not match:
+                continue
+            field, op, value = match.groups()
+            if field == 'assignee':
+                assignee = value
+            elif field == 'commenter':
+                commenter = value
+            elif field == 'created':
+                d = date.fromisoformat(value)
+                if op in (':', '>=', '>'):
+                    start = d if op != '>' else d + timedelta(days=1)
+                if op in (':', '<=', '<'):
+                    end = d if op != '<' else d - timedelta(days=1)
+        if start is None or end is None or end < start:
+            return []
+        out = []
+        d = start
+        while d <= end:
+            for t in self.day(d):
+                if assignee is not None and str(t['assignee_id']) != assignee:
+                    continue
+                if commenter is not None and int(commenter) not in t['commenter_ids']:
+                    continue
+                out.append(t)
+            d += timedelta(days=1)
+        return out
+
+
+class FaultInjector:
+    """Latency, per-minute rate limit and random 429 / 500 responses."""
+
+    def __init__(self, latency=0.0, jitter=0.0, rate_limit=0, p429=0.0, error_rate=0.0,
+                 retry_after=2, seed=42):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.p429 = p429
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._window = []  # request times within the last minute
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        """Return None to serve the request, or (status, headers) to fail it."""
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            roll = self._rng.random()
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 60]
+            limited = self.rate_limit and len(self._window) >= self.rate_limit
+            if limited:
+                wait = int(60 - (now - self._window[0])) + 1
+            else:
+                self._window.append(now)
+        if delay:
+            time.sleep(delay)
+        if limited:
+            return 429, {'Retry-After': str(wait)}
+        if roll < self.p429:
+            return 429, {'Retry-After': str(self.retry_after)}
+        if roll < self.p429 + self.error_rate:
+            return 500, {}
+        return None
+
+
+class FakeZendeskServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures, faults):
+        super().__init__(address, Handler)
+        self.fixtures = fixtures
+        self.faults = faults
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'endpoints': {}}
+        self.stats_lock = threading.Lock()
+        self.verbose = False
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, endpoint, status):
+        with self.stats_lock:
+            self.stats['requests'] += 1
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+            if status == 429:
+                self.stats['throttled'] += 1
+            elif status >= 500:
+                self.stats['errors'] += 1
+
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = 'FakeZendesk/1'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == '/__stats':
+            with self.server.stats_lock:
+                return self._send(200, self.server.stats)
+
+        ticket_match = re.fullmatch(r'/api/v2/tickets/(\d+)\.json', url.path)
+        endpoint = 'tickets' if ticket_match else url.path
+        fault = self.server.faults()
+        if fault:
+            status, headers = fault
+            self.server.count(endpoint, status)
+            return self._send(status, {'error': 'injected'}, headers)
+
+        status, body = self._route(url.path, params, ticket_match)
+        self.server.count(endpoint, status)
+        self._send(status, body)
+
+    def _route(self, path, params, ticket_match):
+        fixtures = self.server.fixtures
+        try:
+            if path == '/api/v2/search/count.json':
+                return 200, {'count': len(fixtures.search(params.get('query', '')))}
+            if path == '/api/v2/search.json':
+                results = fixtures.search(params.get('query', ''))
+                page = max(1, int(params.get('page', 1)))
+                per_page = min(PER_PAGE_MAX, max(1, int(params.get('per_page', PER_PAGE_MAX))))
+                chunk = results[(page - 1) * per_page:page * per_page]
+                more = page * per_page < len(results)
+                return 200, {'results': chunk, 'count': len(results),
+                             'next_page': f'{path}?page={page + 1}' if more else None}
+            if ticket_match:
+                ticket = fixtures.ticket(int(ticket_match.group(1)))
+                return (200, {'ticket': ticket}) if ticket else (404, {'error': 'RecordNotFound'})
+        except ValueError as e:
+            return 400, {'error': 'InvalidQuery', 'description': str(e)}
+        return 404, {'error': 'InvalidEndpoint'}
+
+
+def make_server(host='127.0.0.1', port=DEFAULT_PORT, agents=None, tickets_per_day=60, seed=42,
+                verbose=False, **faults):
+    """Server bound to host:port (0 = any free port); call serve_forever() to run it."""
+    server = FakeZendeskServer((host, port),
+                               Fixtures(agents or synthetic_agents(12), tickets_per_day, seed),
+                               FaultInjector(seed=seed, **faults))
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Zendesk stand-in with fault injection')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--agents-file', type=Path,
+                        help='zendesk-agents.json to take agent ids from (default: synthetic)')
+    parser.add_argument('--agents', type=int, default=12, help='Synthetic agent count')
+    parser.add_argument('--tickets-per-day', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0, help='Base latency in ms')
+    parser.add_argument('--jitter', type=float, default=0, help='Extra random latency, 0..N ms')
+    parser.add_argument('--rate-limit', type=int, default=0,
+                        help='Requests per minute before 429s (0 = unlimited)')
+    parser.add_argument('--p429', type=float, default=0, help='Probability of a random 429')
+    parser.add_argument('--error-rate', type=float, default=0, help='Probability of a 500')
+    parser.add_argument('--retry-after', type=int, default=2,
+                        help='Retry-After seconds on random 429s')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    agents = load_agents(args.agents_file) if args.agents_file else synthetic_agents(args.agents)
+    server = make_server(args.host, args.port, agents, args.tickets_per_day, args.seed,
+                         args.verbose, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                         rate_limit=args.rate_limit, p429=args.p429,
+                         error_rate=args.error_rate, retry_after=args.retry_after)
+    print(f'Fake Zendesk on {server.base_url} ({len(agents)} agents)', file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -25,44 +25,19 @@ echo "=== Batch Daily Data Generation ==="
 echo "Range: $START_DATE ~ $END_DATE"
 echo ""
 
-current="$START_DATE"
-success=0
-fail=0
-
-while [[ "$current" < "$END_DATE" || "$current" == "$END_DATE" ]]; do
-  output="$DASHBOARD_DIR/data/daily/$current.json"
-
-  if [ -f "$output" ] && [ "$(wc -c < "$output")" -gt 100 ]; then
-    echo "  ✓ $current — already exists, skipping"
-    success=$((success + 1))
-    current=$(python3 -c "from datetime import datetime, timedelta; print((datetime.strptime('$current','%Y-%m-%d')+timedelta(days=1)).strftime('%Y-%m-%d'))")
-    continue
-  fi
-
-  echo "  → $current..."
-  tmp=$(mktemp)
-  if python3 "$DASHBOARD_DIR/scripts/generate-daily-data.py" --json --date "$current" > "$tmp" 2>/dev/null; then
-    if [ -s "$tmp" ] && python3 -m json.tool "$tmp" > /dev/null 2>&1; then
-      mv "$tmp" "$output"
-      echo "    ✓ saved ($current)"
-      success=$((success + 1))
-    else
-      echo "    ⚠ empty/invalid JSON — skipped"
-      rm -f "$tmp"
-      fail=$((fail + 1))
-    fi
-  else
-    echo "    ✗ script failed — skipped"
-    rm -f "$tmp"
-    fail=$((fail + 1))
-  fi
-
-  current=$(python3 -c "from datetime import datetime, timedelta; print((datetime.strptime('$current','%Y-%m-%d')+timedelta(days=1)).strftime('%Y-%m-%d'))")
-done
+# One process for the whole range: the ticket store is loaded once and each
+# day is written atomically; days that already have data are skipped.
+status=0
+python3 "$DASHBOARD_DIR/scripts/generate-daily-data.py" \
+  --start "$START_DATE" --end "$END_DATE" --out-dir "$DASHBOARD_DIR/data/daily" || status=$?
 
 echo ""
-echo "=== Done: $success succeeded, $fail failed ==="
-
 # Update index
 echo "→ Updating index..."
+python3 "$SCRIPT_DIR/pack-daily.py"
 python3 "$SCRIPT_DIR/update-index.py"
+python3 "$SCRIPT_DIR/build-agent-series.py"
+python3 "$SCRIPT_DIR/build-rollups.py"
+python3 "$SCRIPT_DIR/build-series.py"
+
+exit $status
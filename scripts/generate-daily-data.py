@@ -5,17 +5,36 @@ Daily Dashboard Data Generator
 Produces data/daily/{WEEK}.json with:
   1. Yesterday's ticket volume, product breakdown, ticket type breakdown
   2. Per-agent activity over the past 7 days (assigned + commented tickets)
+  3. `counts`: every product and ticket type with its count, uncompressed,
+     so build-rollups.py can sum days into exact weekly/monthly breakdowns,
+     plus product x type cross counts (`productTypes`) for range_query.py
 
 Usage:
     python3 generate-daily-data.py --json                    # stdout JSON (yesterday)
     python3 generate-daily-data.py --json --date 2026-02-15  # specific date
+    python3 generate-daily-data.py --json --workers 1        # sequential agent fetch
+    python3 generate-daily-data.py --start 2026-02-01 --end 2026-02-25   # backfill
+    python3 generate-daily-data.py --dates 2026-02-03,2026-02-05         # listed days
+    python3 generate-daily-data.py --start 2026-02-01 --profile          # + cProfile dump
+
+Range mode (--start/--end or --dates) loads the ticket store once for the
+whole span and writes data/daily/YYYY-MM-DD.json for each day atomically.
+Days that already have a file, loose or in a monthly bundle, are skipped
+unless --force.
+
+Every run writes a metrics sidecar (stage timings, Zendesk calls and
+retries, bytes written, peak memory) to data/metrics/pending/, which
+update-index.py folds into data/metrics/history.json. --profile also dumps
+cProfile stats (default .cache/profiles/daily-<timestamp>.prof).
 """
 
 import sys
 import os
 import json
 import argparse
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from pathlib import Path
 
 # Resolve claude workspace root: CLAUDE_DIR env var (CI) or ../../.. (local)
 _claude_root = os.environ.get('CLAUDE_DIR') or os.path.join(
@@ -29,6 +48,24 @@ sys.path.insert(0, os.path.join(_claude_root, 'scripts', 'automation'))
 import report_engine as engine
 from zendesk_api_client import ZendeskClient
 
+from agent_activity import (build_agent_activity, fetch_agent_activity,
+                            find_column, DEFAULT_WORKERS, DEFAULT_RATE)
+import data_index
+import run_metrics
+from data_utils import DATA_DIR, DailyStore, write_json_atomic
+from zendesk_cache import CachedSearchClient, open_cache
+from zendesk_local import client_from_env
+
+# Row column holding the ticket creation timestamp (see find_column)
+CREATED_COLUMNS = ('created_at', 'created', 'created_date', 'date')
+
+# Progress output; switched to stderr when stdout carries JSON
+_log_file = sys.stdout
+
+
+def log(*args):
+    print(*args, file=_log_file)
+
 
 def load_agents():
     """Load agent ID→name mapping from config/zendesk-agents.json."""
@@ -38,117 +75,77 @@ def load_agents():
     return data.get('agents', {})
 
 
-def fetch_agent_activity(client, agents, target_date):
-    """Fetch per-agent activity for a single day.
-
-    Args:
-        client: ZendeskClient instance
-        agents: dict of agent_id (str) -> name
-        target_date: str YYYY-MM-DD
+def empty_output(target_date):
+    """Daily payload for a day with no ticket data."""
+    day_label = target_date.strftime('%a')
+    return {
+        'period': f"{target_date} ({day_label})",
+        'startDate': str(target_date),
+        'endDate': str(target_date),
+        'kpi': {'totalTickets': 0, 'topProduct': None, 'refunds': 0, 'productCount': 0},
+        'productBreakdown': [],
+        'ticketTypes': [],
+        'agentActivity': [],
+        'counts': {'products': {}, 'types': {}, 'productTypes': {}},
+    }
 
-    Returns:
-        list of dicts sorted by daily assigned desc
-    """
-    results = []
 
-    for agent_id, name in agents.items():
-        if name in ('Administrator', 'Merch Team'):
-            continue
+def product_label(product):
+    return product.upper().replace('_', ' ')
 
-        try:
-            assigned = client.search_count(
-                f"type:ticket assignee:{agent_id} "
-                f"created>={target_date} created<={target_date}"
-            )
-            replies = client.search_count(
-                f"type:ticket commenter:{agent_id} "
-                f"created>={target_date} created<={target_date}"
-            )
-        except Exception as e:
-            print(f"  Warning: failed to fetch data for {name}: {e}",
-                  file=sys.stderr)
-            assigned = replies = 0
-
-        results.append({
-            'name': name,
-            'assigned': assigned,
-            'replies': replies,
-        })
 
-    results.sort(key=lambda x: x['assigned'], reverse=True)
-    return results
+def type_label(itype):
+    return itype.replace('_', ' ').title() if itype else 'Unknown'
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate daily dashboard data')
-    parser.add_argument('--json', action='store_true', help='Output JSON to stdout')
-    parser.add_argument('--date', type=str, default=None,
-                        help='Target date YYYY-MM-DD (default: yesterday)')
-    args = parser.parse_args()
+def full_counts(by_key, label):
+    """{display label: count} for every key, largest first (labels may merge keys)."""
+    counts = {}
+    for key, count in by_key.items():
+        counts[label(key)] = counts.get(label(key), 0) + count
+    return dict(sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])))
 
-    # Redirect print to stderr in json mode
-    if args.json:
-        import builtins
-        _builtin_print = builtins.print
-        def print(*a, **kw):
-            kw.setdefault('file', sys.stderr)
-            _builtin_print(*a, **kw)
 
-    # Determine target date
-    if args.date:
-        target_date = datetime.strptime(args.date, '%Y-%m-%d').date()
-    else:
-        target_date = datetime.now().date() - timedelta(days=1)
-
-    day_label = target_date.strftime('%a')
-    print(f"=== Daily Dashboard Data: {target_date} ({day_label}) ===")
-
-    # --- Part 1: Ticket data from Zendesk API (daily JSON cache) ---
-    print("  Loading ticket data...")
-    from ticket_data_store import load_date_range_as_rows
-    day_rows, header_idx = load_date_range_as_rows(target_date, target_date)
+def product_type_counts(day_rows, header_idx):
+    """{product label: {type label: count}} for the day's tickets.
 
+    report_engine only totals products and types separately, so each row
+    is analyzed on its own to learn which product and type it counts as.
+    """
+    cross = {}
+    for row in day_rows:
+        analysis = engine.analyze_period([row], header_idx)
+        types = analysis.get('by_issue_type') or {None: 1}
+        for product, count in (analysis.get('by_product') or {}).items():
+            by_type = cross.setdefault(product_label(product), {})
+            for itype in types:
+                by_type[type_label(itype)] = by_type.get(type_label(itype), 0) + count
+    return {p: dict(sorted(t.items(), key=lambda kv: (-kv[1], kv[0])))
+            for p, t in sorted(cross.items())}
+
+
+def build_daily_output(target_date, day_rows, header_idx, agent_activity):
+    """Build the data/daily payload for one day from its ticket rows."""
     if not day_rows:
-        print("  No ticket data found.")
-        if args.json:
-            fallback = {
-                'period': f"{target_date} ({day_label})",
-                'startDate': str(target_date),
-                'endDate': str(target_date),
-                'kpi': {'totalTickets': 0, 'topProduct': None, 'refunds': 0, 'productCount': 0},
-                'productBreakdown': [],
-                'ticketTypes': [],
-                'agentActivity': [],
-            }
-            sys.stdout.write(json.dumps(fallback, indent=2) + '\n')
-        return
+        return empty_output(target_date)
 
-    print(f"  {len(day_rows)} tickets on {target_date}")
+    day_label = target_date.strftime('%a')
 
     # Analyze
-    analysis = engine.analyze_period(day_rows, header_idx)
+    with run_metrics.stage('analyze_period'):
+        analysis = engine.analyze_period(day_rows, header_idx)
     total = analysis['total']
 
     # Compress products and types
-    compressed = engine.compress_products(analysis['by_product'], top_n=10)
-    compressed_types = engine.compress_issue_types(analysis['by_issue_type'], top_n=8)
+    with run_metrics.stage('compress'):
+        compressed = engine.compress_products(analysis['by_product'], top_n=10)
+        compressed_types = engine.compress_issue_types(analysis['by_issue_type'], top_n=8)
 
     # Top product
     top_product = None
     if analysis['by_product']:
-        top_product = max(analysis['by_product'],
-                          key=analysis['by_product'].get).upper().replace('_', ' ')
-
-    # --- Part 2: Agent activity from Zendesk ---
-    print("  Fetching agent activity...")
-    agents = load_agents()
-    client = ZendeskClient()
-    agent_activity = fetch_agent_activity(
-        client, agents, str(target_date)
-    )
-    print(f"  {len(agent_activity)} agents processed")
+        top_product = product_label(max(analysis['by_product'], key=analysis['by_product'].get))
 
-    # --- Build JSON output ---
     output = {
         'period': f"{target_date} ({day_label})",
         'startDate': str(target_date),
@@ -162,13 +159,19 @@ def main():
         'productBreakdown': [],
         'ticketTypes': [],
         'agentActivity': agent_activity,
+        'counts': {
+            'products': full_counts(analysis.get('by_product') or {}, product_label),
+            'types': full_counts(analysis.get('by_issue_type') or {}, type_label),
+        },
     }
+    with run_metrics.stage('product_types'):
+        output['counts']['productTypes'] = product_type_counts(day_rows, header_idx)
 
     # Product breakdown
     for product, count in compressed['visible']:
         pct = round(count / max(total, 1) * 100, 1)
         output['productBreakdown'].append({
-            'product': product.upper().replace('_', ' '),
+            'product': product_label(product),
             'count': count,
             'pct': pct,
         })
@@ -184,7 +187,7 @@ def main():
     for itype, count in compressed_types['visible']:
         pct = round(count / max(total, 1) * 100, 1)
         output['ticketTypes'].append({
-            'type': itype.replace('_', ' ').title() if itype else 'Unknown',
+            'type': type_label(itype),
             'count': count,
             'pct': pct,
         })
@@ -196,17 +199,293 @@ def main():
             'pct': round(other_t['count'] / max(total, 1) * 100, 1),
         })
 
+    return output
+
+
+def partition_rows_by_day(rows, header_idx):
+    """Split range rows into {date_str: rows} by the created-date column.
+
+    Returns None if the rows carry no recognizable created column, in which
+    case the caller loads each day from the store separately.
+    """
+    col = find_column(header_idx, CREATED_COLUMNS)
+    if col is None:
+        return None
+    by_day = {}
+    for row in rows:
+        value = row[col] if col < len(row) else None
+        if value is None:
+            continue
+        day = value.isoformat()[:10] if hasattr(value, 'isoformat') else str(value)[:10]
+        by_day.setdefault(day, []).append(row)
+    return by_day
+
+
+class _LazyClient:
+    """Create one ZendeskClient on first use and share it across days.
+
+    With ZENDESK_BASE_URL set (e.g. scripts/fake-zendesk.py), a
+    zendesk_local.BaseUrlClient for that server is used instead.
+    """
+
+    def __init__(self):
+        self._client = None
+
+    def __call__(self):
+        if self._client is None:
+            self._client = client_from_env(ZendeskClient)
+        return self._client
+
+
+def client_factory(args):
+    """Return (make_client, cache) honoring --no-cache / --cache."""
+    lazy = _LazyClient()
+    if args.no_cache:
+        return lazy, None
+    cache = open_cache(args.cache)
+    cached = CachedSearchClient(lazy, cache)
+    return (lambda: cached), cache
+
+
+def close_cache(cache):
+    if cache is not None:
+        cache.save()
+        run_metrics.count('cache.hits', cache.hits)
+        run_metrics.count('cache.misses', cache.misses)
+        log(f"  Search cache: {cache.summary()}")
+
+
+def compute_agent_activity(args, day_rows, header_idx, agents, target_date, make_client):
+    """Agent activity for one day according to --agent-source."""
+    with run_metrics.stage('agent_activity'):
+        return _agent_activity(args, day_rows, header_idx, agents, target_date, make_client)
+
+
+def _agent_activity(args, day_rows, header_idx, agents, target_date, make_client):
+    if args.agent_source == 'search':
+        agent_activity = fetch_agent_activity(
+            make_client(), agents, str(target_date),
+            workers=args.workers, rate=args.rate,
+        )
+        log(f"  {len(agent_activity)} agents processed")
+    else:
+        agent_activity, searched = build_agent_activity(
+            day_rows, header_idx, agents, str(target_date), make_client,
+            workers=args.workers, rate=args.rate,
+        )
+        log(f"  {len(agent_activity)} agents processed "
+            f"({len(agent_activity) - searched} from ticket data, {searched} via search)")
+    return agent_activity
+
+
+def _existing_ok(path):
+    """Same rule as the shell backfill loops: a file >100 bytes is done."""
+    return path.exists() and path.stat().st_size > 100
+
+
+def run_range(args, dates):
+    """Generate and write daily files for `dates` from one ticket-store load."""
+    from ticket_data_store import load_date_range_as_rows
+
+    out_dir = Path(args.out_dir)
+    existing = DailyStore(out_dir.parent)
+    todo = [d for d in dates
+            if args.force or not (d in existing or _existing_ok(out_dir / f'{d}.json'))]
+    for d in dates:
+        if d not in todo:
+            log(f"  ✓ {d} — already exists, skipping")
+    if not todo:
+        log("=== Done: nothing to generate ===")
+        return 0
+
+    start, end = min(todo), max(todo)
+    log(f"=== Daily Dashboard Data: {start} ~ {end} ({len(todo)} days) ===")
+    log("  Loading ticket data...")
+    with run_metrics.stage('load_rows'):
+        rows, header_idx = load_date_range_as_rows(start, end)
+    by_day = partition_rows_by_day(rows, header_idx)
+    if by_day is None:
+        log("  No created-date column in ticket rows; loading day by day")
+    else:
+        log(f"  {len(rows)} tickets loaded")
+
+    agents = load_agents()
+    make_client, cache = client_factory(args)
+    written = []
+    skipped = failed = 0
+
+    for target_date in todo:
+        log(f"  → {target_date}...")
+        try:
+            if by_day is None:
+                with run_metrics.stage('load_rows'):
+                    day_rows, day_header = load_date_range_as_rows(target_date, target_date)
+            else:
+                day_rows, day_header = by_day.get(str(target_date), []), header_idx
+
+            if not day_rows and args.skip_empty:
+                log("    ⚠ 0 tickets — skipped")
+                skipped += 1
+                continue
+
+            agent_activity = []
+            if day_rows:
+                agent_activity = compute_agent_activity(
+                    args, day_rows, day_header, agents, target_date, make_client)
+            output = build_daily_output(target_date, day_rows, day_header, agent_activity)
+            with run_metrics.stage('write'):
+                write_json_atomic(out_dir / f'{target_date}.json', output)
+            log(f"    ✓ saved ({output['kpi']['totalTickets']} tickets)")
+            written.append(out_dir / f'{target_date}.json')
+        except Exception as e:
+            log(f"    ✗ failed: {e}")
+            failed += 1
+
+    close_cache(cache)
+    if written:
+        with run_metrics.stage('register'):
+            data_index.register(written)
+
+    run_metrics.count('days.written', len(written))
+    run_metrics.count('days.skipped', skipped)
+    run_metrics.count('days.failed', failed)
+    log(f"=== Done: {len(written)} saved, {skipped} skipped, {failed} failed ===")
+    return 1 if failed else 0
+
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def main():
+    global _log_file
+
+    parser = argparse.ArgumentParser(description='Generate daily dashboard data')
+    parser.add_argument('--json', action='store_true', help='Output JSON to stdout')
+    parser.add_argument('--date', type=str, default=None,
+                        help='Target date YYYY-MM-DD (default: yesterday)')
+    parser.add_argument('--start', type=str, default=None,
+                        help='Range mode: first date YYYY-MM-DD')
+    parser.add_argument('--end', type=str, default=None,
+                        help='Range mode: last date YYYY-MM-DD (default: yesterday)')
+    parser.add_argument('--dates', type=str, default=None,
+                        help='Range mode: comma-separated dates YYYY-MM-DD')
+    parser.add_argument('--out-dir', type=str, default=str(DATA_DIR / 'daily'),
+                        help='Range mode: output directory (default: data/daily)')
+    parser.add_argument('--force', action='store_true',
+                        help='Range mode: regenerate days that already have a file')
+    parser.add_argument('--skip-empty', action='store_true',
+                        help='Range mode: do not write days with 0 tickets')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent Zendesk requests (default: {DEFAULT_WORKERS}, 1 = sequential)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'Max Zendesk requests per second (default: {DEFAULT_RATE})')
+    parser.add_argument('--agent-source', choices=['auto', 'search'], default='auto',
+                        help='auto: tally from ticket rows, search only missing agents; '
+                             'search: query Zendesk for every agent')
+    parser.add_argument('--cache', type=str, default=None,
+                        help='Search cache file (default: $ZENDESK_CACHE or .cache/zendesk-search.json)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always query Zendesk, bypassing the search cache')
+    parser.add_argument('--profile', nargs='?', const='', default=None, metavar='PATH',
+                        help='Dump cProfile stats (default: .cache/profiles/daily-<timestamp>.prof)')
+    parser.add_argument('--no-metrics', action='store_true',
+                        help='Do not write a run-metrics sidecar to data/metrics/pending/')
+    args = parser.parse_args()
+
+    yesterday = datetime.now().date() - timedelta(days=1)
+    if args.end and not args.start:
+        parser.error('--end requires --start')
+
+    # --- Range mode: one process, one store load, many files ---
+    if args.dates or args.start:
+        if args.json or args.date:
+            parser.error('--json/--date cannot be combined with --start/--dates')
+        if args.dates:
+            dates = sorted({_parse_date(d.strip()) for d in args.dates.split(',') if d.strip()})
+        else:
+            start = _parse_date(args.start)
+            end = _parse_date(args.end) if args.end else yesterday
+            if start > end:
+                parser.error(f'--start {start} is after --end {end}')
+            dates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        if not dates:
+            parser.error('--dates lists no dates')
+        metrics = run_metrics.activate(run_metrics.RunMetrics(
+            'daily', start=str(dates[0]), end=str(dates[-1]), days=len(dates)))
+        with _profiling(args):
+            status = run_range(args, dates)
+        # The sidecar goes to the data tree the days were written to
+        _finish_metrics(args, metrics, Path(args.out_dir).parent)
+        sys.exit(status)
+
+    # Progress goes to stderr when stdout carries JSON
+    if args.json:
+        _log_file = sys.stderr
+
+    # Determine target date
+    target_date = _parse_date(args.date) if args.date else yesterday
+    metrics = run_metrics.activate(run_metrics.RunMetrics('daily', date=str(target_date)))
+    with _profiling(args):
+        run_day(args, target_date)
+    _finish_metrics(args, metrics, DATA_DIR)
+
+
+def _profiling(args):
+    """cProfile context for --profile, else a no-op."""
+    if args.profile is None:
+        return nullcontext()
+    return run_metrics.profiled(args.profile or None, job='daily')
+
+
+def _finish_metrics(args, metrics, data_dir):
+    if args.no_metrics:
+        return
+    path = metrics.write(data_dir)
+    log(f"  Run metrics: {path}")
+
+
+def run_day(args, target_date):
+    """Single-day mode: print (or --json emit) one day's payload."""
+    day_label = target_date.strftime('%a')
+    log(f"=== Daily Dashboard Data: {target_date} ({day_label}) ===")
+
+    # --- Part 1: Ticket data from Zendesk API (daily JSON cache) ---
+    log("  Loading ticket data...")
+    from ticket_data_store import load_date_range_as_rows
+    with run_metrics.stage('load_rows'):
+        day_rows, header_idx = load_date_range_as_rows(target_date, target_date)
+
+    if not day_rows:
+        log("  No ticket data found.")
+        if args.json:
+            sys.stdout.write(json.dumps(empty_output(target_date), indent=2) + '\n')
+        return
+
+    log(f"  {len(day_rows)} tickets on {target_date}")
+
+    # --- Part 2: Agent activity (ticket rows, Zendesk search for gaps) ---
+    log("  Fetching agent activity...")
+    make_client, cache = client_factory(args)
+    agent_activity = compute_agent_activity(
+        args, day_rows, header_idx, load_agents(), target_date, make_client)
+    close_cache(cache)
+
+    # --- Build JSON output ---
+    output = build_daily_output(target_date, day_rows, header_idx, agent_activity)
+
     if args.json:
         sys.stdout.write(json.dumps(output, indent=2, default=str) + '\n')
     else:
-        print(f"\n  Total Tickets: {total}")
-        print(f"  Top Product: {top_product}")
-        print(f"  Refunds: {analysis.get('refund_count', 0)}")
-        print(f"\n  Agent Activity ({target_date}):")
+        kpi = output['kpi']
+        log(f"\n  Total Tickets: {kpi['totalTickets']}")
+        log(f"  Top Product: {kpi['topProduct']}")
+        log(f"  Refunds: {kpi['refunds']}")
+        log(f"\n  Agent Activity ({target_date}):")
         for a in agent_activity[:10]:
-            print(f"    {a['name']:<15} assigned={a['assigned']}  replies={a['replies']}")
+            log(f"    {a['name']:<15} assigned={a['assigned']}  replies={a['replies']}")
 
-    print("=== Done ===")
+    log("=== Done ===")
 
 
 if __name__ == '__main__':
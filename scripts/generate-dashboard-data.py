@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""Generate all dashboard data for one ISO week.
+
+Runs the four weekly report generators (Weekly Pulse, QA Pulse, Weekly
+Tickets, DSAT) and the week's daily data concurrently, after one incremental
+scan of data/ into the index (data_index.update). Each generator runs
+as its own process with a timeout and is retried on failure. Report output
+is validated as JSON in-process and written atomically; empty or invalid
+output is skipped and the existing file is left in place. The QA and DSAT
+jobs take their 90-day figures from per-day ledgers (qa_ledger.py,
+dsat_ledger.py) and fetch only the days those lack. After the jobs, the
+week's volume alerts are recomputed against rolling baselines
+(alert_engine.py), the index and the derived files (agent series, monthly
+rollups, columnar series) are rebuilt, and a per-job timing summary is
+printed. The same timings go to a run-metrics sidecar in
+data/metrics/pending/ (see run_metrics.py), next to the daily job's own;
+both are folded into data/metrics/history.json before the run ends, so no
+separate update-index.py run is needed afterwards.
+
+Usage:
+    python3 generate-dashboard-data.py                  # previous (completed) week
+    python3 generate-dashboard-data.py 2026-W07
+    python3 generate-dashboard-data.py 2026-W07 --jobs 2 --timeout 600 --retries 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import data_index
+import run_metrics
+from data_utils import DATA_DIR, iso_week_monday, write_text_atomic
+
+SCRIPT_DIR = Path(__file__).parent
+DASHBOARD_DIR = SCRIPT_DIR.parent
+
+DEFAULT_TIMEOUT = 900   # seconds per attempt
+DEFAULT_RETRIES = 1
+POST_STEPS = ('build-agent-series.py', 'build-rollups.py', 'build-series.py')
+# Replaces the generators' week-over-week volume alerts with rolling-baseline ones
+ALERT_STEP = 'alert_engine.py'
+
+
+def previous_week():
+    """ISO week string of the week before the current one (UTC)."""
+    iso = (datetime.now(timezone.utc) - timedelta(days=7)).isocalendar()
+    return f'{iso[0]}-W{iso[1]:02d}'
+
+
+def load_env_file(path, env):
+    """Add KEY=VALUE lines of a shell env file to `env` (no expansion)."""
+    try:
+        lines = Path(path).read_text().splitlines()
+    except OSError:
+        return False
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.removeprefix('export ').split('=', 1)
+        env[key.strip()] = value.strip().strip('"\'')
+    return True
+
+
+def build_env(claude_dir):
+    env = dict(os.environ)
+    # DSAT script expects ZENDESK_TOKEN; .env.zendesk uses ZENDESK_API_TOKEN
+    if load_env_file(claude_dir / 'scripts' / 'automation' / '.env.zendesk', env):
+        env.setdefault('ZENDESK_TOKEN', env.get('ZENDESK_API_TOKEN', ''))
+    return env
+
+
+def refresh_google_token(claude_dir, env):
+    """Refresh the Google OAuth token for local runs (CI refreshes it itself)."""
+    script = claude_dir / 'scripts' / 'automation' / 'refresh-google-oauth.py'
+    if not script.exists():
+        return
+    print('→ Refreshing Google OAuth token...')
+    result = subprocess.run([sys.executable, str(script)], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    print('  ✓ Token refreshed' if result.returncode == 0
+          else '  ⚠ Token refresh failed — continuing with existing token')
+    print()
+
+
+def weekly_jobs(claude_dir, week, start, end, data_dir):
+    """(label, output path or None, command) for every job of the week."""
+    py = sys.executable
+    return [
+        ('Weekly Pulse', data_dir / 'pulse' / f'{week}.json',
+         [py, str(claude_dir / 'skills/weekly-pulse/scripts/generate-pulse.py'),
+          '--json', '--start', start, '--end', end]),
+        # Runs qa-pulse-report.py for the week; BCR comes from the per-day bug ledger
+        ('QA Pulse', data_dir / 'qa' / f'{week}.json',
+         [py, str(SCRIPT_DIR / 'qa_ledger.py'), '--data-dir', str(data_dir),
+          'week', '--start', start, '--end', end]),
+        ('Weekly Tickets', data_dir / 'tickets' / f'{week}.json',
+         [py, str(claude_dir / 'skills/daily-ticket-report/scripts/generate-weekly-report.py'),
+          '--json', '--start', start, '--end', end]),
+        # Fetches only ledger days it lacks and slides the 90-day window
+        ('DSAT', data_dir / 'dsat' / f'{week}.json',
+         [py, str(SCRIPT_DIR / 'dsat_ledger.py'), '--data-dir', str(data_dir),
+          'week', '--end', end]),
+        # Writes (and registers) its own files, one per day
+        ('Daily data', None,
+         [py, str(SCRIPT_DIR / 'generate-daily-data.py'),
+          '--start', start, '--end', end, '--out-dir', str(data_dir / 'daily')]),
+    ]
+
+
+def _tail(text, lines):
+    return '\n'.join(text.strip().splitlines()[-lines:])
+
+
+def _warnings(text):
+    """Lines of a job's stderr that start with 'Warning:' (e.g. a ledger fallback)."""
+    return [line.strip() for line in text.splitlines()
+            if line.strip().lower().startswith('warning:')]
+
+
+def run_job(label, output, cmd, env, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES):
+    """Run one generator, retrying failures and timeouts.
+
+    Returns a result dict: label, status (ok / invalid / failed / timeout),
+    attempts, seconds, output (path written or None), detail (log text) and,
+    for successful jobs, warnings ('Warning:' lines from stderr).
+    """
+    started = time.monotonic()
+    result = {'label': label, 'output': None, 'detail': ''}
+    for attempt in range(1, retries + 2):
+        result['attempts'] = attempt
+        try:
+            proc = subprocess.run(cmd, env=env, capture_output=True, text=True,
+                                  timeout=timeout, cwd=DASHBOARD_DIR)
+        except subprocess.TimeoutExpired:
+            result.update(status='timeout', detail=f'timed out after {timeout}s')
+        else:
+            if proc.returncode == 0:
+                break
+            result.update(status='failed',
+                          detail=f'exit {proc.returncode}\n' + _tail(proc.stderr, 10))
+        if attempt <= retries:
+            time.sleep(min(60, 5 * 2 ** (attempt - 1)))
+    else:
+        result['seconds'] = time.monotonic() - started
+        return result
+
+    if output is None:
+        result.update(status='ok', detail=_tail(proc.stdout, 3))
+    else:
+        try:
+            json.loads(proc.stdout)
+        except ValueError:
+            result.update(status='invalid',
+                          detail='empty or invalid JSON\n' + _tail(proc.stderr, 5))
+        else:
+            write_text_atomic(output, proc.stdout)
+            result.update(status='ok', output=output,
+                          detail=f'saved to {output.parent.name}/{output.name}')
+    if result['status'] == 'ok':
+        # A job that falls back to a slower or degraded mode says so on stderr
+        result['warnings'] = _warnings(proc.stderr)
+        result['detail'] = '\n'.join([result['detail'], *result['warnings']])
+    result['seconds'] = time.monotonic() - started
+    return result
+
+
+def run_post_step(script, env, data_dir, *extra):
+    started = time.monotonic()
+    proc = subprocess.run([sys.executable, str(SCRIPT_DIR / script), '--data-dir', str(data_dir),
+                           *extra], env=env, capture_output=True, text=True)
+    return {
+        'label': script,
+        'status': 'ok' if proc.returncode == 0 else 'failed',
+        'attempts': 1,
+        'seconds': time.monotonic() - started,
+        'detail': _tail(proc.stdout if proc.returncode == 0 else proc.stderr, 3),
+    }
+
+
+SYMBOLS = {'ok': '✓', 'invalid': '⚠', 'failed': '✗', 'timeout': '✗'}
+
+
+def print_result(r):
+    print(f"{SYMBOLS[r['status']]} {r['label']} ({r['seconds']:.1f}s): {r['status']}")
+    for line in r['detail'].splitlines():
+        print('    ' + line)
+    if os.environ.get('GITHUB_ACTIONS'):
+        for w in r.get('warnings', ()):
+            print(f"::warning::{r['label']}: {w.split(':', 1)[1].strip()}")
+
+
+def print_summary(results, total):
+    print()
+    print('=== Timing summary ===')
+    width = max(len(r['label']) for r in results)
+    for r in results:
+        retried = f"  ({r['attempts']} attempts)" if r['attempts'] > 1 else ''
+        print(f"  {r['label']:<{width}}  {r['status']:<8} {r['seconds']:7.1f}s{retried}")
+    print(f"  {'total (wall)':<{width}}  {'':<8} {total:7.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate dashboard data for one ISO week')
+    parser.add_argument('week', nargs='?', default=None, help='ISO week (default: previous week)')
+    parser.add_argument('--jobs', type=int, default=5, help='Generators run at once (default 5)')
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT,
+                        help=f'Seconds per attempt (default {DEFAULT_TIMEOUT})')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'Retries after a failed attempt (default {DEFAULT_RETRIES})')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    week = args.week or previous_week()
+    monday = iso_week_monday(week)
+    if monday is None:
+        parser.error(f'invalid ISO week: {week}')
+    start, end = monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+    # Default: claude workspace two levels up from the dashboard
+    claude_dir = Path(os.environ.get('CLAUDE_DIR') or DASHBOARD_DIR.parent.parent)
+
+    env = build_env(claude_dir)
+    refresh_google_token(claude_dir, env)
+
+    print('=== Team Dashboard Data Generator ===')
+    print(f'Week: {week} ({start} ~ {end})')
+    print(f'Dashboard: {DASHBOARD_DIR}')
+    print(f'Claude workspace: {claude_dir}')
+    print()
+
+    for sub in ('pulse', 'qa', 'tickets', 'dsat', 'daily'):
+        (args.data_dir / sub).mkdir(parents=True, exist_ok=True)
+
+    metrics = run_metrics.activate(run_metrics.RunMetrics('weekly', week=week))
+    started = time.monotonic()
+    # Pick up files committed since the restored manifest was saved (the
+    # daily job's, manual edits); the jobs below only register their own
+    with metrics.stage('index_scan'):
+        _, changed = data_index.update(args.data_dir)
+    print(f'  Index: {len(changed)} files changed since the last scan')
+    results = []
+    jobs = weekly_jobs(claude_dir, week, start, end, args.data_dir)
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(run_job, label, output, cmd, env, args.timeout, args.retries)
+                   for label, output, cmd in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+            print_result(results[-1])
+    results.sort(key=lambda r: [j[0] for j in jobs].index(r['label']))
+
+    written = [r['output'] for r in results if r['output']]
+    if written:
+        data_index.register(written, args.data_dir)
+
+    print()
+    print('→ Updating derived files...')
+    results.append(run_post_step(ALERT_STEP, env, args.data_dir, '--weeks', week))
+    print_result(results[-1])
+    for script in POST_STEPS:
+        results.append(run_post_step(script, env, args.data_dir))
+        print_result(results[-1])
+
+    print_summary(results, time.monotonic() - started)
+    for r in results:
+        metrics.add_stage(r['label'], r['seconds'])
+        metrics.count('attempts', r['attempts'])
+        if r.get('warnings'):
+            metrics.count('jobs.warnings', len(r['warnings']))
+        if r['status'] != 'ok':
+            metrics.count(f"jobs.{r['status']}")
+    print(f'  Run metrics: {metrics.write(args.data_dir)}')
+    if run_metrics.collect(args.data_dir):
+        data_index.register([args.data_dir / run_metrics.HISTORY_FILE], args.data_dir)
+    print()
+    print(f'✅ Done! Dashboard data for {week} generated.')
+    print(f'   Files in: {args.data_dir}/')
+
+
+if __name__ == '__main__':
+    main()
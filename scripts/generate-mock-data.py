@@ -1,13 +1,34 @@
 #!/usr/bin/env python3
-"""Generate 2 months of realistic mock dashboard data for development/testing."""
+"""Generate realistic mock dashboard data for development/testing.
+
+By default this writes 2025-W51 through 2026-W05 with the built-in product,
+tally and agent lists. Scale knobs produce larger fixtures: years of
+history, hundreds of products and tallies, dozens of agents and thousands
+of DSAT comments. The built-in lists are padded with synthetic entries as
+needed.
+
+Each week is generated from its own seed, derived from --seed and the
+week, so any week can be regenerated on its own with identical output.
+Weeks are generated in parallel across cores (--jobs).
+
+Usage:
+    python3 generate-mock-data.py                       # default 7 weeks into data/
+    python3 generate-mock-data.py 2026-W09              # one week (same as in a full run)
+    python3 generate-mock-data.py --weeks 156 --end 2026-W05 --products 300 \
+        --tallies 500 --agents 40 --dsat-comments 2000 --out /tmp/mock-data
+"""
+import argparse
+import hashlib
 import json
+import os
 import random
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
 
-random.seed(42)
+SEED = 42  # base seed; every week derives its own from it (see seed_for)
 
 DATA_DIR = Path(__file__).parent.parent / 'data'
 
@@ -80,6 +101,34 @@ DSAT_SAMPLES = [
 ]
 
 
+def build_catalog(products: int | None = None, tallies: int | None = None,
+                  agents: int | None = None) -> dict:
+    """Products, tallies and agents to draw from.
+
+    Each list is the built-in one, truncated or padded with synthetic
+    entries to the requested size (None keeps the built-in list).
+    """
+    def sized(items, n, make):
+        if n is None:
+            return list(items)
+        return list(items[:n]) + [make(i) for i in range(len(items), n)]
+
+    product_list = sized(list(zip(PRODUCTS, PRODUCT_WEIGHTS)), products,
+                         lambda i: (f'PRODUCT {i + 1:03d}', 1 + i % 4))
+    families = sorted({t.split('  ')[0] for t in TALLY_TEMPLATES})
+    return {
+        'products': [p for p, _ in product_list],
+        'productWeights': [w for _, w in product_list],
+        'tallies': sized(TALLY_TEMPLATES, tallies,
+                         lambda i: f'{families[i % len(families)]}  Synthetic  Issue {i + 1:04d}'),
+        'agents': sized(AGENTS, agents,
+                        lambda i: (f'Agent {i + 1:02d}', 5 + (i * 7) % 40, 5 + (i * 11) % 45)),
+    }
+
+
+DEFAULT_CATALOG = build_catalog()
+
+
 def iso_week_monday(year: int, week: int) -> date:
     jan4 = date(year, 1, 4)
     monday_w1 = jan4 - timedelta(days=jan4.isoweekday() - 1)
@@ -90,34 +139,37 @@ def week_label(year: int, week: int) -> str:
     return f'{year}-W{week:02d}'
 
 
-def rand_vary(base: int, pct: float = 0.25) -> int:
+def rand_vary(rng: random.Random, base: int, pct: float = 0.25) -> int:
     lo = int(base * (1 - pct))
     hi = int(base * (1 + pct))
-    return max(1, random.randint(lo, hi))
+    return max(1, rng.randint(lo, hi))
 
 
-def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
+def generate_pulse(year: int, week: int, prev_total: int | None,
+                   catalog: dict = DEFAULT_CATALOG, rng: random.Random = random,
+                   total: int | None = None) -> dict:
     monday = iso_week_monday(year, week)
     sunday = monday + timedelta(days=6)
-    total = rand_vary(350, 0.2)
+    if total is None:
+        total = rand_vary(rng, 350, 0.2)
 
     # Product breakdown
-    raw_counts = [max(1, rand_vary(w, 0.3)) for w in PRODUCT_WEIGHTS]
+    raw_counts = [max(1, rand_vary(rng, w, 0.3)) for w in catalog['productWeights']]
     scale = total / sum(raw_counts)
     products = []
-    for i, p in enumerate(PRODUCTS):
+    for i, p in enumerate(catalog['products']):
         count = max(1, round(raw_counts[i] * scale))
-        delta = random.uniform(-15, 15) if prev_total else 0
-        tallies = random.sample(TALLY_TEMPLATES, k=min(3, len(TALLY_TEMPLATES)))
+        delta = rng.uniform(-15, 15) if prev_total else 0
+        tallies = rng.sample(catalog['tallies'], k=min(3, len(catalog['tallies'])))
         top_issues = []
         remaining = count
         for t in tallies:
-            c = max(1, rand_vary(remaining // 3, 0.5)) if remaining > 1 else remaining
+            c = max(1, rand_vary(rng, remaining // 3, 0.5)) if remaining > 1 else remaining
             c = min(c, remaining)
             top_issues.append({
                 'tally': t,
                 'count': c,
-                'tickets': [{'id': str(random.randint(570000, 580000))} for _ in range(min(c, 5))]
+                'tickets': [{'id': str(rng.randint(570000, 580000))} for _ in range(min(c, 5))]
             })
             remaining -= c
             if remaining <= 0:
@@ -133,7 +185,7 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
     products.sort(key=lambda x: x['count'], reverse=True)
 
     # Ticket types
-    type_raw = [max(1, rand_vary(w, 0.3)) for w in TYPE_WEIGHTS]
+    type_raw = [max(1, rand_vary(rng, w, 0.3)) for w in TYPE_WEIGHTS]
     type_scale = total / sum(type_raw)
     types = []
     for i, t in enumerate(TICKET_TYPES):
@@ -142,8 +194,8 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
             'type': t,
             'count': count,
             'pct': round(count / total * 100, 1),
-            'delta': round(random.uniform(-20, 20), 1),
-            'direction': random.choice(['up', 'down', 'same'])
+            'delta': round(rng.uniform(-20, 20), 1),
+            'direction': rng.choice(['up', 'down', 'same'])
         })
     types.sort(key=lambda x: x['count'], reverse=True)
 
@@ -154,7 +206,7 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
     for d in range(7):
         day_date = monday + timedelta(days=d)
         if d < 6:
-            day_count = rand_vary(total // 7, 0.4)
+            day_count = rand_vary(rng, total // 7, 0.4)
             day_count = min(day_count, remaining)
         else:
             day_count = remaining
@@ -166,13 +218,13 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
         remaining -= day_count
 
     # AI ops
-    ai_res_rate = round(random.uniform(28, 42), 1)
-    all_closed = rand_vary(45, 0.2)
+    ai_res_rate = round(rng.uniform(28, 42), 1)
+    all_closed = rand_vary(rng, 45, 0.2)
     devin_closed = round(all_closed * ai_res_rate / 100)
-    ai_good = random.randint(1, 5)
-    ai_bad = random.randint(0, 2)
-    human_good = random.randint(5, 15)
-    human_bad = random.randint(0, 3)
+    ai_good = rng.randint(1, 5)
+    ai_bad = rng.randint(0, 2)
+    human_good = rng.randint(5, 15)
+    human_bad = rng.randint(0, 3)
 
     # STFS with slight ticket count variation
     stfs = []
@@ -180,14 +232,14 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
         stfs.append({
             'key': key,
             'summary': summary,
-            'status': random.choice(['To Do', 'In Review']),
+            'status': rng.choice(['To Do', 'In Review']),
             'product': product,
-            'ticketCount': rand_vary(30, 0.5),
-            'dsatCount': random.randint(0, 3)
+            'ticketCount': rand_vary(rng, 30, 0.5),
+            'dsatCount': rng.randint(0, 3)
         })
     stfs.sort(key=lambda x: x['ticketCount'], reverse=True)
 
-    refunds = rand_vary(12, 0.3)
+    refunds = rand_vary(rng, 12, 0.3)
 
     return {
         'period': f'Week of {monday.strftime("%m/%d")} - {sunday.strftime("%m/%d")}',
@@ -195,11 +247,11 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
         'endDate': sunday.isoformat(),
         'alerts': [
             {
-                'severity': random.choice(['high', 'medium']),
-                'message': f'{random.choice(PRODUCTS)} / {random.choice(TALLY_TEMPLATES)}: {random.randint(1,3)} → {random.randint(4,8)}',
+                'severity': rng.choice(['high', 'medium']),
+                'message': f'{rng.choice(catalog["products"])} / {rng.choice(catalog["tallies"])}: {rng.randint(1,3)} → {rng.randint(4,8)}',
                 'type': 'tally_surge'
             }
-        ] if random.random() > 0.4 else [],
+        ] if rng.random() > 0.4 else [],
         'kpi': {
             'totalTickets': total,
             'topProduct': products[0]['product'],
@@ -224,28 +276,29 @@ def generate_pulse(year: int, week: int, prev_total: int | None) -> dict:
         },
         'aiOpportunities': [
             {
-                'tally': random.choice(TALLY_TEMPLATES),
-                'count': rand_vary(8, 0.4),
-                'aiCount': random.randint(1, 3),
-                'aiResRate': round(random.uniform(10, 40), 1)
+                'tally': rng.choice(catalog['tallies']),
+                'count': rand_vary(rng, 8, 0.4),
+                'aiCount': rng.randint(1, 3),
+                'aiResRate': round(rng.uniform(10, 40), 1)
             }
-            for _ in range(random.randint(1, 3))
+            for _ in range(rng.randint(1, 3))
         ],
         'stfs': stfs
     }
 
 
-def generate_qa(year: int, week: int) -> dict:
+def generate_qa(year: int, week: int, catalog: dict = DEFAULT_CATALOG,
+                rng: random.Random = random) -> dict:
     monday = iso_week_monday(year, week)
-    qa_bugs_total = random.randint(5, 30)
-    customer_bugs_total = random.randint(0, 8)
+    qa_bugs_total = rng.randint(5, 30)
+    customer_bugs_total = rng.randint(0, 8)
     total_bugs = qa_bugs_total + customer_bugs_total
     overall_bcr = round(qa_bugs_total / max(1, total_bugs) * 100, 1)
 
     bcr_by_product = []
     for p in QA_PRODUCTS:
-        qb = random.randint(1, qa_bugs_total // 2 + 1)
-        cb = random.randint(0, max(1, customer_bugs_total // 2))
+        qb = rng.randint(1, qa_bugs_total // 2 + 1)
+        cb = rng.randint(0, max(1, customer_bugs_total // 2))
         t = qb + cb
         bcr_by_product.append({
             'product': p,
@@ -267,40 +320,40 @@ def generate_qa(year: int, week: int) -> dict:
     # Test execution
     test_exec = {}
     for p in QA_PRODUCTS:
-        total_cases = rand_vary(400, 0.5)
-        passed = int(total_cases * random.uniform(0.80, 0.98))
-        failed = int(total_cases * random.uniform(0.01, 0.08))
-        blocked = random.randint(0, 15)
+        total_cases = rand_vary(rng, 400, 0.5)
+        passed = int(total_cases * rng.uniform(0.80, 0.98))
+        failed = int(total_cases * rng.uniform(0.01, 0.08))
+        blocked = rng.randint(0, 15)
         skipped = total_cases - passed - failed - blocked
         test_exec[p] = {
-            'completedRuns': random.randint(3, 8),
-            'totalRuns': random.randint(5, 10),
+            'completedRuns': rng.randint(3, 8),
+            'totalRuns': rng.randint(5, 10),
             'totalCases': total_cases,
             'totalPassed': passed,
             'totalFailed': failed,
             'totalBlocked': blocked,
             'totalSkipped': max(0, skipped),
             'passRate': round(passed / max(1, total_cases) * 100, 1),
-            'avgVelocity': round(random.uniform(15, 45), 1),
+            'avgVelocity': round(rng.uniform(15, 45), 1),
             'blockedRate': round(blocked / max(1, total_cases) * 100, 1)
         }
 
     # Recent bugs
     qa_bug_list = []
     for i in range(min(5, qa_bugs_total)):
-        proj = random.choice(['FWP', 'BX', 'RA'])
+        proj = rng.choice(['FWP', 'BX', 'RA'])
         qa_bug_list.append({
-            'key': f'{proj}-{random.randint(600, 800)}',
-            'summary': f'[{random.choice(QA_PRODUCTS)}] Test issue #{random.randint(1,99)}',
+            'key': f'{proj}-{rng.randint(600, 800)}',
+            'summary': f'[{rng.choice(QA_PRODUCTS)}] Test issue #{rng.randint(1,99)}',
             'project': proj
         })
 
     customer_bug_list = []
     for i in range(min(5, customer_bugs_total)):
         customer_bug_list.append({
-            'key': f'STFS-{random.randint(400, 500)}',
-            'summary': f'{random.choice(PRODUCTS)} - Customer reported issue #{random.randint(1,99)}',
-            'product': random.choice(QA_PRODUCTS)
+            'key': f'STFS-{rng.randint(400, 500)}',
+            'summary': f'{rng.choice(catalog["products"])} - Customer reported issue #{rng.randint(1,99)}',
+            'product': rng.choice(QA_PRODUCTS)
         })
 
     sunday = monday + timedelta(days=6)
@@ -332,20 +385,25 @@ def generate_qa(year: int, week: int) -> dict:
     }
 
 
-def generate_dsat(year: int, week: int) -> dict:
+def generate_dsat(year: int, week: int, comments: int | None = None,
+                  rng: random.Random = random) -> dict:
+    """DSAT for the 90 days up to the week; `comments` sets len(allComments)."""
     monday = iso_week_monday(year, week)
-    total_bad = rand_vary(40, 0.3)
-    with_comments = int(total_bad * random.uniform(0.75, 0.90))
-    ai_negative = int(with_comments * random.uniform(0.45, 0.65))
+    total_bad = rand_vary(rng, 40, 0.3)
+    with_comments = int(total_bad * rng.uniform(0.75, 0.90))
+    if comments is not None:
+        with_comments = comments
+        total_bad = max(total_bad, round(comments / rng.uniform(0.75, 0.90)))
+    ai_negative = int(with_comments * rng.uniform(0.45, 0.65))
 
     samples = []
-    for _ in range(min(20, total_bad)):
+    for _ in range(min(20, total_bad) if comments is None else comments):
         samples.append({
-            'ticketId': random.randint(10000000000000, 99999999999999),
-            'comment': random.choice(DSAT_SAMPLES),
-            'createdAt': (monday + timedelta(days=random.randint(0, 6),
-                                             hours=random.randint(0, 23))).isoformat() + 'Z',
-            'url': f'https://positivegrid.zendesk.com/api/v2/satisfaction_ratings/{random.randint(40000000000000, 49999999999999)}.json'
+            'ticketId': rng.randint(10000000000000, 99999999999999),
+            'comment': rng.choice(DSAT_SAMPLES),
+            'createdAt': (monday + timedelta(days=rng.randint(0, 6),
+                                             hours=rng.randint(0, 23))).isoformat() + 'Z',
+            'url': f'https://positivegrid.zendesk.com/api/v2/satisfaction_ratings/{rng.randint(40000000000000, 49999999999999)}.json'
         })
 
     all_comments = []
@@ -354,8 +412,9 @@ def generate_dsat(year: int, week: int) -> dict:
             'ticketId': s['ticketId'],
             'comment': s['comment'],
             'createdAt': s['createdAt'],
-            'isAiNegative': random.random() > 0.4
+            'isAiNegative': rng.random() > 0.4
         })
+    samples = samples[:20]
 
     return {
         'period': f'{(monday - timedelta(days=90)).isoformat()} ~ {monday.isoformat()}',
@@ -370,18 +429,33 @@ def generate_dsat(year: int, week: int) -> dict:
     }
 
 
-def generate_daily(year: int, week: int) -> dict:
-    monday = iso_week_monday(year, week)
-    # Always use Monday to match the dropdown label derived from ISO week
-    report_date = monday
+def split_by_type(product_breakdown: list, ticket_types: list) -> dict:
+    """Spread each product's count over the day's types in proportion to
+    the type counts (largest remainder), so every product row sums exactly."""
+    type_total = sum(t['count'] for t in ticket_types)
+    cross = {}
+    for p in product_breakdown:
+        if not type_total:
+            break
+        shares = [(t['type'], p['count'] * t['count'] / type_total) for t in ticket_types]
+        counts = {name: int(share) for name, share in shares}
+        left = p['count'] - sum(counts.values())
+        for name, share in sorted(shares, key=lambda s: int(s[1]) - s[1])[:left]:
+            counts[name] += 1
+        cross[p['product']] = {name: n for name, n in counts.items() if n}
+    return cross
+
+
+def generate_daily(report_date: date, catalog: dict = DEFAULT_CATALOG,
+                   rng: random.Random = random) -> dict:
+    """One day's data, shaped like generate-daily-data.py output."""
     days_abbr = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-    day_offset = 0
-    total = rand_vary(55, 0.25)
+    total = rand_vary(rng, 55, 0.25)
 
     product_breakdown = []
-    raw = [max(1, rand_vary(w, 0.3)) for w in PRODUCT_WEIGHTS]
+    raw = [max(1, rand_vary(rng, w, 0.3)) for w in catalog['productWeights']]
     scale = total / sum(raw)
-    for i, p in enumerate(PRODUCTS):
+    for i, p in enumerate(catalog['products']):
         count = max(0, round(raw[i] * scale))
         if count > 0:
             product_breakdown.append({
@@ -391,7 +465,7 @@ def generate_daily(year: int, week: int) -> dict:
             })
     product_breakdown.sort(key=lambda x: x['count'], reverse=True)
 
-    type_raw = [max(1, rand_vary(w, 0.3)) for w in TYPE_WEIGHTS]
+    type_raw = [max(1, rand_vary(rng, w, 0.3)) for w in TYPE_WEIGHTS]
     type_scale = total / sum(type_raw)
     ticket_types = []
     for i, t in enumerate(TICKET_TYPES):
@@ -404,48 +478,52 @@ def generate_daily(year: int, week: int) -> dict:
             })
     ticket_types.sort(key=lambda x: x['count'], reverse=True)
 
+    # Agent bases are weekly volumes
     agents = []
-    for name, base_assigned, base_replies in AGENTS:
-        assigned = rand_vary(base_assigned, 0.3)
-        replies = rand_vary(base_replies, 0.3)
+    for name, base_assigned, base_replies in catalog['agents']:
         agents.append({
             'name': name,
-            'assigned': assigned,
-            'replies': replies,
-            'avgAssignedPerDay': round(assigned / 7, 1),
-            'avgRepliesPerDay': round(replies / 7, 1)
+            'assigned': rand_vary(rng, max(1, base_assigned // 7), 0.3),
+            'replies': rand_vary(rng, max(1, base_replies // 7), 0.3),
         })
+    agents.sort(key=lambda x: x['assigned'], reverse=True)
 
     return {
-        'period': f'{report_date.isoformat()} ({days_abbr[day_offset]})',
+        'period': f'{report_date.isoformat()} ({days_abbr[report_date.weekday()]})',
         'startDate': report_date.isoformat(),
         'endDate': report_date.isoformat(),
         'kpi': {
             'totalTickets': total,
             'topProduct': product_breakdown[0]['product'] if product_breakdown else '-',
-            'refunds': rand_vary(6, 0.4),
+            'refunds': rand_vary(rng, 6, 0.4),
             'productCount': len(product_breakdown)
         },
         'productBreakdown': product_breakdown,
         'ticketTypes': ticket_types,
-        'agentActivity': agents
+        'agentActivity': agents,
+        'counts': {
+            'products': {p['product']: p['count'] for p in product_breakdown},
+            'types': {t['type']: t['count'] for t in ticket_types},
+            'productTypes': split_by_type(product_breakdown, ticket_types),
+        }
     }
 
 
-def generate_tickets(year: int, week: int, pulse_data: dict) -> dict:
+def generate_tickets(year: int, week: int, pulse_data: dict,
+                     rng: random.Random = random) -> dict:
     """Tickets data mirrors pulse but with slightly different structure."""
     monday = iso_week_monday(year, week)
     sunday = monday + timedelta(days=6)
 
     stfs = []
-    for key, summary, product in random.sample(STFS_ISSUES, k=min(8, len(STFS_ISSUES))):
+    for key, summary, product in rng.sample(STFS_ISSUES, k=min(8, len(STFS_ISSUES))):
         stfs.append({
             'key': key,
             'summary': summary,
-            'status': random.choice(['To Do', 'In Review']),
+            'status': rng.choice(['To Do', 'In Review']),
             'product': product,
-            'ticketCount': rand_vary(10, 0.5),
-            'followUp': random.random() > 0.5
+            'ticketCount': rand_vary(rng, 10, 0.5),
+            'followUp': rng.random() > 0.5
         })
     stfs.sort(key=lambda x: x['ticketCount'], reverse=True)
 
@@ -463,69 +541,115 @@ def generate_tickets(year: int, week: int, pulse_data: dict) -> dict:
     }
 
 
-def generate_single_week(year: int, week: int):
-    """Generate mock data for a single week."""
-    for subdir in ['pulse', 'qa', 'dsat', 'daily', 'tickets']:
-        (DATA_DIR / subdir).mkdir(parents=True, exist_ok=True)
+def seed_for(seed: int, year: int, week: int, stream: str = '') -> int:
+    """Stable seed for one week (and named stream) of mock data.
 
-    wl = week_label(year, week)
-    monday = iso_week_monday(year, week)
-    print(f'Generating {wl} ({monday.isoformat()})...')
+    Derived with SHA-256 rather than hash(), which is salted per process.
+    """
+    digest = hashlib.sha256(f'{seed}:{week_label(year, week)}:{stream}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
 
-    pulse = generate_pulse(year, week, 350)
-    qa = generate_qa(year, week)
-    dsat = generate_dsat(year, week)
-    daily = generate_daily(year, week)
-    tickets = generate_tickets(year, week, pulse)
 
-    for subdir, data in [('pulse', pulse), ('qa', qa), ('dsat', dsat),
-                         ('daily', daily), ('tickets', tickets)]:
-        path = DATA_DIR / subdir / f'{wl}.json'
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+def week_total(seed: int, year: int, week: int) -> int:
+    """Pulse ticket total for a week, from its own stream.
 
-    print(f'Done. Generated {wl}.')
+    Kept separate from the week's main stream so the next week can read it as
+    carry-over state without generating this week.
+    """
+    return rand_vary(random.Random(seed_for(seed, year, week, 'total')), 350, 0.2)
 
 
-def main():
-    # Support single week argument: python generate-mock-data.py 2026-W09
-    if len(sys.argv) > 1:
-        arg = sys.argv[1]
-        match = re.match(r'(\d{4})-W(\d{2})', arg)
-        if match:
-            generate_single_week(int(match.group(1)), int(match.group(2)))
-            return
-        print(f'Invalid week format: {arg}. Expected: YYYY-WNN')
-        sys.exit(1)
+def previous_week(year: int, week: int) -> tuple[int, int]:
+    iso = (iso_week_monday(year, week) - timedelta(weeks=1)).isocalendar()
+    return iso[0], iso[1]
 
-    # Default: generate 2025-W51 through 2026-W05
-    weeks_to_generate = [
-        (2025, 51), (2025, 52),
-        (2026, 1), (2026, 2), (2026, 3), (2026, 4), (2026, 5)
-    ]
 
-    for subdir in ['pulse', 'qa', 'dsat', 'daily', 'tickets']:
-        (DATA_DIR / subdir).mkdir(parents=True, exist_ok=True)
+def write_week(year: int, week: int, out_dir: Path = DATA_DIR, catalog: dict = DEFAULT_CATALOG,
+               dsat_comments: int | None = None, seed: int = SEED) -> str:
+    """Generate and write every report for one week.
 
-    prev_total = None
-    for year, week in weeks_to_generate:
-        wl = week_label(year, week)
-        monday = iso_week_monday(year, week)
-        print(f'Generating {wl} ({monday.isoformat()})...')
+    Output depends only on the week, the seed and the options, so a week
+    regenerated on its own matches the same week from a full run.
+    """
+    wl = week_label(year, week)
+    monday = iso_week_monday(year, week)
+    print(f'Generating {wl} ({monday.isoformat()})...', flush=True)
+
+    rng = random.Random(seed_for(seed, year, week))
+    # Carry-over state from the previous week, derived rather than threaded
+    prev_total = week_total(seed, *previous_week(year, week))
+
+    pulse = generate_pulse(year, week, prev_total, catalog, rng,
+                           total=week_total(seed, year, week))
+    qa = generate_qa(year, week, catalog, rng)
+    dsat = generate_dsat(year, week, dsat_comments, rng)
+    tickets = generate_tickets(year, week, pulse, rng)
+    outputs = [(f'pulse/{wl}.json', pulse), (f'qa/{wl}.json', qa),
+               (f'dsat/{wl}.json', dsat), (f'tickets/{wl}.json', tickets)]
+    for d in range(7):
+        day = monday + timedelta(days=d)
+        outputs.append((f'daily/{day.isoformat()}.json', generate_daily(day, catalog, rng)))
 
-        pulse = generate_pulse(year, week, prev_total)
-        prev_total = pulse['kpi']['totalTickets']
+    for rel, data in outputs:
+        path = out_dir / rel
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+    return wl
 
-        qa = generate_qa(year, week)
-        dsat = generate_dsat(year, week)
-        daily = generate_daily(year, week)
-        tickets = generate_tickets(year, week, pulse)
 
-        for subdir, data in [('pulse', pulse), ('qa', qa), ('dsat', dsat),
-                             ('daily', daily), ('tickets', tickets)]:
-            path = DATA_DIR / subdir / f'{wl}.json'
-            path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+def weeks_ending(end: str, count: int) -> list[tuple[int, int]]:
+    """(year, week) for the `count` ISO weeks up to and including `end`."""
+    match = re.fullmatch(r'(\d{4})-W(\d{2})', end)
+    if not match:
+        raise ValueError(f'Invalid week format: {end}. Expected: YYYY-WNN')
+    last = iso_week_monday(int(match.group(1)), int(match.group(2)))
+    weeks = []
+    for i in range(count - 1, -1, -1):
+        iso = (last - timedelta(weeks=i)).isocalendar()
+        weeks.append((iso[0], iso[1]))
+    return weeks
 
-    print(f'Done. Generated {len(weeks_to_generate)} weeks of data.')
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate mock dashboard data')
+    parser.add_argument('week', nargs='?', help='Generate a single week (YYYY-WNN)')
+    parser.add_argument('--weeks', type=int, default=7, help='Weeks of history (default 7)')
+    parser.add_argument('--end', default='2026-W05', help='Last week generated (default 2026-W05)')
+    parser.add_argument('--products', type=int, help='Number of products (default: built-in 10)')
+    parser.add_argument('--tallies', type=int, help='Number of tally paths (default: built-in 13)')
+    parser.add_argument('--agents', type=int, help='Number of agents (default: built-in 8)')
+    parser.add_argument('--dsat-comments', type=int,
+                        help='DSAT comments per week file (default: up to 20)')
+    parser.add_argument('--out', type=Path, default=DATA_DIR, help='Output data directory')
+    parser.add_argument('--seed', type=int, default=SEED, help=f'Base seed (default {SEED})')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help='Weeks generated in parallel (default: CPU count)')
+    args = parser.parse_args()
+
+    try:
+        if args.week:
+            weeks_to_generate = weeks_ending(args.week, 1)
+        else:
+            weeks_to_generate = weeks_ending(args.end, args.weeks)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    catalog = build_catalog(args.products, args.tallies, args.agents)
+
+    for subdir in ['pulse', 'qa', 'dsat', 'daily', 'tickets']:
+        (args.out / subdir).mkdir(parents=True, exist_ok=True)
+
+    jobs = max(1, min(args.jobs, len(weeks_to_generate)))
+    if jobs == 1:
+        for year, week in weeks_to_generate:
+            write_week(year, week, args.out, catalog, args.dsat_comments, args.seed)
+    else:
+        n = len(weeks_to_generate)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(write_week, [y for y, _ in weeks_to_generate],
+                          [w for _, w in weeks_to_generate], [args.out] * n, [catalog] * n,
+                          [args.dsat_comments] * n, [args.seed] * n))
+
+    print(f'Done. Generated {len(weeks_to_generate)} weeks of data in {args.out}.')
 
 
 if __name__ == '__main__':
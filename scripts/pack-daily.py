@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Pack closed months of data/daily/YYYY-MM-DD.json into monthly bundles.
+
+data/daily gains a file per day, and any multi-day view in the dashboard
+pays one request per day. This folds every closed month into a single
+data/daily/bundles/YYYY-MM.json (see DailyStore in data_utils.py for the
+format) and deletes the month's loose day files. Days of the current month
+stay loose.
+
+A day regenerated after its month was packed is written as a loose file
+again; it wins over the bundled copy and is folded into the bundle on the
+next run. Each day keeps the content hash of its loose file, so the
+series and rollups built from daily data are not rebuilt by packing.
+
+The index lists the packed months (`dailyBundles`), and the dashboard
+loads a bundled day with one request for its whole month.
+
+Usage:
+    python3 pack-daily.py                      # months before the current one
+    python3 pack-daily.py --before 2026-03     # months before March 2026
+    python3 pack-daily.py --dry-run
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import data_index
+from data_utils import DATA_DIR, DAY_FILE_RE, bundle_files, file_hash, write_json_atomic
+
+
+def loose_by_month(data_dir):
+    """{month: [path, ...]} of every loose day file, placeholders included."""
+    months = {}
+    daily_dir = Path(data_dir) / 'daily'
+    for f in sorted(daily_dir.glob('*.json')):
+        match = DAY_FILE_RE.fullmatch(f.name)
+        if match:
+            months.setdefault(match.group(1)[:7], []).append(f)
+    return months
+
+
+def pack_month(data_dir, month, paths, dry_run=False):
+    """Fold `paths` into the month's bundle. Returns (bundle path, days packed)."""
+    out = Path(data_dir) / 'daily' / 'bundles' / f'{month}.json'
+    bundle = {'month': month, 'days': {}, 'sources': {}}
+    if out.exists():
+        bundle = json.loads(out.read_text())
+    # Same rule as daily_files(): files of 100 bytes or less are placeholders
+    valid = {p.stem: p for p in paths if p.stat().st_size > 100}
+    for day, path in valid.items():
+        bundle['days'][day] = json.loads(path.read_text())
+        bundle['sources'][day] = file_hash(path)
+    if not dry_run:
+        bundle['days'] = {d: bundle['days'][d] for d in sorted(bundle['days'])}
+        bundle['sources'] = {d: bundle['sources'][d] for d in sorted(bundle['sources'])}
+        write_json_atomic(out, bundle)
+        for path in paths:
+            path.unlink()
+    return out, len(valid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack closed months of daily files into bundles')
+    parser.add_argument('--before', metavar='YYYY-MM',
+                        help='Pack months before this one (default: the current UTC month)')
+    parser.add_argument('--dry-run', action='store_true', help='Print what would be packed')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    before = args.before or datetime.now(timezone.utc).strftime('%Y-%m')
+    if not re.fullmatch(r'\d{4}-\d{2}', before):
+        parser.error(f'invalid month: {before}')
+
+    changed = []
+    for month, paths in sorted(loose_by_month(args.data_dir).items()):
+        if month >= before:
+            continue
+        existing = month in bundle_files(args.data_dir)
+        out, packed = pack_month(args.data_dir, month, paths, args.dry_run)
+        verb = 'would pack' if args.dry_run else 'packed'
+        print(f'{month}: {verb} {packed} day(s) into {out.name}'
+              + (' (merged into existing bundle)' if existing else '')
+              + (f', {len(paths) - packed} placeholder(s) removed' if len(paths) > packed else ''))
+        changed += [out, *paths]
+    if not changed:
+        print(f'Nothing to pack before {before}', file=sys.stderr)
+    elif not args.dry_run:
+        data_index.register(changed, args.data_dir)
+
+
+if __name__ == '__main__':
+    main()
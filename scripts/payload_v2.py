@@ -0,0 +1,168 @@
+"""Dictionary-encoded ("v2") data payloads.
+
+Weekly files repeat the same strings many times: tally paths, product
+names, STFS summaries and Zendesk URLs. DSAT files hold every sampled
+comment twice, and tickets files copy whole sections of the same week's
+pulse file. A v2 payload stores each repeated string once and refers to
+other files for copied sections:
+
+    {
+      "$v": 2,
+      "strings": ["SPARK 2", "Troubleshooting  Sound  No Sound Output", ...],
+      "refs": {"productBreakdown": "pulse/2026-W33.json"},
+      "data": {"kpi": {"topProduct": "~0", ...}, ...}
+    }
+
+Inside `data`, a string "~<base36 index>" stands for strings[index]. A
+literal string that starts with "~" is written with one extra "~". Each
+key in `refs` is a top-level section equal to the same key of the named
+file (a path relative to data/), and is left out of `data`. Object keys are
+never encoded.
+
+Refs only point along REF_SOURCES (a tickets week at the same week's
+pulse file). A body with refs decodes against whatever the referenced file
+holds when it is fetched. So the ?v= version of a file that may carry refs
+covers the referenced files too (see data_index.build_index). Otherwise a
+cached body could decode against a newer pulse file.
+
+v2 is opt-in (publish-data.py --v2). The dashboard detects it by the "$v"
+key (decodePayload in js/dashboard.js), so v1 and v2 files can be mixed.
+"""
+import gzip
+import json
+from collections import Counter
+from pathlib import PurePosixPath
+
+VERSION = 2
+TOKEN = '~'
+MIN_STRING_LEN = 4       # shorter strings cost as much as their token
+MIN_REF_BYTES = 64       # sections smaller than this are not worth a fetch
+
+# A report's sections may point at the same period's file in these reports
+REF_SOURCES = {'tickets': ('pulse',)}
+
+
+def _base36(n):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    out = ''
+    while True:
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+        if n == 0:
+            return out
+
+
+def _walk_strings(value, counts):
+    if isinstance(value, str):
+        counts[value] += 1
+    elif isinstance(value, list):
+        for v in value:
+            _walk_strings(v, counts)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _walk_strings(v, counts)
+
+
+def _replace(value, lookup):
+    if isinstance(value, str):
+        token = lookup.get(value)
+        if token is not None:
+            return token
+        return TOKEN + value if value.startswith(TOKEN) else value
+    if isinstance(value, list):
+        return [_replace(v, lookup) for v in value]
+    if isinstance(value, dict):
+        return {k: _replace(v, lookup) for k, v in value.items()}
+    return value
+
+
+def _compact(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def ref_paths(rel):
+    """Data-relative paths a v2 encoding of `rel` may refer to."""
+    parts = PurePosixPath(rel).parts
+    return [PurePosixPath(report, *parts[1:]).as_posix()
+            for report in REF_SOURCES.get(parts[0], ())]
+
+
+def find_refs(payload, ref_sources):
+    """{section: path} for top-level sections copied verbatim from a ref source.
+
+    ref_sources maps a data-relative path to that file's (decoded) payload.
+    """
+    refs = {}
+    for key, value in payload.items():
+        if len(_compact(value)) < MIN_REF_BYTES:
+            continue
+        for path, source in ref_sources.items():
+            if isinstance(source, dict) and source.get(key) == value:
+                refs[key] = path
+                break
+    return refs
+
+
+def encode(payload, ref_sources=None):
+    """v2 form of a JSON object payload."""
+    refs = find_refs(payload, ref_sources or {})
+    body = {k: v for k, v in payload.items() if k not in refs}
+
+    counts = Counter()
+    _walk_strings(body, counts)
+    # Most frequent first so they get the shortest tokens; ties keep first-seen order
+    repeated = [s for s, n in counts.most_common() if n > 1 and len(s) >= MIN_STRING_LEN]
+    lookup = {s: TOKEN + _base36(i) for i, s in enumerate(repeated)}
+
+    out = {'$v': VERSION, 'strings': repeated}
+    if refs:
+        out['refs'] = refs
+    out['data'] = _replace(body, lookup)
+    return out
+
+
+def is_v2(payload):
+    return isinstance(payload, dict) and payload.get('$v') == VERSION
+
+
+def _restore(value, strings):
+    if isinstance(value, str):
+        if value.startswith(TOKEN):
+            rest = value[1:]
+            return rest if rest.startswith(TOKEN) else strings[int(rest, 36)]
+        return value
+    if isinstance(value, list):
+        return [_restore(v, strings) for v in value]
+    if isinstance(value, dict):
+        return {k: _restore(v, strings) for k, v in value.items()}
+    return value
+
+
+def decode(payload, load_ref=None):
+    """Plain payload from a v2 (or already plain) one.
+
+    load_ref(path) must return the decoded payload of a referenced file; it
+    is only called when the payload has refs.
+    """
+    if not is_v2(payload):
+        return payload
+    data = _restore(payload['data'], payload['strings'])
+    for key, path in (payload.get('refs') or {}).items():
+        data[key] = (load_ref(path) or {}).get(key)
+    return data
+
+
+def encode_bytes(payload, ref_sources=None):
+    """Compact v2 JSON bytes, or compact v1 bytes if v2 would not be smaller.
+
+    Sizes are compared gzipped, since that is what goes over the wire: the
+    string table mostly removes repetition gzip would have removed anyway,
+    and then v2 only adds decode work.
+    """
+    plain = _compact(payload).encode('utf-8')
+    if not isinstance(payload, dict):
+        return plain
+    encoded = _compact(encode(payload, ref_sources)).encode('utf-8')
+    if len(gzip.compress(encoded, mtime=0)) < len(gzip.compress(plain, mtime=0)):
+        return encoded
+    return plain
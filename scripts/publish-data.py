@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Assemble the deployable site in _site/ with minified, pre-compressed data.
+
+The committed data/ files stay pretty-printed (readable diffs). The
+published copies are re-serialized without whitespace, and each one gets
+`.gz` and `.br` siblings for hosts that serve pre-compressed files.
+Brotli output needs the optional `brotli` package and is skipped without
+it.
+
+With --v2, data files are published in the dictionary-encoded v2 format
+(see payload_v2.py) wherever that is smaller; --measure-v2 compares v1 and
+v2 bytes and parse time without building the site.
+
+Ledger directories (data_utils.PRIVATE_DIRS) are build state and are
+not published.
+
+Bytes before and after are reported per report type (top-level data/
+directory). The same numbers go to _site/data/publish-report.json, and to
+the job summary when run in GitHub Actions, so payload growth can be
+tracked across deploys.
+
+Usage:
+    python3 publish-data.py                 # build _site/
+    python3 publish-data.py --out /tmp/site
+    python3 publish-data.py --json          # print the size report as JSON
+    python3 publish-data.py --v2            # publish v2 payloads
+    python3 publish-data.py --measure-v2    # v1 vs v2 bytes and parse time
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import payload_v2
+from data_utils import private_data
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).parent.parent
+SITE_FILES = ('index.html', 'sw.js', 'css', 'js')
+REPORT_NAME = 'publish-report.json'
+COLUMNS = ('source', 'minified', 'gzip', 'brotli')
+PLAIN_FILES = {'index.json', REPORT_NAME}  # loaded without the v2 decoder
+
+
+def minify(path):
+    """Compact UTF-8 JSON bytes for a data file."""
+    data = json.loads(path.read_text())
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def ref_sources(data_dir, rel):
+    """{path: payload} of the files a v2 encoding of `rel` may refer to."""
+    out = {}
+    for candidate in payload_v2.ref_paths(Path(rel).as_posix()):
+        path = Path(data_dir) / candidate
+        if path.exists():
+            out[candidate] = json.loads(path.read_text())
+    return out
+
+
+def encode_v2(data_dir, rel):
+    """Compact bytes for data/<rel>, v2-encoded when that is smaller."""
+    if str(rel) in PLAIN_FILES:
+        return minify(Path(data_dir) / rel)
+    payload = json.loads((Path(data_dir) / rel).read_text())
+    return payload_v2.encode_bytes(payload, ref_sources(data_dir, rel))
+
+
+def publish_file(src, dest, body=None):
+    """Write minified JSON (or the given body) plus compressed siblings. Returns byte sizes."""
+    if body is None:
+        body = minify(src)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(body)
+    sizes = {'source': src.stat().st_size, 'minified': len(body)}
+
+    # mtime=0 keeps the .gz byte-identical across runs for unchanged data
+    gz = gzip.compress(body, compresslevel=9, mtime=0)
+    dest.with_name(dest.name + '.gz').write_bytes(gz)
+    sizes['gzip'] = len(gz)
+
+    if brotli is not None:
+        br = brotli.compress(body, quality=11)
+        dest.with_name(dest.name + '.br').write_bytes(br)
+        sizes['brotli'] = len(br)
+    return sizes
+
+
+def report_type(rel):
+    """Report a data file belongs to: its top-level directory, or the file stem."""
+    parts = Path(rel).parts
+    return parts[0] if len(parts) > 1 else Path(rel).stem
+
+
+def publish(root=ROOT, out=None, v2=False):
+    """Build the site under `out`. Returns {report: {files, source, minified, ...}}."""
+    out = Path(out or root / '_site')
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    for name in SITE_FILES:
+        src = root / name
+        if src.is_dir():
+            shutil.copytree(src, out / name)
+        elif src.exists():
+            shutil.copy2(src, out / name)
+
+    data_dir = root / 'data'
+    totals = {}
+    for src in sorted(data_dir.rglob('*.json')):
+        rel = src.relative_to(data_dir)
+        if any(part.startswith('.') for part in rel.parts) or private_data(rel):
+            continue
+        body = encode_v2(data_dir, rel) if v2 else None
+        _add(totals, report_type(rel), publish_file(src, out / 'data' / rel, body))
+    return _with_total(totals)
+
+
+def _add(totals, report, sizes):
+    entry = totals.setdefault(report, {'files': 0})
+    entry['files'] += 1
+    for col, n in sizes.items():
+        entry[col] = entry.get(col, 0) + n
+
+
+def _with_total(totals):
+    total = {'files': sum(e['files'] for e in totals.values())}
+    for col in dict.fromkeys(c for e in totals.values() for c in e):
+        if col != 'files' and all(col in e for e in totals.values()):
+            total[col] = sum(e[col] for e in totals.values())
+    totals['total'] = total
+    return totals
+
+
+def _parse_ms(body, repeat=5, load_ref=None):
+    """Best-of-`repeat` milliseconds to parse (and decode) a payload."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payload_v2.decode(json.loads(body), load_ref)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_v2(root=ROOT):
+    """Per-report v1 vs v2 bytes (raw and gzip) and parse time in ms."""
+    data_dir = root / 'data'
+    totals = {}
+    for src in sorted(data_dir.rglob('*.json')):
+        rel = src.relative_to(data_dir)
+        if (any(part.startswith('.') for part in rel.parts) or private_data(rel)
+                or str(rel) in PLAIN_FILES):
+            continue
+        v1 = minify(src)
+        v2 = encode_v2(data_dir, rel)
+        refs = {path: json.loads(p_body) for path, p_body in
+                ((path, minify(data_dir / path)) for path in ref_sources(data_dir, rel))}
+        _add(totals, report_type(rel), {
+            'v1': len(v1), 'v2': len(v2),
+            'v1Gzip': len(gzip.compress(v1, mtime=0)),
+            'v2Gzip': len(gzip.compress(v2, mtime=0)),
+            'v1ParseMs': _parse_ms(v1),
+            'v2ParseMs': _parse_ms(v2, load_ref=refs.get),
+        })
+    for e in totals.values():
+        for col in ('v1ParseMs', 'v2ParseMs'):
+            e[col] = round(e[col], 2)
+    return _with_total(totals)
+
+
+def format_measure(report):
+    header = ['report', 'files', 'v1', 'v2', 'v1 gzip', 'v2 gzip', 'v1 parse ms', 'v2 parse ms']
+    rows = [header]
+    for name, e in report.items():
+        rows.append([name, str(e['files']), f'{e["v1"]:,}',
+                     f'{e["v2"]:,} ({_pct(e["v2"], e["v1"])})', f'{e["v1Gzip"]:,}',
+                     f'{e["v2Gzip"]:,} ({_pct(e["v2Gzip"], e["v1Gzip"])})',
+                     f'{e["v1ParseMs"]:.2f}', f'{e["v2ParseMs"]:.2f}'])
+    widths = [max(len(r[i]) for r in rows) for i in range(len(header))]
+    return '\n'.join('  '.join(c.ljust(w) if i == 0 else c.rjust(w)
+                               for i, (c, w) in enumerate(zip(r, widths))) for r in rows)
+
+
+def _pct(after, before):
+    return f'{after / before * 100:.0f}%' if before else '-'
+
+
+def format_table(report, markdown=False):
+    cols = [c for c in COLUMNS if c in report['total']]
+    header = ['report', 'files'] + cols
+    rows = []
+    for name, e in report.items():
+        cells = [name, str(e['files'])]
+        for c in cols:
+            cells.append(f'{e.get(c, 0):,}' if c == 'source'
+                         else f'{e.get(c, 0):,} ({_pct(e.get(c, 0), e["source"])})')
+        rows.append(cells)
+    if markdown:
+        lines = ['| ' + ' | '.join(header) + ' |', '|' + '---|' * len(header)]
+        lines += ['| ' + ' | '.join(r) + ' |' for r in rows]
+        return '\n'.join(lines)
+    widths = [max(len(r[i]) for r in rows + [header]) for i in range(len(header))]
+    lines = []
+    for r in [header] + rows:
+        lines.append('  '.join(c.ljust(w) if i == 0 else c.rjust(w)
+                               for i, (c, w) in enumerate(zip(r, widths))))
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build _site/ with minified, compressed data')
+    parser.add_argument('--out', type=Path, default=ROOT / '_site', help='Output directory')
+    parser.add_argument('--json', action='store_true', help='Print the size report as JSON')
+    parser.add_argument('--v2', action='store_true', help='Publish dictionary-encoded v2 payloads')
+    parser.add_argument('--measure-v2', action='store_true',
+                        help='Compare v1 and v2 bytes and parse time; builds nothing')
+    args = parser.parse_args()
+
+    if args.measure_v2:
+        report = measure_v2(ROOT)
+        print(json.dumps(report, indent=2) if args.json else format_measure(report))
+        return
+
+    report = publish(ROOT, args.out, v2=args.v2)
+    (args.out / 'data' / REPORT_NAME).write_text(json.dumps(report, indent=2) + '\n')
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f'Published to {args.out}')
+        print(format_table(report))
+        if brotli is None:
+            print('  (brotli not installed — .br files skipped)')
+
+    summary = os.environ.get('GITHUB_STEP_SUMMARY')
+    if summary:
+        with open(summary, 'a') as f:
+            f.write('### Data payload sizes (bytes)\n\n' + format_table(report, markdown=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Per-day QA bug ledger: bug-catch rate windows and a complete weekly trend.
+
+Each data/qa/*.json carries a 90-day bug-catch rate (BCR) recomputed from
+scratch, plus the ~13 weekly trend entries of that window, so consecutive
+files repeat most of their trend. This module stores QA-found and
+customer-found bug counts per product per day once, in
+data/qa/ledger/YYYY-MM.json (see day_ledger.py):
+
+    {"days": {"2026-02-01": {"Spark": {"qa": 3, "customer": 1}, ...}}}
+
+and derives from it, incrementally:
+
+  bcr, bcrByProduct, bcrWindow, daysCount   the 90-day window totals,
+                                            kept in data/qa/ledger/window.json
+  bcrWeeklyTrend                            per ISO week, for the window weeks
+
+data/qa/trend.json holds the complete deduplicated weekly trend. It takes
+the bcrWeeklyTrend entries of the existing weekly files, where the newest
+file wins for a week, and replaces them with ledger sums for weeks whose 7
+days are all in the ledger. `week` and `ingest` only recompute the weeks
+their days touch.
+
+`week` is the orchestrator's QA job. It runs qa-pulse-report.py for the
+week once, with the BCR scan cut to a single day (--bcr-days 1, so the
+report's BCR section is the week's last day), and fetches any other day
+the window lacks with single-day runs. The report's BCR fields are then
+replaced with the ledger window's, and the payload is printed. With more
+than MAX_FILL_DAYS ledger days missing, it prints the report's own 90-day
+payload unchanged; `backfill` fills the window's missing days outside the
+job's timeout.
+
+This delta path needs a --bcr-days option in qa-pulse-report.py, which
+the upstream does not have yet. Until it does, the ledger stays empty:
+`week` runs the full 90-day report as before (plus one --help run to
+check for the option) and `backfill` does nothing, both with a warning.
+
+Usage:
+    python3 qa_ledger.py week --start 2026-02-09 --end 2026-02-15   # payload on stdout
+    python3 qa_ledger.py backfill --end 2026-02-15
+    python3 qa_ledger.py ingest --date 2026-02-15 day.json
+    python3 qa_ledger.py trend                  # rebuild data/qa/trend.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import data_index
+from data_utils import DATA_DIR, write_json_atomic
+from day_ledger import (MAX_FILL_DAYS, Ledger, Window, days_between, fill, last_sunday,
+                        supports_option, window_days)
+
+WINDOW_DAYS = 90
+BCR_TARGET = 80
+SOURCES = ('qa', 'customer')
+UPSTREAM = 'skills/bug-catch-rate/scripts/qa-pulse-report.py'
+UPSTREAM_ARGS = ('--json', '--dry-run')
+# Limits the report's BCR window to the last N days of --end
+DAY_MODE_OPTION = '--bcr-days'
+WEEK_FILE_RE = re.compile(r'(\d{4}-W\d{2})\.json')
+
+
+def ledger_dir(data_dir=DATA_DIR):
+    return Path(data_dir) / 'qa' / 'ledger'
+
+
+def _rate(qa, customer):
+    total = qa + customer
+    return round(qa / total * 100, 1) if total else 0.0
+
+
+def _iso_week(day):
+    iso = date.fromisoformat(day).isocalendar()
+    return f'{iso[0]}-W{iso[1]:02d}'
+
+
+def day_record(payload):
+    """Ledger record from a QA payload whose BCR window is a single day.
+
+    Products without bugs that day are kept, so bcrByProduct lists every
+    product the report does.
+    """
+    return {p['product']: {'qa': p.get('qaBugs') or 0, 'customer': p.get('customerBugs') or 0}
+            for p in payload.get('bcrByProduct') or []}
+
+
+def contribution(record):
+    """Flat window counters: 'qa/<product>' and 'customer/<product>'.
+
+    Zero counters are kept (the window drops them from its totals, not from
+    the day's contribution), so the window still knows the product.
+    """
+    return {f'{source}/{product}': counts.get(source, 0)
+            for product, counts in record.items() for source in SOURCES}
+
+
+def by_product(window):
+    """{product: {'qa', 'customer'}} of the window, every product it has seen.
+
+    Products are in first-seen order, oldest day first.
+    """
+    out = {}
+    for day in sorted(window.days):
+        for key in window.days[day]:
+            out.setdefault(key.split('/', 1)[1], dict.fromkeys(SOURCES, 0))
+    for key, value in window.totals.items():
+        source, product = key.split('/', 1)
+        out.setdefault(product, dict.fromkeys(SOURCES, 0))[source] += value
+    return out
+
+
+def open_ledger(data_dir=DATA_DIR):
+    """(Ledger, Window) of the QA ledger under data_dir."""
+    directory = ledger_dir(data_dir)
+    return Ledger(directory), Window(directory, contribution)
+
+
+def trend_entry(week, qa, customer):
+    return {'week': week, 'qaBugs': qa, 'customerBugs': customer, 'total': qa + customer,
+            'weekRate': _rate(qa, customer)}
+
+
+def ledger_weeks(ledger, weeks):
+    """Trend entries for the `weeks` whose 7 days are all in the ledger.
+
+    A partly covered week (the ledger starting mid-week) is left out, so it
+    cannot replace a full-week entry taken from the weekly files.
+    """
+    out = {}
+    for week in sorted(weeks):
+        monday = date.fromisocalendar(int(week[:4]), int(week[6:]), 1)
+        records = [ledger.get(d) for d in days_between(monday, monday + timedelta(days=6))]
+        if any(r is None for r in records):
+            continue
+        qa = sum(c.get('qa', 0) for r in records for c in r.values())
+        customer = sum(c.get('customer', 0) for r in records for c in r.values())
+        out[week] = trend_entry(week, qa, customer)
+    return out
+
+
+def bcr_fields(window, trend):
+    """BCR section of the weekly QA payload for the current window.
+
+    `trend` is the {week: entry} map kept in trend.json.
+    """
+    products = by_product(window)
+    qa = sum(p['qa'] for p in products.values())
+    customer = sum(p['customer'] for p in products.values())
+    overall = _rate(qa, customer)
+    days = window.day_strings()
+    weeks = sorted({_iso_week(d) for d in days} & trend.keys())
+    return {
+        'daysCount': window.length,
+        'bcrWindow': f'{window.start} ~ {window.end}',
+        'bcr': {'overall': overall,
+                'status': 'on_track' if overall >= BCR_TARGET else 'below_target',
+                'target': BCR_TARGET, 'qaCount': qa, 'customerCount': customer},
+        'bcrByProduct': [
+            {'product': name, 'qaBugs': c['qa'], 'customerBugs': c['customer'],
+             'total': c['qa'] + c['customer'], 'rate': _rate(c['qa'], c['customer'])}
+            for name, c in sorted(products.items(), key=lambda kv: -(kv[1]['qa'] + kv[1]['customer']))
+        ],
+        'bcrWeeklyTrend': [trend[w] for w in weeks],
+    }
+
+
+def trend_path(data_dir=DATA_DIR):
+    return Path(data_dir) / 'qa' / 'trend.json'
+
+
+def file_trend(data_dir):
+    """{week: entry} from the weekly files' bcrWeeklyTrend; newest file wins."""
+    out = {}
+    qa_dir = Path(data_dir) / 'qa'
+    for f in sorted(qa_dir.glob('*.json')):
+        if WEEK_FILE_RE.fullmatch(f.name):
+            for t in json.loads(f.read_text()).get('bcrWeeklyTrend') or []:
+                out[t['week']] = t
+    return out
+
+
+def update_trend(data_dir, ledger, weeks=None):
+    """Refresh trend.json: `weeks` from the ledger, or a full rebuild if None.
+
+    Returns the trend as {week: entry}.
+    """
+    path = trend_path(data_dir)
+    if weeks is None:
+        trend = file_trend(data_dir)
+        weeks = {_iso_week(day) for day, _ in ledger.items()}
+    else:
+        try:
+            trend = {t['week']: t for t in json.loads(path.read_text())['bcrWeeklyTrend']}
+        except (OSError, ValueError, KeyError):
+            return update_trend(data_dir, ledger)
+    trend.update(ledger_weeks(ledger, weeks))
+    trend = {w: trend[w] for w in sorted(trend)}
+    write_json_atomic(path, {'bcrWeeklyTrend': list(trend.values())})
+    return trend
+
+
+def run_report(claude_dir, start, end, *extra, timeout=900):
+    """Run qa-pulse-report.py for [start, end] and return its payload."""
+    proc = subprocess.run(
+        [sys.executable, str(Path(claude_dir) / UPSTREAM), *UPSTREAM_ARGS,
+         '--start', start, '--end', end, *extra],
+        capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        raise RuntimeError(f'QA report {start} ~ {end} failed (exit {proc.returncode}): '
+                           + proc.stderr.strip()[-500:])
+    return json.loads(proc.stdout)
+
+
+def supports_day_mode(claude_dir):
+    """True if the upstream report accepts DAY_MODE_OPTION (per its --help)."""
+    return supports_option(Path(claude_dir) / UPSTREAM, DAY_MODE_OPTION)
+
+
+def fetch_day(claude_dir, day):
+    """Ledger record of one day, from a report whose BCR window is that day."""
+    return day_record(run_report(claude_dir, day, day, DAY_MODE_OPTION, '1'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-day QA bug ledger and BCR window')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    week = sub.add_parser('week', help='Run the week\'s QA report with BCR from the ledger')
+    week.add_argument('--start', required=True, help='First day of the week (YYYY-MM-DD)')
+    week.add_argument('--end', required=True, help='Last day of the week and window (YYYY-MM-DD)')
+    backfill = sub.add_parser('backfill', help='Fetch every missing day of the window')
+    backfill.add_argument('--end', default=last_sunday().isoformat(),
+                          help='Last day of the window (default: last Sunday)')
+    for p in (week, backfill):
+        p.add_argument('--days', type=int, default=WINDOW_DAYS,
+                       help=f'Window length (default {WINDOW_DAYS})')
+        p.add_argument('--jobs', type=int, default=4, help='Days fetched at once (default 4)')
+
+    ingest = sub.add_parser('ingest', help='Store one day from a single-day QA payload')
+    ingest.add_argument('--date', required=True)
+    ingest.add_argument('file', nargs='?', help='Payload JSON (default: stdin)')
+
+    sub.add_parser('trend', help='Rebuild data/qa/trend.json from the weekly files and ledger')
+    args = parser.parse_args()
+
+    ledger, window = open_ledger(args.data_dir)
+
+    if args.command == 'trend':
+        trend = update_trend(args.data_dir, ledger)
+        data_index.register([trend_path(args.data_dir)], args.data_dir)
+        print(f'{trend_path(args.data_dir)}: {len(trend)} weeks')
+        return
+
+    if args.command == 'ingest':
+        text = Path(args.file).read_text() if args.file else sys.stdin.read()
+        record = day_record(json.loads(text))
+        ledger.put(args.date, record)
+        window.update_day(args.date, record)
+        written = ledger.save()
+        if window.start:
+            written.append(window.save())
+        update_trend(args.data_dir, ledger, {_iso_week(args.date)})
+        data_index.register([*written, trend_path(args.data_dir)], args.data_dir)
+        print(f'{args.date}: {len(record)} product(s)', file=sys.stderr)
+        return
+
+    end = date.fromisoformat(args.end)
+    days = window_days(end, args.days)
+    claude_dir = Path(os.environ.get('CLAUDE_DIR') or Path(__file__).parent.parent.parent.parent)
+    day_mode = supports_day_mode(claude_dir)
+
+    def fetch(day):
+        return fetch_day(claude_dir, day)
+
+    if args.command == 'backfill':
+        if not day_mode:
+            print(f'Warning: {UPSTREAM} has no {DAY_MODE_OPTION} option: nothing to backfill',
+                  file=sys.stderr)
+            return
+        fetched, written = fill(ledger, days, fetch, args.jobs, 'QA bugs')
+        update_trend(args.data_dir, ledger, {_iso_week(d) for d in fetched})
+        data_index.register([*written, trend_path(args.data_dir)], args.data_dir)
+        print(f'{len(fetched)} day(s) fetched; {days[0]} ~ {days[-1]} complete', file=sys.stderr)
+        return
+
+    # The week's own report supplies the last day; the rest come from the ledger
+    missing = [d for d in days[:-1] if ledger.get(d) is None]
+    if not day_mode or len(missing) > MAX_FILL_DAYS:
+        reason = (f'{UPSTREAM} has no {DAY_MODE_OPTION} option' if not day_mode else
+                  f'{len(missing)} ledger day(s) missing (run `qa_ledger.py backfill`)')
+        print(f'Warning: {reason}: using the report\'s own {args.days}-day BCR',
+              file=sys.stderr)
+        report = run_report(claude_dir, args.start, args.end)
+    else:
+        report = run_report(claude_dir, args.start, args.end, DAY_MODE_OPTION, '1')
+        ledger.put(args.end, day_record(report))
+        written = set(ledger.save())
+        fetched, filled = fill(ledger, missing, fetch, args.jobs, 'QA bugs')
+        written |= filled
+        read = window.advance(ledger, end, args.days)
+        window.update_day(args.end, ledger.get(args.end))
+        trend = update_trend(args.data_dir, ledger, {_iso_week(d) for d in [*fetched, args.end]})
+        data_index.register([*written, window.save(), trend_path(args.data_dir)], args.data_dir)
+        print(f'  Window {window.start} ~ {window.end}: {read} ledger day(s) read', file=sys.stderr)
+        report.update(bcr_fields(window, trend))
+    sys.stdout.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Range queries over the data directory: totals for any span of days.
+
+RangeEngine.load() reads data/daily and data/pulse once and lays each
+metric out as a prefix-sum array over a contiguous calendar: one slot per
+day for daily data, one slot per ISO week for pulse. Any range total is then
+two array lookups, whatever the span:
+
+    engine = RangeEngine.load()
+    engine.count('2026-03-03', '2026-04-18', product='SPARK 2')
+    engine.count('2026-03-03', '2026-04-18', type='Troubleshooting')
+    engine.count('2026-03-03', '2026-04-18', product='SPARK 2', type='Troubleshooting')
+    engine.query('2026-03-03', '2026-04-18')     # dashboard-shaped payload
+
+query() returns the shape of a pulse file (kpi, dailyTrend,
+productBreakdown, ticketTypes, aiOps), so it can back a custom-range view.
+Products and types come from the daily files. Days written before the
+lossless `counts` section existed contribute their top-N breakdown, with
+the rest counted as "Other". aiOps is recomputed from the raw pulse counts
+of the ISO weeks that lie wholly inside the range.
+
+A product and a type can be filtered together, from the daily files'
+product x type cross counts (counts.productTypes). Days written before
+those existed count as 0 for such a query and are reported as
+`withoutCrossCounts`.
+
+Usage:
+    python3 range_query.py 2026-03-03 2026-04-18
+    python3 range_query.py 2026-W10 2026-03 --product "SPARK 2"
+    python3 range_query.py 2026-03-03 2026-04-18 --type Troubleshooting --compact
+    python3 range_query.py 2026-03-03 2026-04-18 --product "SPARK 2" --type Troubleshooting
+"""
+import argparse
+import calendar
+import json
+import re
+import sys
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+from data_utils import DATA_DIR, DailyStore, day_counts, iso_week_monday, product_type_counts
+
+# Raw aiOps counts; the rates are derived from these
+AI_OPS_COUNTS = ('devinClosed', 'allClosed', 'aiGood', 'aiBad', 'humanGood', 'humanBad')
+
+
+def _norm(name):
+    return ''.join(ch for ch in str(name).lower() if ch.isalnum())
+
+
+class PrefixTable:
+    """Prefix sums of numeric values per key over a run of slots."""
+
+    def __init__(self, rows):
+        """rows: one {key: number} dict per slot (missing keys count as 0)."""
+        keys = sorted({k for r in rows for k in r})
+        self.sums = {k: array('q', accumulate((int(r.get(k) or 0) for r in rows), initial=0))
+                     for k in keys}
+        self._lookup = {_norm(k): k for k in keys}
+
+    def key(self, name):
+        """Canonical key for a case/punctuation-insensitive name, or None."""
+        return self._lookup.get(_norm(name))
+
+    def total(self, key, i, j):
+        """Sum of `key` over slots i..j inclusive."""
+        sums = self.sums.get(key)
+        return sums[j + 1] - sums[i] if sums is not None and j >= i else 0
+
+    def totals(self, i, j):
+        """{key: sum} over slots i..j inclusive, zero sums left out."""
+        if j < i:
+            return {}
+        out = {}
+        for key, sums in self.sums.items():
+            value = sums[j + 1] - sums[i]
+            if value:
+                out[key] = value
+        return out
+
+    def values(self, key, i, j):
+        """Per-slot values of `key` for slots i..j."""
+        sums = self.sums.get(key)
+        if sums is None:
+            return [0] * max(0, j - i + 1)
+        return [sums[k + 1] - sums[k] for k in range(i, j + 1)]
+
+
+def _breakdown(counts, field):
+    total = sum(counts.values())
+    return [{field: name, 'count': count,
+             'pct': round(count / total * 100, 1) if total else 0}
+            for name, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+
+def _rate(num, den):
+    return round(num / den * 100, 1) if den else None
+
+
+class RangeEngine:
+    """Daily and weekly prefix-sum tables built from one load of data/."""
+
+    def __init__(self, days, weeks):
+        """days: {date_str: daily payload}; weeks: {week_str: pulse payload}."""
+        self.start = self.end = None
+        if days:
+            self.start = date.fromisoformat(min(days))
+            self.end = date.fromisoformat(max(days))
+        n = (self.end - self.start).days + 1 if days else 0
+        kpi_rows, product_rows, type_rows, cross_rows = [], [], [], []
+        for i in range(n):
+            payload = days.get((self.start + timedelta(days=i)).isoformat())
+            if payload is None:
+                kpi_rows.append({})
+                product_rows.append({})
+                type_rows.append({})
+                cross_rows.append({})
+                continue
+            kpi = payload.get('kpi') or {}
+            products, types, lossless = day_counts(payload)
+            cross = product_type_counts(payload)
+            kpi_rows.append({'totalTickets': kpi.get('totalTickets'), 'refunds': kpi.get('refunds'),
+                             'days': 1, 'lossyDays': 0 if lossless else 1,
+                             'noCrossDays': 0 if cross is not None else 1})
+            product_rows.append(products)
+            type_rows.append(types)
+            cross_rows.append(cross or {})
+        self.kpi = PrefixTable(kpi_rows)
+        self.products = PrefixTable(product_rows)
+        self.types = PrefixTable(type_rows)
+        # Keyed by (product, type); look names up through self.products/self.types
+        self.product_types = PrefixTable(cross_rows)
+
+        mondays = {iso_week_monday(w): p for w, p in weeks.items()}
+        self.week_start = min(mondays) if mondays else None
+        self.n_weeks = (max(mondays) - self.week_start).days // 7 + 1 if mondays else 0
+        ai_rows = []
+        for i in range(self.n_weeks):
+            payload = mondays.get(self.week_start + timedelta(weeks=i)) or {}
+            ai_ops = payload.get('aiOps') or {}
+            row = {f: ai_ops.get(f) for f in AI_OPS_COUNTS
+                   if isinstance(ai_ops.get(f), (int, float))}
+            if row:
+                row['weeks'] = 1
+            ai_rows.append(row)
+        self.ai_ops = PrefixTable(ai_rows)
+
+    @classmethod
+    def load(cls, data_dir=DATA_DIR):
+        store = DailyStore(data_dir)
+        days = {d: store.load(d) for d in store.dates()}
+        weeks = {}
+        pulse_dir = Path(data_dir) / 'pulse'
+        if pulse_dir.exists():
+            for f in pulse_dir.glob('*.json'):
+                if re.fullmatch(r'\d{4}-W\d{2}\.json', f.name) and f.stat().st_size > 100:
+                    weeks[f.stem] = json.loads(f.read_text())
+        return cls(days, weeks)
+
+    def _slots(self, start, end):
+        """Clamp [start, end] to the loaded days; (i, j) slot indexes (j < i if empty)."""
+        if self.start is None:
+            return 0, -1
+        start, end = _as_date(start), _as_date(end)
+        i = max(0, (start - self.start).days)
+        j = min((self.end - self.start).days, (end - self.start).days)
+        return i, j
+
+    def _week_slots(self, start, end):
+        """Slot indexes of the ISO weeks lying wholly inside [start, end]."""
+        if self.week_start is None:
+            return 0, -1
+        start, end = _as_date(start), _as_date(end)
+        first = start + timedelta(days=(7 - start.weekday()) % 7)    # first Monday >= start
+        last = end - timedelta(days=(end.weekday() + 1) % 7) - timedelta(days=6)  # Monday of last full week
+        i = max(0, (first - self.week_start).days // 7)
+        j = min(self.n_weeks - 1, (last - self.week_start).days // 7)
+        return i, j
+
+    def _table(self, product=None, type=None):
+        """(PrefixTable, key) answering a product and/or type filter."""
+        if product is not None and type is not None:
+            return self.product_types, (self.products.key(product), self.types.key(type))
+        if product is not None:
+            return self.products, self.products.key(product)
+        if type is not None:
+            return self.types, self.types.key(type)
+        return self.kpi, 'totalTickets'
+
+    def count(self, start, end, product=None, type=None):
+        """Tickets in [start, end], optionally for one product, one type or both."""
+        i, j = self._slots(start, end)
+        table, key = self._table(product, type)
+        return table.total(key, i, j)
+
+    def without_cross_counts(self, start, end):
+        """Loaded days in [start, end] that have no product x type counts."""
+        i, j = self._slots(start, end)
+        return self.kpi.total('noCrossDays', i, j)
+
+    def trend(self, start, end, product=None, type=None):
+        """[{date, day, count}] per loaded day in [start, end]."""
+        i, j = self._slots(start, end)
+        table, key = self._table(product, type)
+        present = self.kpi.values('days', i, j)
+        out = []
+        for k, value in enumerate(table.values(key, i, j)):
+            if present[k]:
+                d = self.start + timedelta(days=i + k)
+                out.append({'date': d.isoformat(), 'day': d.strftime('%a'), 'count': value})
+        return out
+
+    def ai_ops_for(self, start, end):
+        """aiOps rates over the whole ISO weeks inside [start, end], or None."""
+        i, j = self._week_slots(start, end)
+        raw = self.ai_ops.totals(i, j)
+        if not raw.get('weeks'):
+            return None
+        return {
+            'aiResolutionRate': _rate(raw.get('devinClosed', 0), raw.get('allClosed', 0)),
+            'aiCsat': _rate(raw.get('aiGood', 0), raw.get('aiGood', 0) + raw.get('aiBad', 0)),
+            'humanCsat': _rate(raw.get('humanGood', 0),
+                               raw.get('humanGood', 0) + raw.get('humanBad', 0)),
+            **{f: raw.get(f, 0) for f in AI_OPS_COUNTS},
+            'weeks': raw['weeks'],
+        }
+
+    def query(self, start, end):
+        """Pulse-shaped payload for [start, end]."""
+        start, end = _as_date(start), _as_date(end)
+        i, j = self._slots(start, end)
+        kpi = self.kpi.totals(i, j)
+        days = kpi.get('days', 0)
+        total = kpi.get('totalTickets', 0)
+        products = _breakdown(self.products.totals(i, j), 'product')
+        result = {
+            'period': f'{start} ~ {end}',
+            'startDate': start.isoformat(),
+            'endDate': end.isoformat(),
+            'kpi': {
+                'totalTickets': total,
+                'topProduct': products[0]['product'] if products else None,
+                'dailyAvg': round(total / days, 1) if days else 0,
+                'refunds': kpi.get('refunds', 0),
+                'productCount': len(products),
+            },
+            'dailyTrend': self.trend(start, end),
+            'productBreakdown': products,
+            'ticketTypes': _breakdown(self.types.totals(i, j), 'type'),
+            'aiOps': self.ai_ops_for(start, end),
+            'coverage': {'days': days, 'calendarDays': (end - start).days + 1,
+                         'lossyDays': kpi.get('lossyDays', 0)},
+        }
+        return result
+
+
+def _as_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def parse_bound(value, end=False):
+    """Date for YYYY-MM-DD, YYYY-Www or YYYY-MM; the last day of the period if end."""
+    if re.fullmatch(r'\d{4}-W\d{2}', value):
+        monday = iso_week_monday(value)
+        return monday + timedelta(days=6) if end else monday
+    if re.fullmatch(r'\d{4}-\d{2}', value):
+        year, month = map(int, value.split('-'))
+        return date(year, month, calendar.monthrange(year, month)[1] if end else 1)
+    return date.fromisoformat(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ticket totals for any date range')
+    parser.add_argument('start', help='YYYY-MM-DD, YYYY-Www or YYYY-MM')
+    parser.add_argument('end', nargs='?', help='Same formats (default: same period as start)')
+    parser.add_argument('--product', help='Only this product (count and daily trend)')
+    parser.add_argument('--type', help='Only this ticket type (count and daily trend)')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    parser.add_argument('--compact', action='store_true', help='Compact JSON output')
+    args = parser.parse_args()
+
+    try:
+        start = parse_bound(args.start)
+        end = parse_bound(args.end or args.start, end=True)
+    except ValueError as e:
+        parser.error(str(e))
+
+    engine = RangeEngine.load(args.data_dir)
+    if args.product or args.type:
+        result = {}
+        for field, table, name in (('product', engine.products, args.product),
+                                   ('type', engine.types, args.type)):
+            if name is None:
+                continue
+            result[field] = table.key(name)
+            if result[field] is None:
+                print(f'Unknown {field}: {name}', file=sys.stderr)
+                sys.exit(1)
+        result.update({
+            'startDate': start.isoformat(),
+            'endDate': end.isoformat(),
+            'count': engine.count(start, end, product=args.product, type=args.type),
+            'dailyTrend': engine.trend(start, end, product=args.product, type=args.type),
+        })
+        if args.product and args.type:
+            result['withoutCrossCounts'] = engine.without_cross_counts(start, end)
+    else:
+        result = engine.query(start, end)
+    print(json.dumps(result, ensure_ascii=False, indent=None if args.compact else 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""Per-run pipeline metrics: stage timings, API call counts, bytes written.
+
+A generator creates a RunMetrics, activates it, and wraps its stages:
+
+    metrics = run_metrics.activate(RunMetrics('daily', dates=[...]))
+    with run_metrics.stage('load_rows'):
+        ...
+    metrics.write()
+
+Library code records into whichever run is active through the module-level
+stage() / count() / record_write() helpers, which do nothing when no run
+is active. The finished run is written as a sidecar JSON to
+data/metrics/pending/. update-index.py folds pending sidecars into
+data/metrics/history.json (collect()), so pipeline cost can be trended
+over time.
+"""
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+PENDING_DIR = 'metrics/pending'
+HISTORY_FILE = 'metrics/history.json'
+HISTORY_LIMIT = 1000
+PROFILE_DIR = Path(__file__).parent.parent / '.cache' / 'profiles'
+
+_active = None
+
+
+def peak_memory_kb(who='self'):
+    """Peak resident set size in KB, or None if unknown.
+
+    who='children' gives the largest of the waited-for subprocesses.
+    """
+    if resource is None:
+        return None
+    usage = resource.RUSAGE_CHILDREN if who == 'children' else resource.RUSAGE_SELF
+    peak = resource.getrusage(usage).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class RunMetrics:
+    """Metrics for one pipeline run. Thread-safe."""
+
+    def __init__(self, job, **meta):
+        self.job = job
+        self.meta = meta
+        self.started = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.bytes_written = 0
+        self.files_written = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block. Repeated stages accumulate seconds and calls."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def add_stage(self, name, seconds):
+        """Record a stage timed elsewhere (e.g. a subprocess)."""
+        with self._lock:
+            entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_write(self, nbytes):
+        with self._lock:
+            self.bytes_written += nbytes
+            self.files_written += 1
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'job': self.job,
+                'started': self.started.isoformat(timespec='seconds'),
+                'seconds': round(time.perf_counter() - self._t0, 3),
+                'stages': {k: {'seconds': round(v['seconds'], 3), 'calls': v['calls']}
+                           for k, v in self.stages.items()},
+                'counters': dict(self.counters),
+                'bytesWritten': self.bytes_written,
+                'filesWritten': self.files_written,
+                'peakMemoryKb': peak_memory_kb(),
+                'peakChildMemoryKb': peak_memory_kb('children') or None,
+                **({'meta': self.meta} if self.meta else {}),
+            }
+
+    def write(self, data_dir=DATA_DIR):
+        """Write the sidecar to data/metrics/pending/. Returns its path."""
+        # Imported here: data_utils records its writes into the active run
+        from data_utils import write_json_atomic
+
+        record = self.to_dict()
+        stamp = self.started.strftime('%Y%m%dT%H%M%SZ')
+        path = Path(data_dir) / PENDING_DIR / f'{self.job}-{stamp}-{os.getpid()}.json'
+        write_json_atomic(path, record)
+        return path
+
+
+def activate(metrics):
+    """Make `metrics` the run that module-level helpers record into."""
+    global _active
+    _active = metrics
+    return metrics
+
+
+def active():
+    return _active
+
+
+@contextmanager
+def stage(name):
+    if _active is None:
+        yield
+    else:
+        with _active.stage(name):
+            yield
+
+
+def count(name, n=1):
+    if _active is not None:
+        _active.count(name, n)
+
+
+def record_write(nbytes):
+    if _active is not None:
+        _active.record_write(nbytes)
+
+
+@contextmanager
+def profiled(path=None, job='run'):
+    """Run the block under cProfile and dump stats (for snakeviz / pstats).
+
+    With path=None the dump goes to .cache/profiles/<job>-<timestamp>.prof.
+    """
+    if path is None:
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        path = PROFILE_DIR / f'{job}-{stamp}.prof'
+    path = Path(path)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        print(f'  Profile written to {path}', file=sys.stderr)
+
+
+def collect(data_dir=DATA_DIR, limit=HISTORY_LIMIT):
+    """Move pending sidecars into metrics/history.json (newest last).
+
+    Returns the number of runs collected.
+    """
+    from data_utils import write_json_atomic
+
+    pending = sorted((Path(data_dir) / PENDING_DIR).glob('*.json'))
+    if not pending:
+        return 0
+    history_path = Path(data_dir) / HISTORY_FILE
+    try:
+        history = json.loads(history_path.read_text())
+    except (OSError, ValueError):
+        history = []
+    collected = []
+    for path in pending:
+        try:
+            collected.append(json.loads(path.read_text()))
+        except ValueError:
+            continue  # half-written by a crashed run; dropped below
+    history.extend(collected)
+    history.sort(key=lambda r: r.get('started', ''))
+    write_json_atomic(history_path, history[-limit:])
+    for path in pending:
+        path.unlink()
+    return len(collected)
@@ -1,86 +1,50 @@
 #!/usr/bin/env python3
-"""Update data/index.json with available weeks, months, and days from data/ subdirectories."""
-import json
-import re
-from datetime import date, timedelta
-from pathlib import Path
-
-
-def iso_week_to_month(week_str: str) -> str:
-    """Convert ISO week string (e.g., '2026-W07') to month string (e.g., '2026-02').
-    Uses Thursday of the week (ISO standard) to determine the month,
-    preventing W01 (Mon Dec 29) from mapping to December."""
-    match = re.match(r'(\d{4})-W(\d{2})', week_str)
-    if not match:
-        return ''
-    year, week = int(match.group(1)), int(match.group(2))
-    # Find Monday of the ISO week
-    jan4 = date(year, 1, 4)
-    monday_w1 = jan4 - timedelta(days=jan4.isoweekday() - 1)
-    monday = monday_w1 + timedelta(weeks=week - 1)
-    # Use Thursday (+3 days) for month assignment (ISO standard)
-    thursday = monday + timedelta(days=3)
-    return thursday.strftime('%Y-%m')
+"""Update data/index.json with available weeks, months, and days from data/ subdirectories.
 
+The index also lists a content hash per data file (`versions`), which the
+dashboard uses to build cache-busting ?v= URLs.
 
-def validate_week(data_dir: Path, week: str) -> bool:
-    """A week is valid if pulse or tickets data exists with meaningful content (>100 bytes)."""
-    for subdir in ['pulse', 'tickets']:
-        f = data_dir / subdir / f'{week}.json'
-        if f.exists() and f.stat().st_size > 100:
-            return True
-    return False
+Run-metrics sidecars left in data/metrics/pending/ by the generators are
+first folded into data/metrics/history.json (see run_metrics.py).
 
+Incremental by default: a manifest of file sizes, mtimes and hashes
+(see data_index.py) means only changed files are re-hashed.
 
-def main():
-    data_dir = Path(__file__).parent.parent / 'data'
-    weeks = set()
-    days = set()
-
-    for subdir in ['pulse', 'qa', 'tickets', 'dsat']:
-        dir_path = data_dir / subdir
-        if not dir_path.exists():
-            continue
-        for f in dir_path.glob('*.json'):
-            match = re.match(r'(\d{4}-W\d{2})\.json', f.name)
-            if match:
-                weeks.add(match.group(1))
-
-    # Scan daily dir for date-keyed files (YYYY-MM-DD.json)
-    daily_dir = data_dir / 'daily'
-    if daily_dir.exists():
-        for f in daily_dir.glob('*.json'):
-            # Date-keyed files: 2026-02-01.json
-            dmatch = re.match(r'(\d{4}-\d{2}-\d{2})\.json', f.name)
-            if dmatch and f.stat().st_size > 100:
-                days.add(dmatch.group(1))
-            # Legacy week-keyed files (ignore for weeks list, handled above)
-
-    # Filter to only weeks with valid data
-    weeks = {w for w in weeks if validate_week(data_dir, w)}
+Usage:
+    python3 update-index.py                      # incremental scan
+    python3 update-index.py --full               # ignore the manifest, rescan everything
+    python3 update-index.py --register FILE...   # record just-written files, no scan
+"""
+import argparse
+from pathlib import Path
 
-    sorted_weeks = sorted(weeks, reverse=True)
-    sorted_days = sorted(days, reverse=True)
+import data_index
+import run_metrics
+from data_utils import DATA_DIR
 
-    # Derive months from weeks
-    month_set = set()
-    for w in sorted_weeks:
-        m = iso_week_to_month(w)
-        if m:
-            month_set.add(m)
-    sorted_months = sorted(month_set, reverse=True)
 
-    index = {
-        'weeks': sorted_weeks,
-        'latest': sorted_weeks[0] if sorted_weeks else None,
-        'months': sorted_months,
-        'latestMonth': sorted_months[0] if sorted_months else None,
-        'days': sorted_days,
-        'latestDay': sorted_days[0] if sorted_days else None,
-    }
-    index_path = data_dir / 'index.json'
-    index_path.write_text(json.dumps(index, indent=2) + '\n')
-    print(f'Updated {index_path}: {len(sorted_weeks)} weeks, {len(sorted_months)} months, {len(sorted_days)} days')
+def main():
+    parser = argparse.ArgumentParser(description='Update data/index.json')
+    parser.add_argument('--full', action='store_true', help='Rebuild the manifest from scratch')
+    parser.add_argument('--register', nargs='+', metavar='FILE',
+                        help='Only record these files (written or deleted) in the index')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR)
+    args = parser.parse_args()
+
+    index_path = args.data_dir / 'index.json'
+    collected = run_metrics.collect(args.data_dir)
+    if collected:
+        print(f'Collected {collected} run metrics into {args.data_dir / run_metrics.HISTORY_FILE}')
+        if args.register:
+            args.register.append(str(args.data_dir / run_metrics.HISTORY_FILE))
+    if args.register:
+        index = data_index.register(args.register, args.data_dir)
+        note = f'{len(args.register)} registered'
+    else:
+        index, changed = data_index.update(args.data_dir, full=args.full)
+        note = f'{len(changed)} changed'
+    print(f'Updated {index_path}: {len(index["weeks"])} weeks, {len(index["months"])} months, '
+          f'{len(index["days"])} days ({note})')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,174 @@
+"""Persistent on-disk cache for ZendeskClient.search_count results.
+
+A ticket count for a day that has ended does not change, so backfills and
+reruns can answer from disk. Cache entries are keyed by the normalized
+query. The newest date in the query decides how long an entry lives:
+
+  - closed day (ended before yesterday, Taipei time): kept forever, as long
+    as it was fetched after the day closed
+  - yesterday: kept for `fresh_ttl` seconds (late edits still land)
+  - today, future or undated queries: never cached
+
+The cache is a single JSON file (default .cache/zendesk-search.json), so CI
+can persist it with actions/cache. Once it grows past `max_entries`, the
+least recently used entries are evicted when it is saved.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from data_utils import write_json_atomic
+
+DEFAULT_PATH = Path(__file__).parent.parent / '.cache' / 'zendesk-search.json'
+DEFAULT_FRESH_TTL = 3600
+DEFAULT_MAX_ENTRIES = 50000
+CACHE_VERSION = 1
+
+TPE = timezone(timedelta(hours=8))
+_DATE_RE = re.compile(r'\b(?:created|updated|solved)\s*[<>:=]+\s*(\d{4}-\d{2}-\d{2})\b')
+
+
+def normalize_query(query):
+    """Canonical form of a search query: lowercased, tokens sorted.
+
+    Zendesk search terms are order- and case-insensitive, so
+    'assignee:1 type:ticket' and 'type:ticket  Assignee:1' share an entry.
+    """
+    return ' '.join(sorted(str(query).lower().split()))
+
+
+def query_day(query):
+    """Newest date a query filters on, or None if it has no date filter."""
+    dates = _DATE_RE.findall(query)
+    if not dates:
+        return None
+    return max(date.fromisoformat(d) for d in dates)
+
+
+def _day_closed_at(day):
+    """Unix time at which `day` counts as closed: end of the following day, TPE."""
+    closed = datetime.combine(day + timedelta(days=2), datetime.min.time(), TPE)
+    return closed.timestamp()
+
+
+class SearchCache:
+    """JSON-file cache of search counts. Thread-safe; call save() when done."""
+
+    def __init__(self, path=DEFAULT_PATH, fresh_ttl=DEFAULT_FRESH_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.fresh_ttl = fresh_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION:
+            return {}
+        return data.get('entries', {})
+
+    def _cacheable(self, query, now):
+        """Return the query's day if results for it may be cached at `now`."""
+        day = query_day(query)
+        if day is None:
+            return None
+        today = datetime.fromtimestamp(now, TPE).date()
+        return day if day < today else None
+
+    def get(self, query, now=None):
+        """Cached count for `query`, or None on a miss or expired entry."""
+        now = time.time() if now is None else now
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            day = self._cacheable(key, now)
+            if entry is None or day is None:
+                self.misses += 1
+                return None
+            fetched = entry['fetched']
+            if fetched < _day_closed_at(day) and now - fetched > self.fresh_ttl:
+                self.misses += 1
+                return None
+            entry['used'] = now
+            self._dirty = True
+            self.hits += 1
+            return entry['count']
+
+    def put(self, query, count, now=None):
+        now = time.time() if now is None else now
+        key = normalize_query(query)
+        if self._cacheable(key, now) is None:
+            return
+        with self._lock:
+            self._entries[key] = {'count': count, 'fetched': now, 'used': now}
+            self._dirty = True
+
+    def save(self):
+        """Evict least recently used entries over the limit and write the file."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self._entries) > self.max_entries:
+                keep = sorted(self._entries.items(), key=lambda kv: kv[1]['used'],
+                              reverse=True)[:self.max_entries]
+                self._entries = dict(keep)
+            write_json_atomic(self.path, {'version': CACHE_VERSION,
+                                          'entries': self._entries}, indent=None)
+            self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def summary(self):
+        return f"{self.hits} hits, {self.misses} misses, {len(self)} entries"
+
+
+class CachedSearchClient:
+    """ZendeskClient stand-in that answers search_count from a SearchCache.
+
+    `make_client` is only called on the first cache miss, so a fully cached
+    run never authenticates against Zendesk. Other attributes are passed
+    through to the real client.
+
+    Callers that rate-limit or count API calls should check `cache` first
+    and wrap only `fetch`, so hits cost neither a token nor a call.
+    """
+
+    def __init__(self, make_client, cache):
+        self._make_client = make_client
+        self.cache = cache
+
+    def search_count(self, query):
+        count = self.cache.get(query)
+        if count is None:
+            count = self.fetch(query)
+        return count
+
+    def fetch(self, query):
+        """Ask Zendesk (skipping the lookup) and store the result."""
+        count = self._make_client().search_count(query)
+        self.cache.put(query, count)
+        return count
+
+    def __getattr__(self, name):
+        return getattr(self._make_client(), name)
+
+
+def open_cache(path=None, **kwargs):
+    """SearchCache at `path`, $ZENDESK_CACHE, or the default location."""
+    path = path or os.environ.get('ZENDESK_CACHE') or DEFAULT_PATH
+    cache = SearchCache(path, **kwargs)
+    print(f"  Search cache: {path} ({len(cache)} entries)", file=sys.stderr)
+    return cache
@@ -0,0 +1,77 @@
+"""Minimal Zendesk client for a ZENDESK_BASE_URL override.
+
+When ZENDESK_BASE_URL is set (e.g. http://127.0.0.1:8765 for
+scripts/fake-zendesk.py), the pipeline talks to that server through this
+client instead of the workspace's ZendeskClient, so it can run and be
+benchmarked without real credentials. Only the calls the dashboard
+pipeline makes are implemented. HTTP errors carry `.response.status_code`
+and `.response.headers`, so agent_activity's 429 / Retry-After handling
+works unchanged.
+"""
+import base64
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+from types import SimpleNamespace
+
+BASE_URL_ENV = 'ZENDESK_BASE_URL'
+
+
+class ZendeskHTTPError(Exception):
+    def __init__(self, status, headers, url):
+        super().__init__(f'HTTP {status} for {url}')
+        self.response = SimpleNamespace(status_code=status, headers=dict(headers or {}))
+
+
+class BaseUrlClient:
+    """ZendeskClient stand-in speaking the REST API at `base_url`."""
+
+    def __init__(self, base_url, timeout=30, email=None, token=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._auth = None
+        if email and token:
+            creds = base64.b64encode(f'{email}/token:{token}'.encode()).decode()
+            self._auth = f'Basic {creds}'
+
+    def _get(self, path, params=None):
+        url = self.base_url + path
+        if params:
+            url += '?' + urllib.parse.urlencode(params)
+        request = urllib.request.Request(url, headers={'Accept': 'application/json'})
+        if self._auth:
+            request.add_header('Authorization', self._auth)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            raise ZendeskHTTPError(e.code, e.headers, url) from None
+
+    def search_count(self, query):
+        return self._get('/api/v2/search/count.json', {'query': query})['count']
+
+    def search(self, query, per_page=100):
+        """All results of a search, following pagination."""
+        results = []
+        page = 1
+        while True:
+            data = self._get('/api/v2/search.json',
+                             {'query': query, 'page': page, 'per_page': per_page})
+            results.extend(data.get('results') or [])
+            if not data.get('next_page'):
+                return results
+            page += 1
+
+    def get_ticket(self, ticket_id):
+        return self._get(f'/api/v2/tickets/{ticket_id}.json')['ticket']
+
+
+def client_from_env(default_factory):
+    """BaseUrlClient if ZENDESK_BASE_URL is set, else default_factory()."""
+    base_url = os.environ.get(BASE_URL_ENV)
+    if not base_url:
+        return default_factory()
+    return BaseUrlClient(base_url, email=os.environ.get('ZENDESK_EMAIL'),
+                         token=os.environ.get('ZENDESK_TOKEN'))
@@ -0,0 +1,104 @@
+// === Dashboard Service Worker ===
+// Serves repeat visits from the local cache so the first paint needs no
+// network round trip:
+//   data/*?v=<hash>   cache-first: versioned URLs never change (see
+//                     fetchData in js/dashboard.js); older versions of the
+//                     same file are evicted when a new one is stored
+//   everything else   stale-while-revalidate: the cached copy is returned
+//                     at once and refreshed in the background
+// When a background refresh changes data/index.json, open pages get a
+// 'data-updated' message and re-read the index.
+
+var CACHE = 'team-dashboard-v1';
+
+self.addEventListener('install', function() {
+  self.skipWaiting();
+});
+
+self.addEventListener('activate', function(event) {
+  event.waitUntil(caches.keys().then(function(keys) {
+    return Promise.all(keys.filter(function(k) { return k !== CACHE; })
+      .map(function(k) { return caches.delete(k); }));
+  }).then(function() {
+    return self.clients.claim();
+  }));
+});
+
+self.addEventListener('fetch', function(event) {
+  var request = event.request;
+  if (request.method !== 'GET') return;
+  var scope = self.registration.scope;
+  if (request.url.indexOf(scope) !== 0) return;  // other origins (Chart.js CDN)
+  var url = new URL(request.url);
+  var rel = url.pathname.slice(new URL(scope).pathname.length);
+
+  if (request.mode === 'navigate') {
+    // Every ?view=... URL is the same page: keep one copy of it
+    event.respondWith(staleWhileRevalidate(event, new Request(scope), request));
+  } else if (rel.indexOf('data/') === 0 && url.searchParams.has('v')) {
+    event.respondWith(cacheFirst(event, request, url.pathname));
+  } else {
+    event.respondWith(staleWhileRevalidate(event, request, request,
+                                           rel === 'data/index.json'));
+  }
+});
+
+function cacheFirst(event, request, pathname) {
+  return caches.open(CACHE).then(function(cache) {
+    return cache.match(request).then(function(cached) {
+      if (cached) return cached;
+      return fetch(request).then(function(response) {
+        if (response.ok) {
+          var copy = response.clone();
+          event.waitUntil(evictVersions(cache, pathname, request.url).then(function() {
+            return cache.put(request, copy);
+          }));
+        }
+        return response;
+      });
+    });
+  });
+}
+
+// Drop cached copies of `pathname` under other ?v= versions
+function evictVersions(cache, pathname, keep) {
+  return cache.keys().then(function(requests) {
+    return Promise.all(requests.filter(function(r) {
+      return r.url !== keep && new URL(r.url).pathname === pathname;
+    }).map(function(r) { return cache.delete(r); }));
+  });
+}
+
+// A body can be read once: the page and the cache update each get a clone
+function staleWhileRevalidate(event, key, request, notify) {
+  var cached = caches.match(key).then(function(response) {
+    return response && { page: response, text: notify ? response.clone().text() : null };
+  });
+  var fetched = fetch(request).then(function(response) {
+    return { page: response, copy: response.ok ? response.clone() : null };
+  });
+  event.waitUntil(Promise.all([cached, fetched]).then(function(r) {
+    var old = r[0];
+    var copy = r[1].copy;
+    if (!copy) return;
+    var check = (notify && old) ? Promise.all([old.text, copy.clone().text()]) : null;
+    return Promise.resolve(check).then(function(texts) {
+      return caches.open(CACHE).then(function(cache) {
+        return cache.put(key, copy);
+      }).then(function() {
+        if (texts && texts[0] !== texts[1]) {
+          return broadcast({ type: 'data-updated', path: 'index.json' });
+        }
+      });
+    });
+  }).catch(function() {}));  // offline: the cached copy stands
+  return cached.then(function(old) {
+    return old ? old.page : fetched.then(function(r) { return r.page; });
+  });
+}
+
+function broadcast(message) {
+  return self.clients.matchAll({ type: 'window' }).then(function(clients) {
+    clients.forEach(function(client) { client.postMessage(message); });
+  });
+}
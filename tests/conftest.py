@@ -0,0 +1,5 @@
+"""Pipeline scripts import each other as top-level modules (run from scripts/)."""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
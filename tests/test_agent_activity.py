@@ -0,0 +1,104 @@
+import pytest
+
+import agent_activity
+from agent_activity import TokenBucket, call_with_retry
+from zendesk_local import ZendeskHTTPError
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    slept = []
+    monkeypatch.setattr(agent_activity.time, 'sleep', slept.append)
+    return slept
+
+
+def flaky(*errors, result=7):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+def test_bucket_does_not_burst_after_pause(monkeypatch):
+    now = [0.0]  # times in exact binary fractions, so waits add up exactly
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(agent_activity.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(agent_activity.time, 'sleep', sleep)
+    bucket = TokenBucket(rate=4, capacity=10)
+    bucket.pause(32)
+    for _ in range(3):
+        bucket.acquire()
+    # Tokens refill from the end of the pause: 3 tokens at 4/s, not a full bucket
+    assert now[0] == 32.75
+
+
+def test_retries_transient_errors(no_sleep):
+    fn, calls = flaky(ZendeskHTTPError(503, {}, 'u'), ConnectionResetError())
+    assert call_with_retry(fn, TokenBucket(1000, 10)) == 7
+    assert len(calls) == 3 and no_sleep == [1, 2]
+
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404])
+def test_client_errors_are_not_retried(status):
+    fn, calls = flaky(ZendeskHTTPError(status, {}, 'u'))
+    with pytest.raises(ZendeskHTTPError):
+        call_with_retry(fn, TokenBucket(1000, 10))
+    assert len(calls) == 1
+
+
+def test_other_exceptions_are_not_retried():
+    fn, calls = flaky(ValueError('429 in the message is not a status'))
+    with pytest.raises(ValueError):
+        call_with_retry(fn, TokenBucket(1000, 10))
+    assert len(calls) == 1
+
+
+def test_429_pauses_for_retry_after(monkeypatch):
+    paused = []
+    bucket = TokenBucket(1000, 10)
+    monkeypatch.setattr(bucket, 'pause', paused.append)
+    fn, calls = flaky(ZendeskHTTPError(429, {'Retry-After': '7'}, 'u'))
+    assert call_with_retry(fn, bucket) == 7
+    assert paused == [7.0] and len(calls) == 2
+
+
+def test_gives_up_after_retries():
+    fn, calls = flaky(*[ZendeskHTTPError(500, {}, 'u')] * 5)
+    with pytest.raises(ZendeskHTTPError):
+        call_with_retry(fn, TokenBucket(1000, 10), retries=2)
+    assert len(calls) == 3
+
+
+def test_cached_counts_skip_limiter_and_call_metrics(tmp_path, monkeypatch):
+    import run_metrics
+    from zendesk_cache import CachedSearchClient, SearchCache
+
+    class Remote:
+        calls = 0
+
+        def search_count(self, query):
+            Remote.calls += 1
+            return 3
+
+    acquired = []
+    monkeypatch.setattr(TokenBucket, 'acquire', lambda self: acquired.append(1))
+    metrics = run_metrics.RunMetrics('test')
+    monkeypatch.setattr(run_metrics, '_active', metrics)
+    client = CachedSearchClient(Remote, SearchCache(tmp_path / 'c.json'))
+    agents = {'1': 'Ann', '2': 'Bo'}
+
+    agent_activity.fetch_agent_activity(client, agents, '2020-01-02')
+    agent_activity.fetch_agent_activity(client, agents, '2020-01-02')
+    assert Remote.calls == 4
+    assert len(acquired) == 4
+    assert metrics.counters['zendesk.calls'] == 4
+    assert (client.cache.hits, client.cache.misses) == (4, 4)
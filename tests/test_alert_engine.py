@@ -0,0 +1,50 @@
+import pytest
+
+import alert_engine
+from alert_engine import MAD_SCALE, score_series
+
+
+def test_median_baseline_is_robust_to_one_outlier():
+    baseline, spread = alert_engine._median_baseline([10, 12, 11, 200, 9])
+    assert baseline == 11
+    assert spread == pytest.approx(MAD_SCALE * 1)
+
+
+def test_score_needs_min_periods_and_skips_missing_weeks():
+    values = [10, None, 11, 9, 10, 40]
+    scores = list(score_series(values, {1, 4, 5}, min_periods=4))
+    # Week 1 has no value, week 4 has only 3 weeks of history
+    assert [s[0] for s in scores] == [5]
+    i, x, baseline, z = scores[0]
+    assert (x, baseline) == (40, 10)
+    # Spread floored at sqrt(baseline) (MAD of 10, 11, 9, 10 is 0.5)
+    assert z == pytest.approx(30 / 10 ** 0.5)
+
+
+def test_window_drops_old_history():
+    values = [100] * 10 + [10] * 8 + [10]
+    (_, _, baseline, z), = score_series(values, {18}, window=8)
+    assert baseline == 10 and z == 0
+
+
+def test_ewma_tracks_level():
+    values = [10] * 20 + [50]
+    (_, _, baseline, z), = score_series(values, {20}, method='ewma')
+    assert baseline == pytest.approx(10)
+    assert z == pytest.approx(40 / 10 ** 0.5)
+
+
+def test_compute_alerts_flags_spike_only():
+    weeks = [f'2026-W{w:02d}' for w in range(1, 11)]
+    payloads = {}
+    for n, week in enumerate(weeks):
+        spark = 100 if week == '2026-W10' else 20 + n % 3
+        payloads[week] = {'productBreakdown': [
+            {'product': 'Spark', 'count': spark, 'topIssues': []},
+            {'product': 'BIAS X', 'count': 15, 'topIssues': []},
+        ]}
+    alerts = alert_engine.compute_alerts(weeks, payloads, {'2026-W09', '2026-W10'})
+    assert alerts['2026-W09'] == []
+    (alert,) = alerts['2026-W10']
+    assert alert['type'] == 'volume_spike' and alert['severity'] == 'high'
+    assert alert['message'].startswith('Spark volume +')
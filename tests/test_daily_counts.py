@@ -0,0 +1,96 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from data_utils import breakdown_counts, day_counts
+
+SCRIPTS = Path(__file__).parent.parent / 'scripts'
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'), SCRIPTS / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def rollups():
+    return load_script('build-rollups')
+
+
+@pytest.fixture(scope='module')
+def series():
+    return load_script('build-series')
+
+
+TOP_N = {
+    'kpi': {'totalTickets': 10, 'refunds': 2},
+    'productBreakdown': [{'product': 'SPARK 2', 'count': 6},
+                         {'product': 'Other (3 products)', 'count': 4}],
+    'ticketTypes': [{'type': 'Troubleshooting', 'count': 7},
+                    {'type': 'Other (2 types)', 'count': 3}],
+}
+LOSSLESS = dict(TOP_N, counts={'products': {'SPARK 2': 6, 'BIAS X': 3, 'Spark GO': 1},
+                               'types': {'Troubleshooting': 7, 'Refund': 3}})
+
+
+def test_breakdown_counts_fold_other():
+    assert breakdown_counts(TOP_N) == ({'SPARK 2': 6, 'Other': 4},
+                                       {'Troubleshooting': 7, 'Other': 3})
+
+
+def test_day_counts_prefers_lossless_section():
+    assert day_counts(LOSSLESS) == (LOSSLESS['counts']['products'],
+                                    LOSSLESS['counts']['types'], True)
+    assert day_counts(TOP_N) == (*breakdown_counts(TOP_N), False)
+
+
+def test_aggregate_daily_sums_days(rollups):
+    result = rollups.aggregate_daily([('2026-02-02', LOSSLESS), ('2026-02-03', TOP_N)], '2026-W06')
+    assert result['kpi']['totalTickets'] == 20 and result['kpi']['refunds'] == 4
+    assert result['kpi']['dailyAvg'] == 10.0 and result['kpi']['topProduct'] == 'SPARK 2'
+    assert result['counts']['products'] == {'SPARK 2': 12, 'Other': 4, 'BIAS X': 3, 'Spark GO': 1}
+    assert sum(p['count'] for p in result['productBreakdown']) == 20
+    assert result['lossyDays'] == ['2026-02-03']
+    assert [t['day'] for t in result['dailyTrend']] == ['Mon', 'Tue']
+
+
+def test_series_columns(series):
+    days = {'2026-02-02': LOSSLESS, '2026-02-03': TOP_N,
+            '2026-02-04': dict(TOP_N, productBreakdown=[
+                {'product': 'SPARK 2', 'count': 5}, {'product': 'Other (9 products)', 'count': 5}])}
+    built = series.build_series({d: d for d in days}, days.get)
+    assert built['format'] == series.FORMAT
+    assert built['products'] == {'BIAS X': [3, None, None], 'Other': [None, 4, 5],
+                                 'SPARK 2': [6, 6, 5], 'Spark GO': [1, None, None]}
+    assert built['types']['Refund'] == [3, None, None]
+
+    # Unchanged periods are reused from the previous build; older formats are not
+    rebuilt = series.build_series({d: d for d in days}, lambda d: pytest.fail('re-read'), built)
+    assert rebuilt == built
+    stale = dict(built, format=series.FORMAT - 1)
+    reread = []
+    series.build_series({d: d for d in days}, lambda d: reread.append(d) or days[d], stale)
+    assert sorted(reread) == sorted(days)
+
+
+def test_qa_rollup_keeps_the_months_newest_bugs(rollups):
+    weeks = [{'bcr': {'overall': 70 + i},
+              'recentBugs': {'qa': [{'key': f'QA-{i}{k:02d}'} for k in range(15)]}}
+             for i in range(3)]
+    result = rollups.aggregate_qa(weeks, '2026-02')
+    assert result['bcr']['overall'] == 72
+    keys = [b['key'] for b in result['recentBugs']['qa']]
+    assert len(keys) == 20
+    assert keys[:15] == [f'QA-2{k:02d}' for k in range(15)]
+    assert keys[15:] == [f'QA-1{k:02d}' for k in range(5)]
+
+
+def test_rollups_from_an_older_format_are_rebuilt(rollups, tmp_path):
+    out = tmp_path / 'r.json'
+    out.write_text('{"sources": {"2026-W05": "h"}}')
+    assert not rollups._up_to_date(out, {'2026-W05': 'h'})
+    out.write_text(f'{{"format": {rollups.FORMAT}, "sources": {{"2026-W05": "h"}}}}')
+    assert rollups._up_to_date(out, {'2026-W05': 'h'})
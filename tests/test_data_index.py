@@ -0,0 +1,52 @@
+import json
+import os
+
+import data_index
+
+
+def write(path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+
+
+def test_register_rehashes_tracked_files_that_moved(tmp_path):
+    data = tmp_path / 'data'
+    manifest = tmp_path / 'manifest.json'
+    pulse, tickets = data / 'pulse' / '2026-W08.json', data / 'tickets' / '2026-W08.json'
+    write(pulse, {'kpi': 1, 'pad': 'x' * 120})
+    write(tickets, {'kpi': 1, 'pad': 'x' * 120})
+    data_index.update(data, manifest_path=manifest)
+    before = json.loads((data / 'index.json').read_text())['versions']
+
+    # Changed by someone else (a commit in another checkout), not registered
+    write(pulse, {'kpi': 2, 'pad': 'y' * 120})
+    os.utime(pulse, ns=(1, 1))
+    tickets.unlink()
+    write(data / 'qa' / '2026-W08.json', {'bugs': 1})
+
+    index = data_index.register([data / 'qa' / '2026-W08.json'], data, manifest)
+    assert index['versions']['pulse/2026-W08.json'] != before['pulse/2026-W08.json']
+    assert 'tickets/2026-W08.json' not in index['versions']
+    assert 'qa/2026-W08.json' in index['versions']
+
+
+def test_register_skips_untracked_and_outside_paths(tmp_path):
+    data = tmp_path / 'data'
+    manifest = tmp_path / 'manifest.json'
+    write(data / 'pulse' / '2026-W08.json', {'pad': 'x' * 120})
+    data_index.update(data, manifest_path=manifest)
+    write(data / 'metrics' / 'pending' / 'run.json', {})
+    write(tmp_path / 'elsewhere.json', {})
+
+    index = data_index.register([data / 'metrics' / 'pending' / 'run.json',
+                                 tmp_path / 'elsewhere.json'], data, manifest)
+    assert list(index['versions']) == ['pulse/2026-W08.json']
+
+
+def test_ledger_directories_are_not_indexed(tmp_path):
+    data = tmp_path / 'data'
+    write(data / 'pulse' / '2026-W08.json', {'pad': 'x' * 120})
+    write(data / 'qa' / 'ledger' / '2026-02.json', {'days': {}})
+    write(data / 'dsat' / 'ledger' / 'window.json', {})
+    index, _ = data_index.update(data, manifest_path=tmp_path / 'manifest.json')
+    assert list(index['versions']) == ['pulse/2026-W08.json']
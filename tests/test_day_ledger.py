@@ -0,0 +1,174 @@
+import json
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+import day_ledger
+import dsat_ledger
+from day_ledger import Ledger, Window, days_between
+
+
+def contribution(record):
+    return dict(record)
+
+
+def make_ledger(tmp_path, start, n):
+    ledger = Ledger(tmp_path)
+    for i, day in enumerate(days_between(start, start + timedelta(days=n - 1))):
+        ledger.put(day, {'bugs': i % 5, 'other': 1})
+    ledger.save()
+    return ledger
+
+
+def recompute(ledger, start, end):
+    totals = {}
+    for day in days_between(start, end):
+        for key, value in (ledger.get(day) or {}).items():
+            totals[key] = totals.get(key, 0) + value
+    return {k: v for k, v in totals.items() if v}
+
+
+def test_days_between_is_inclusive():
+    assert days_between(date(2026, 2, 27), date(2026, 3, 1)) == ['2026-02-27', '2026-02-28',
+                                                               '2026-03-01']
+    assert days_between(date(2026, 3, 1), date(2026, 2, 28)) == []
+
+
+def test_ledger_round_trips_month_files(tmp_path):
+    ledger = make_ledger(tmp_path, date(2026, 1, 30), 5)
+    assert sorted(p.name for p in tmp_path.glob('*.json')) == ['2026-01.json', '2026-02.json']
+    reread = Ledger(tmp_path)
+    assert [d for d, _ in reread.items()] == days_between(date(2026, 1, 30), date(2026, 2, 3))
+    assert reread.get('2026-02-03') == {'bugs': 4, 'other': 1}
+    assert reread.get('2026-02-04') is None
+
+
+def test_window_slides_incrementally(tmp_path):
+    ledger = make_ledger(tmp_path, date(2026, 1, 1), 120)
+    window = Window(tmp_path, contribution)
+    end = date(2026, 3, 1)
+    assert window.advance(ledger, end, 30) == 31
+    for _ in range(4):
+        end += timedelta(days=7)
+        assert window.advance(ledger, end, 30) == 7
+        assert window.totals == recompute(ledger, end - timedelta(days=30), end)
+        assert len(window.days) == 31
+    window.save()
+    reread = Window(tmp_path, contribution)
+    assert (reread.start, reread.end, reread.length, reread.totals) == \
+        (window.start, window.end, 30, window.totals)
+
+
+def test_window_counts_days_missing_from_ledger_as_read(tmp_path):
+    ledger = make_ledger(tmp_path, date(2026, 1, 10), 5)
+    window = Window(tmp_path, contribution)
+    assert window.advance(ledger, date(2026, 1, 14), 10) == 11
+    assert window.totals == recompute(ledger, date(2026, 1, 4), date(2026, 1, 14))
+    assert len(window.days) == 5
+
+
+def test_window_moving_backwards_starts_over(tmp_path):
+    ledger = make_ledger(tmp_path, date(2026, 1, 1), 60)
+    window = Window(tmp_path, contribution)
+    window.advance(ledger, date(2026, 2, 20), 14)
+    assert window.advance(ledger, date(2026, 2, 1), 14) == 15
+    assert window.totals == recompute(ledger, date(2026, 1, 18), date(2026, 2, 1))
+
+
+def test_window_update_day_recounts(tmp_path):
+    ledger = make_ledger(tmp_path, date(2026, 1, 1), 10)
+    window = Window(tmp_path, contribution)
+    window.advance(ledger, date(2026, 1, 10), 9)
+    ledger.put('2026-01-05', {'bugs': 100})
+    window.update_day('2026-01-05', ledger.get('2026-01-05'))
+    assert window.totals == recompute(ledger, date(2026, 1, 1), date(2026, 1, 10))
+    # Days outside the window are not counted
+    window.update_day('2025-12-31', {'bugs': 7})
+    assert window.totals == recompute(ledger, date(2026, 1, 1), date(2026, 1, 10))
+
+
+def test_fill_saves_each_day_before_a_failure(tmp_path):
+    ledger = Ledger(tmp_path)
+    days = days_between(date(2026, 1, 1), date(2026, 1, 10))
+
+    def fetch(day):
+        if day == '2026-01-06':
+            raise RuntimeError('upstream failed')
+        return {'bugs': 1}
+
+    with pytest.raises(RuntimeError):
+        day_ledger.fill(ledger, days, fetch, jobs=1)
+    saved = Ledger(tmp_path)
+    assert [d for d, _ in saved.items()] == days[:5]
+
+    fetched, paths = day_ledger.fill(saved, days, lambda day: {'bugs': 2}, jobs=3)
+    assert fetched == days[5:]
+    assert paths == {tmp_path / '2026-01.json'}
+    assert day_ledger.fill(saved, days, fetch) == ([], set())
+
+
+def test_window_matches_published_dsat_period(tmp_path):
+    published = json.loads((Path(__file__).parent.parent / 'data' / 'dsat' / '2026-W33.json')
+                           .read_text())
+    ledger, window = dsat_ledger.open_ledger(tmp_path / 'data')
+    window.advance(ledger, date(2026, 8, 16), dsat_ledger.WINDOW_DAYS)
+    payload = dsat_ledger.payload(window, ledger)
+    assert payload['period'] == published['period'] == '2026-05-18 ~ 2026-08-16'
+    assert payload['daysCount'] == published['daysCount']
+
+
+def test_dsat_payload_matches_window(tmp_path):
+    ledger, window = dsat_ledger.open_ledger(tmp_path / 'data')
+    for i, day in enumerate(days_between(date(2026, 1, 1), date(2026, 1, 3))):
+        comments = [{'ticketId': i * 10 + k, 'createdAt': f'{day}T0{k}:00:00Z',
+                     'isAiNegative': k == 0, 'url': 'u'} for k in range(30)]
+        ledger.put(day, {'badRatings': 40, 'withComments': 30, 'aiNegative': 1,
+                         'comments': comments})
+    window.advance(ledger, date(2026, 1, 3), 2)
+    payload = dsat_ledger.payload(window, ledger)
+    assert (payload['totalBadRatings'], payload['withComments'], payload['aiNegative']) == (120, 90, 3)
+    assert payload['aiNegativeRateOfAll'] == 2.5
+    assert len(payload['allComments']) == dsat_ledger.MAX_COMMENTS
+    assert all('url' not in c for c in payload['allComments'])
+    assert [s['ticketId'] for s in payload['samples']] == [0, 10, 20]
+    assert json.loads(json.dumps(payload)) == payload
+
+
+def stub_upstream(tmp_path, body):
+    """Fake claude workspace whose fetch-all-dsat-v3.py runs `body`."""
+    script = tmp_path / dsat_ledger.UPSTREAM
+    script.parent.mkdir(parents=True)
+    script.write_text('import argparse, json\n'
+                      'p = argparse.ArgumentParser()\n'
+                      'p.add_argument("--json", action="store_true")\n'
+                      'p.add_argument("--end")\n' + body)
+    return tmp_path
+
+
+def test_dsat_day_mode_needs_start_option(tmp_path):
+    old = stub_upstream(tmp_path / 'old', 'p.parse_args()\n')
+    assert not dsat_ledger.supports_day_mode(old)
+    new = stub_upstream(tmp_path / 'new', 'p.add_argument("--start")\np.parse_args()\n')
+    assert dsat_ledger.supports_day_mode(new)
+
+
+def test_dsat_fetch_day_rejects_an_uncut_window(tmp_path):
+    claude = stub_upstream(tmp_path, (
+        'p.add_argument("--start")\n'
+        'a = p.parse_args()\n'
+        'start = a.start if a.end != "2026-02-02" else "2025-11-04"\n'
+        'print(json.dumps({"period": f"{start} ~ {a.end}", "totalBadRatings": 3}))\n'))
+    assert dsat_ledger.fetch_day(claude, '2026-02-01')['badRatings'] == 3
+    with pytest.raises(RuntimeError, match='period'):
+        dsat_ledger.fetch_day(claude, '2026-02-02')
+
+
+def test_dsat_ledger_stays_out_of_the_data_tree(tmp_path):
+    data = tmp_path / 'data'
+    ledger, window = dsat_ledger.open_ledger(data)
+    ledger.put('2026-01-01', {'badRatings': 1, 'comments': [{'text': 'private'}]})
+    window.advance(ledger, date(2026, 1, 1), 1)
+    paths = [*ledger.save(), window.save()]
+    assert all(p.is_relative_to(tmp_path / '.cache') for p in paths)
+    assert not data.exists()
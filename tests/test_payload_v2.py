@@ -0,0 +1,92 @@
+import json
+
+import data_index
+import payload_v2
+
+WEEK = {
+    'period': 'Week of 02/09 - 02/15',
+    'kpi': {'totalTickets': 412, 'topProduct': 'SPARK 2', 'refunds': None, 'ratio': 1.5},
+    'productBreakdown': [{'product': 'SPARK 2', 'count': 74}, {'product': 'SPARK 2', 'count': 3}],
+    'tags': ['~literal', '~~double', '~0', 'SPARK 2', '', True, 0],
+    'nested': {'a': [[{'b': 'Troubleshooting'}], 'Troubleshooting']},
+}
+
+
+def roundtrip(payload, ref_sources=None):
+    encoded = json.loads(json.dumps(payload_v2.encode(payload, ref_sources)))
+    loaded = {path: src for path, src in (ref_sources or {}).items()}
+    return encoded, payload_v2.decode(encoded, loaded.get)
+
+
+def test_roundtrip_restores_payload():
+    encoded, decoded = roundtrip(WEEK)
+    assert decoded == WEEK
+    assert encoded['$v'] == payload_v2.VERSION
+    assert 'SPARK 2' in encoded['strings']
+
+
+def test_tilde_literals_survive():
+    encoded, decoded = roundtrip({'a': ['~x', '~x', '~', '~~'], 'b': '~0'})
+    assert decoded == {'a': ['~x', '~x', '~', '~~'], 'b': '~0'}
+
+
+def test_short_and_unique_strings_stay_inline():
+    encoded, _ = roundtrip({'a': ['abc', 'abc', 'unique string']})
+    assert encoded['strings'] == []
+    assert encoded['data'] == {'a': ['abc', 'abc', 'unique string']}
+
+
+def test_many_strings_use_multi_digit_tokens():
+    payload = {'rows': [f'string number {i}' for i in range(100)] * 2}
+    encoded, decoded = roundtrip(payload)
+    assert decoded == payload
+    assert len(encoded['strings']) == 100
+
+
+def test_refs_decode_against_source():
+    section = [{'product': f'Product {i}', 'count': i} for i in range(10)]
+    pulse = {'productBreakdown': section, 'kpi': {'totalTickets': 1}}
+    tickets = {'productBreakdown': section, 'kpi': {'totalTickets': 2}}
+    encoded, decoded = roundtrip(tickets, {'pulse/2026-W07.json': pulse})
+    assert encoded['refs'] == {'productBreakdown': 'pulse/2026-W07.json'}
+    assert 'productBreakdown' not in encoded['data']
+    assert decoded == tickets
+
+
+def test_small_or_different_sections_are_not_refs():
+    pulse = {'kpi': {'totalTickets': 1}, 'big': list(range(50))}
+    tickets = {'kpi': {'totalTickets': 1}, 'big': list(range(51))}
+    encoded, _ = roundtrip(tickets, {'pulse/2026-W07.json': pulse})
+    assert 'refs' not in encoded
+
+
+def test_plain_payloads_pass_through_decode():
+    assert payload_v2.decode(WEEK) == WEEK
+    assert payload_v2.decode([1, 2]) == [1, 2]
+
+
+def test_encode_bytes_keeps_v1_when_not_smaller():
+    body = payload_v2.encode_bytes({'a': 1})
+    assert json.loads(body) == {'a': 1}
+    assert json.loads(payload_v2.encode_bytes([1, 2])) == [1, 2]
+
+
+def test_ref_paths():
+    assert payload_v2.ref_paths('tickets/2026-W07.json') == ['pulse/2026-W07.json']
+    assert payload_v2.ref_paths('tickets/monthly/2026-02.json') == ['pulse/monthly/2026-02.json']
+    assert payload_v2.ref_paths('pulse/2026-W07.json') == []
+    assert payload_v2.ref_paths('index.json') == []
+
+
+def test_version_covers_ref_targets():
+    files = {
+        'pulse/2026-W07.json': {'hash': 'a' * 64, 'size': 200},
+        'tickets/2026-W07.json': {'hash': 'b' * 64, 'size': 200},
+        'tickets/2026-W08.json': {'hash': 'c' * 64, 'size': 200},
+    }
+    before = data_index.build_index(files)['versions']
+    files['pulse/2026-W07.json'] = {'hash': 'd' * 64, 'size': 200}
+    after = data_index.build_index(files)['versions']
+    assert before['tickets/2026-W07.json'] != after['tickets/2026-W07.json']
+    # No pulse file for W08: the tickets file's own hash
+    assert after['tickets/2026-W08.json'] == 'c' * data_index.VERSION_HASH_LEN
@@ -0,0 +1,79 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import qa_ledger
+from day_ledger import days_between
+
+
+def record(spark=(0, 0), bias=(0, 0)):
+    return {'Spark': {'qa': spark[0], 'customer': spark[1]},
+            'BIAS X': {'qa': bias[0], 'customer': bias[1]}}
+
+
+def test_day_record_keeps_products_without_bugs():
+    payload = {'bcrByProduct': [{'product': 'Spark', 'qaBugs': 2, 'customerBugs': 1},
+                                {'product': 'Reactor', 'qaBugs': 0, 'customerBugs': 0}]}
+    assert qa_ledger.day_record(payload) == {'Spark': {'qa': 2, 'customer': 1},
+                                             'Reactor': {'qa': 0, 'customer': 0}}
+
+
+def test_bcr_fields_list_every_product(tmp_path):
+    ledger, window = qa_ledger.open_ledger(tmp_path)
+    for day in days_between(date(2026, 2, 8), date(2026, 2, 15)):
+        ledger.put(day, record(spark=(3, 1)))
+    window.advance(ledger, date(2026, 2, 15), 7)
+    fields = qa_ledger.bcr_fields(window, {})
+    assert fields['bcr']['qaCount'] == 24 and fields['bcr']['customerCount'] == 8
+    assert fields['bcr']['overall'] == 75.0
+    assert [(p['product'], p['total']) for p in fields['bcrByProduct']] == [('Spark', 32),
+                                                                          ('BIAS X', 0)]
+    assert fields['daysCount'] == 7
+
+
+def test_partial_week_does_not_replace_file_entry(tmp_path):
+    qa_dir = tmp_path / 'qa'
+    qa_dir.mkdir()
+    full = {'week': '2026-W07', 'qaBugs': 50, 'customerBugs': 10, 'total': 60, 'weekRate': 83.3}
+    (qa_dir / '2026-W07.json').write_text(json.dumps({'bcrWeeklyTrend': [full]}))
+    ledger, _ = qa_ledger.open_ledger(tmp_path)
+    # The ledger starts on Wednesday of W07 and covers W08 in full
+    for day in days_between(date(2026, 2, 11), date(2026, 2, 22)):
+        ledger.put(day, record(spark=(1, 0)))
+    ledger.save()
+
+    trend = qa_ledger.update_trend(tmp_path, ledger)
+    assert trend['2026-W07'] == full
+    assert trend['2026-W08'] == qa_ledger.trend_entry('2026-W08', 7, 0)
+
+    # An incremental update of the partial week leaves it alone too
+    trend = qa_ledger.update_trend(tmp_path, ledger, {'2026-W07', '2026-W08'})
+    assert trend['2026-W07'] == full
+    saved = json.loads(qa_ledger.trend_path(tmp_path).read_text())['bcrWeeklyTrend']
+    assert [t['week'] for t in saved] == ['2026-W07', '2026-W08']
+
+
+def test_window_totals_match_recompute(tmp_path):
+    ledger, window = qa_ledger.open_ledger(tmp_path)
+    days = days_between(date(2026, 1, 1), date(2026, 3, 31))
+    for i, day in enumerate(days):
+        ledger.put(day, record(spark=(i % 3, i % 2), bias=(i % 4, 0)))
+    window.advance(ledger, date(2026, 3, 24), 30)
+    window.advance(ledger, date(2026, 3, 31), 30)
+    products = qa_ledger.by_product(window)
+    expected = {'Spark': {'qa': 0, 'customer': 0}, 'BIAS X': {'qa': 0, 'customer': 0}}
+    for day in days[-31:]:
+        for product, counts in ledger.get(day).items():
+            for source, value in counts.items():
+                expected[product][source] += value
+    assert products == expected
+
+
+def test_window_matches_published_bcr_window(tmp_path):
+    published = json.loads((Path(__file__).parent.parent / 'data' / 'qa' / '2026-W33.json')
+                           .read_text())
+    ledger, window = qa_ledger.open_ledger(tmp_path)
+    window.advance(ledger, date(2026, 8, 16), qa_ledger.WINDOW_DAYS)
+    fields = qa_ledger.bcr_fields(window, {})
+    assert fields['bcrWindow'] == published['bcrWindow'] == '2026-05-18 ~ 2026-08-16'
+    assert fields['daysCount'] == published['daysCount']
@@ -0,0 +1,120 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from range_query import PrefixTable, RangeEngine, parse_bound
+
+
+def day_payload(total, products, types=None, lossless=True, cross=None):
+    payload = {'kpi': {'totalTickets': total, 'refunds': 1},
+               'productBreakdown': [{'product': k, 'count': v} for k, v in products.items()],
+               'ticketTypes': [{'type': k, 'count': v} for k, v in (types or {}).items()]}
+    if lossless:
+        payload['counts'] = {'products': products, 'types': types or {}}
+        if cross is not None:
+            payload['counts']['productTypes'] = cross
+    return payload
+
+
+def test_prefix_table_totals():
+    table = PrefixTable([{'a': 1}, {'a': 2, 'b': 5}, {}, {'b': 1, 'a': None}])
+    assert table.total('a', 0, 3) == 3
+    assert table.total('a', 1, 1) == 2
+    assert table.total('b', 2, 3) == 1
+    assert table.total('missing', 0, 3) == 0
+    assert table.total('a', 2, 1) == 0
+    assert table.totals(0, 3) == {'a': 3, 'b': 6}
+    assert table.totals(2, 2) == {}
+    assert table.values('a', 0, 3) == [1, 2, 0, 0]
+    assert table.values('missing', 1, 2) == [0, 0]
+
+
+def test_prefix_table_key_lookup_is_loose():
+    table = PrefixTable([{'SPARK 2': 1}])
+    assert table.key('spark-2') == 'SPARK 2'
+    assert table.key('Spark 3') is None
+
+
+def test_empty_engine():
+    engine = RangeEngine({}, {})
+    assert engine.count('2026-01-01', '2026-12-31') == 0
+    result = engine.query('2026-01-01', '2026-01-31')
+    assert result['kpi']['totalTickets'] == 0 and result['dailyTrend'] == []
+    assert result['aiOps'] is None
+
+
+@pytest.fixture
+def engine():
+    days = {}
+    start = date(2026, 3, 2)  # Monday
+    for i in range(21):
+        if i == 10:
+            continue  # a gap in the data
+        d = (start + timedelta(days=i)).isoformat()
+        # Cross counts from day 2 on (day 3 predates `counts` altogether)
+        cross = {'SPARK 2': {'Troubleshooting': i}, 'BIAS X': {'Troubleshooting': 10}}
+        days[d] = day_payload(10 + i, {'SPARK 2': i, 'BIAS X': 10}, {'Troubleshooting': 10 + i},
+                              lossless=i != 3, cross=cross if i >= 2 else None)
+    weeks = {f'2026-W{w:02d}': {'aiOps': {'devinClosed': 5, 'allClosed': 10, 'aiGood': 3,
+                                          'aiBad': 1, 'humanGood': 1, 'humanBad': 1}}
+             for w in (10, 11, 12)}
+    return RangeEngine(days, weeks)
+
+
+def test_counts_match_brute_force(engine):
+    expected = sum(10 + i for i in range(21) if i != 10)
+    assert engine.count('2026-03-02', '2026-03-22') == expected
+    assert engine.count('2026-02-01', '2026-04-30') == expected  # clamped to the data
+    assert engine.count('2026-03-05', '2026-03-05') == 13
+    assert engine.count('2026-03-12', '2026-03-12') == 0           # the gap
+    assert engine.count('2026-03-06', '2026-03-05') == 0           # empty range
+    assert engine.count('2026-03-02', '2026-03-08', product='spark 2') == sum(range(7))
+    assert engine.count('2026-03-02', '2026-03-08', type='Troubleshooting') == sum(
+        range(10, 17))
+    assert engine.count('2026-03-02', '2026-03-08', product='Nope') == 0
+
+
+def test_product_and_type_together(engine):
+    assert engine.count('2026-03-02', '2026-03-08', product='spark 2',
+                        type='troubleshooting') == 2 + 4 + 5 + 6
+    assert engine.without_cross_counts('2026-03-02', '2026-03-08') == 3
+    assert engine.count('2026-03-09', '2026-03-22', product='BIAS X',
+                        type='Troubleshooting') == 10 * 13
+    assert engine.without_cross_counts('2026-03-09', '2026-03-22') == 0
+    assert engine.count('2026-03-02', '2026-03-22', product='SPARK 2', type='Nope') == 0
+    trend = engine.trend('2026-03-04', '2026-03-06', product='SPARK 2', type='Troubleshooting')
+    assert [t['count'] for t in trend] == [2, 0, 4]
+
+
+def test_trend_skips_days_without_data(engine):
+    trend = engine.trend('2026-03-11', '2026-03-13')
+    assert [(t['date'], t['count']) for t in trend] == [('2026-03-11', 19), ('2026-03-13', 21)]
+    assert trend[0]['day'] == 'Wed'
+
+
+def test_query_shape_and_coverage(engine):
+    result = engine.query('2026-03-02', '2026-03-15')
+    assert result['coverage'] == {'days': 13, 'calendarDays': 14, 'lossyDays': 1}
+    assert result['kpi']['refunds'] == 13
+    assert sum(p['count'] for p in result['productBreakdown']) == sum(
+        i for i in range(14) if i != 10) + 130
+    assert result['kpi']['topProduct'] == result['productBreakdown'][0]['product']
+    json.dumps(result)
+
+
+def test_ai_ops_only_whole_weeks(engine):
+    assert engine.ai_ops_for('2026-03-03', '2026-03-15')['weeks'] == 1   # W11 only
+    assert engine.ai_ops_for('2026-03-02', '2026-03-22')['weeks'] == 3
+    assert engine.ai_ops_for('2026-03-03', '2026-03-08') is None
+    ai_ops = engine.ai_ops_for('2026-03-02', '2026-03-15')
+    assert (ai_ops['aiResolutionRate'], ai_ops['aiCsat'], ai_ops['humanCsat']) == (50.0, 75.0,
+                                                                                  50.0)
+
+
+def test_parse_bound():
+    assert parse_bound('2026-W10') == date(2026, 3, 2)
+    assert parse_bound('2026-W10', end=True) == date(2026, 3, 8)
+    assert parse_bound('2026-02', end=True) == date(2026, 2, 28)
+    assert parse_bound('2026-02') == date(2026, 2, 1)
+    assert parse_bound('2026-02-14', end=True) == date(2026, 2, 14)